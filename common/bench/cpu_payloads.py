@@ -0,0 +1,75 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Dict
+
+from common.workloads.cpu.payloads import (
+    TRANSPORT_PICKLE,
+    TRANSPORT_SHM,
+    SharedPayloadPool,
+    make_pickled_payload,
+)
+from common.workloads.cpu.tasks import run_cpu_chunk
+
+
+def run_transport(transport: str, tasks: int, size_kb: int, workers: int, kernel: str, complexity: int) -> Dict[str, Any]:
+    size_bytes = size_kb * 1024
+    pool = SharedPayloadPool(max_retained_bytes=workers * 4 * size_bytes)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        wait([ex.submit(run_cpu_chunk, [1], [kernel], [None]) for _ in range(workers)])
+
+        t0 = time.perf_counter()
+        futs = {}
+        for i in range(tasks):
+            task_id = f"bench-{i}"
+            if transport == TRANSPORT_PICKLE:
+                payload = make_pickled_payload(task_id, size_bytes)
+            else:
+                payload = pool.acquire(task_id, size_bytes)
+            futs[ex.submit(run_cpu_chunk, [complexity], [kernel], [payload])] = payload
+            if len(futs) >= workers * 2:
+                done, _ = wait(futs, return_when="FIRST_COMPLETED")
+                for fut in done:
+                    payload = futs.pop(fut)
+                    fut.result()
+                    if transport == TRANSPORT_SHM:
+                        pool.release(payload)
+        for fut, payload in futs.items():
+            fut.result()
+            if transport == TRANSPORT_SHM:
+                pool.release(payload)
+        elapsed = time.perf_counter() - t0
+
+    out = {
+        "transport": transport,
+        "tasks": tasks,
+        "payload_size_kb": size_kb,
+        "workers": workers,
+        "elapsed_sec": elapsed,
+        "tasks_per_sec": tasks / elapsed if elapsed > 0 else None,
+        "payload_mb_per_sec": tasks * size_kb / 1024 / elapsed if elapsed > 0 else None,
+        "slots_created": pool.created,
+        "slots_reused": pool.reused,
+    }
+    pool.close()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, default=200)
+    ap.add_argument("--size-kb", type=int, nargs="+", default=[64, 1024, 16384])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--kernel", default="hash")
+    ap.add_argument("--complexity", type=int, default=1)
+    args = ap.parse_args()
+
+    for size_kb in args.size_kb:
+        for transport in (TRANSPORT_PICKLE, TRANSPORT_SHM):
+            res = run_transport(transport, args.tasks, size_kb, args.workers, args.kernel, args.complexity)
+            print(json.dumps(res))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from common.workloads.memory.arena import BufferArena
+from common.workloads.memory.budget import MB
+from common.workloads.memory.kernels import DEFAULT_PATTERN, MEMORY_PATTERNS
+from common.workloads.memory.tasks import simulate_memory_load
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm", encoding="utf-8") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _percentile(sorted_vals: List[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    k = min(len(sorted_vals) - 1, max(0, int(round((len(sorted_vals) - 1) * p / 100.0))))
+    return sorted_vals[k]
+
+
+def run(
+    tasks: int,
+    complexities: List[int],
+    threads: int,
+    arena: Optional[BufferArena],
+    pattern: str = DEFAULT_PATTERN,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    rss_samples: List[int] = []
+
+    def one(i: int) -> None:
+        t0 = time.perf_counter()
+        simulate_memory_load(complexities[i % len(complexities)], arena, pattern=pattern)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        rss_samples.append(rss_bytes())
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        list(ex.map(one, range(tasks)))
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    rss_mb = [x / MB for x in rss_samples]
+    out: Dict[str, Any] = {
+        "arena": arena is not None,
+        "pattern": pattern,
+        "tasks": tasks,
+        "complexities": complexities,
+        "threads": threads,
+        "tasks_per_sec": tasks / elapsed if elapsed > 0 else None,
+        "p50_latency_ms": _percentile(lat, 50),
+        "p95_latency_ms": _percentile(lat, 95),
+        "p99_latency_ms": _percentile(lat, 99),
+        "rss_mb_min": min(rss_mb),
+        "rss_mb_max": max(rss_mb),
+        "rss_mb_stdev": statistics.pstdev(rss_mb),
+    }
+    if arena is not None:
+        out["arena_stats"] = arena.stats()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, default=200)
+    ap.add_argument("--complexity", type=int, nargs="+", default=[8, 32, 64])
+    ap.add_argument("--threads", type=int, default=2)
+    ap.add_argument("--retained-mb", type=int, default=256)
+    ap.add_argument("--pattern", nargs="+", default=list(MEMORY_PATTERNS))
+    args = ap.parse_args()
+
+    for pattern in args.pattern:
+        print(json.dumps(run(args.tasks, args.complexity, args.threads, None, pattern)))
+        arena = BufferArena(max_retained_bytes=args.retained_mb * MB)
+        print(json.dumps(run(args.tasks, args.complexity, args.threads, arena, pattern)))
+
+
+if __name__ == "__main__":
+    main()
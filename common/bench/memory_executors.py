@@ -0,0 +1,56 @@
+import argparse
+import json
+import time
+from concurrent.futures import wait
+from typing import Any, Dict, List
+
+from common.workloads.memory.executors import BACKEND_PROCESSES, BACKEND_THREADS, TaskExecutor
+from common.workloads.memory.tasks import run_mem_task
+
+
+def run_backend(backend: str, workers: int, tasks: int, complexity: int, pattern: str) -> Dict[str, Any]:
+    executor = TaskExecutor(backend, workers)
+    try:
+        wait([executor.submit(run_mem_task, 1, pattern) for _ in range(workers)])
+        t0 = time.perf_counter()
+        futs = [executor.submit(run_mem_task, complexity, pattern) for _ in range(tasks)]
+        failed = sum(1 for fut in futs if not fut.result()[0])
+        elapsed = time.perf_counter() - t0
+    finally:
+        executor.shutdown()
+    return {
+        "backend": backend,
+        "workers": workers,
+        "complexity": complexity,
+        "pattern": pattern,
+        "tasks": tasks,
+        "failed": failed,
+        "elapsed_sec": elapsed,
+        "tasks_per_sec": tasks / elapsed if elapsed > 0 else None,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, default=100)
+    ap.add_argument("--workers", type=int, default=2)
+    ap.add_argument("--complexity", type=int, nargs="+", default=[1, 8, 32, 128])
+    ap.add_argument("--pattern", nargs="+", default=["legacy", "sequential"])
+    args = ap.parse_args()
+
+    backends = [BACKEND_THREADS, BACKEND_PROCESSES]
+
+    winners: List[Dict[str, Any]] = []
+    for pattern in args.pattern:
+        for complexity in args.complexity:
+            runs = [run_backend(b, args.workers, args.tasks, complexity, pattern) for b in backends]
+            for r in runs:
+                print(json.dumps(r))
+            best = max(runs, key=lambda r: r["tasks_per_sec"] or 0.0)
+            winners.append({"pattern": pattern, "complexity": complexity, "winner": best["backend"]})
+
+    print(json.dumps({"winners": winners}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from common.db.config import DatabaseSettings
+from common.db.engine import create_db_engine
+from common.models.task import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("task_type", pa.string()),
+        ("status", pa.string()),
+        ("complexity", pa.int32()),
+        ("kernel", pa.string()),
+        ("expected_duration_sec", pa.int32()),
+        ("payload_size_kb", pa.int32()),
+        ("created_at", pa.timestamp("us")),
+        ("dispatched_at", pa.timestamp("us")),
+        ("started_at", pa.timestamp("us")),
+        ("finished_at", pa.timestamp("us")),
+        ("error_message", pa.string()),
+        ("result", pa.string()),
+        ("trace_id", pa.string()),
+        ("run_id", pa.string()),
+    ]
+)
+REFRESH_FIRST_FINISHED = text(
+    """
+    UPDATE task_type_stats s SET
+        completed_first_finished_at = m.first_finished,
+        completed_last_finished_at = CASE
+            WHEN m.first_finished IS NULL THEN NULL
+            ELSE GREATEST(s.completed_last_finished_at, m.last_finished)
+        END,
+        completed_bounds_stale = s.completed_bounds_stale AND m.last_finished IS DISTINCT FROM m.stored_last
+    FROM (
+        SELECT t.task_type, t.stored_last, b.first_finished, b.last_finished
+        FROM (
+            SELECT task_type, MAX(completed_last_finished_at) AS stored_last FROM task_type_stats GROUP BY task_type
+        ) t
+        CROSS JOIN LATERAL (
+            SELECT MIN(finished_at) AS first_finished, MAX(finished_at) AS last_finished FROM tasks
+            WHERE status = 'COMPLETED' AND finished_at IS NOT NULL AND task_type::text = t.task_type
+        ) b
+    ) m
+    WHERE s.task_type = m.task_type
+    """
+)
+PARTITION_FIELD = "day"
+TMP_SUFFIX = ".tmp"
+ARCHIVE_LOCK_KEY = 7_310_047
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_FIELD, pa.string())]), flavor="hive")
+
+
+def archive_root(archive_dir: str) -> str:
+    return os.path.join(archive_dir, "tasks")
+
+
+def open_archive(archive_dir: str) -> Optional[ds.Dataset]:
+    root = archive_root(archive_dir)
+    if not os.path.isdir(root):
+        return None
+    return ds.dataset(
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        schema=ARCHIVE_SCHEMA.append(pa.field(PARTITION_FIELD, pa.string())),
+    )
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    out = dict(row._mapping)
+    out["task_type"] = row.task_type.value
+    out["status"] = row.status.value
+    return out
+
+
+def _write_day(root: str, day: str, records: List[Dict[str, Any]], compression: str) -> Tuple[str, str]:
+    directory = os.path.join(root, f"{PARTITION_FIELD}={day}")
+    os.makedirs(directory, exist_ok=True)
+    name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = os.path.join(directory, f".{name}{TMP_SUFFIX}")
+    pq.write_table(pa.Table.from_pylist(records, schema=ARCHIVE_SCHEMA), tmp, compression=compression)
+    return tmp, os.path.join(directory, name)
+
+
+def archive_batch(
+    conn: Connection, cutoff: datetime, batch_size: int, archive_dir: str, compression: str = "zstd"
+) -> Dict[str, Any]:
+    t = Task.__table__
+    query = (
+        select(*[t.c[name] for name in ARCHIVE_SCHEMA.names])
+        .where(t.c.status.in_(TERMINAL_STATUSES), t.c.finished_at < cutoff)
+        .order_by(t.c.finished_at)
+        .limit(batch_size)
+    )
+    written: List[Tuple[str, str]] = []
+    if conn.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    rows = conn.execute(query).all()
+    if not rows:
+        conn.rollback()
+        return {"rows": 0, "files": []}
+    by_day: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_day[row.finished_at.date().isoformat()].append(_record(row))
+    try:
+        for day, records in sorted(by_day.items()):
+            written.append(_write_day(archive_root(archive_dir), day, records, compression))
+        conn.execute(
+            delete(t).where(
+                t.c.id.in_([row.id for row in rows]),
+                t.c.created_at >= min(row.created_at for row in rows),
+            )
+        )
+        if conn.dialect.name == "postgresql":
+            conn.execute(REFRESH_FIRST_FINISHED)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        for tmp, _ in written:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+    for tmp, final in written:
+        os.replace(tmp, final)
+    return {"rows": len(rows), "files": [final for _, final in written]}
+
+
+def _pending_files(root: str) -> List[str]:
+    return [
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(root)
+        for name in names
+        if name.startswith(".") and name.endswith(TMP_SUFFIX)
+    ]
+
+
+def recover_pending(conn: Connection, archive_dir: str) -> Dict[str, int]:
+    out = {"published": 0, "discarded": 0}
+    t = Task.__table__
+    for tmp in _pending_files(archive_root(archive_dir)):
+        try:
+            ids = pq.read_table(tmp, columns=["id"]).column("id").to_pylist()
+        except (pa.ArrowException, OSError):
+            ids = None
+        remaining = conn.execute(select(func.count()).select_from(t).where(t.c.id.in_(ids))).scalar() if ids else 1
+        if remaining:
+            os.remove(tmp)
+            out["discarded"] += 1
+        else:
+            name = os.path.basename(tmp)[1 : -len(TMP_SUFFIX)]
+            os.replace(tmp, os.path.join(os.path.dirname(tmp), name))
+            out["published"] += 1
+    conn.rollback()
+    if out["published"] or out["discarded"]:
+        logger.warning("Recovered pending archive files: %s", out)
+    return out
+
+
+def run_archiver(
+    engine: Engine, settings: Any, older_than_hours: Optional[float] = None, max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    hours = settings.archive_after_hours if older_than_hours is None else older_than_hours
+    cutoff = datetime.utcnow() - timedelta(hours=hours)
+    out: Dict[str, Any] = {"cutoff": cutoff.isoformat(), "rows": 0, "files": 0, "batches": 0}
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            locked = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": ARCHIVE_LOCK_KEY}).scalar()
+            conn.commit()
+            if not locked:
+                out["skipped"] = True
+                return out
+        try:
+            out["recovered"] = recover_pending(conn, settings.archive_dir)
+            while max_batches is None or out["batches"] < max_batches:
+                batch = archive_batch(
+                    conn, cutoff, settings.archive_batch_size, settings.archive_dir, settings.archive_compression
+                )
+                if not batch["rows"]:
+                    break
+                out["rows"] += batch["rows"]
+                out["files"] += len(batch["files"])
+                out["batches"] += 1
+                if batch["rows"] < settings.archive_batch_size:
+                    break
+        finally:
+            if conn.dialect.name == "postgresql":
+                conn.rollback()
+                conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": ARCHIVE_LOCK_KEY})
+                conn.commit()
+    if out["rows"]:
+        logger.info("Archived %d tasks finished before %s into %d files", out["rows"], out["cutoff"], out["files"])
+    return out
+
+
+def start_archiver(engine: Engine, settings: Any) -> Optional[threading.Thread]:
+    if settings.archive_after_hours <= 0:
+        return None
+
+    def loop() -> None:
+        while True:
+            try:
+                run_archiver(engine, settings)
+            except Exception:
+                logger.exception("Task archival failed")
+            time.sleep(settings.archive_interval_sec)
+
+    thread = threading.Thread(target=loop, name="task-archiver", daemon=True)
+    thread.start()
+    return thread
+
+
+def archive_status(archive_dir: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"root": archive_root(archive_dir), "files": 0, "rows": 0, "bytes": 0, "days": 0}
+    dataset = open_archive(archive_dir)
+    if dataset is None or not dataset.files:
+        return out
+    days = sorted({os.path.basename(os.path.dirname(f)).split("=", 1)[-1] for f in dataset.files})
+    out.update(
+        files=len(dataset.files),
+        rows=dataset.count_rows(),
+        bytes=sum(os.path.getsize(f) for f in dataset.files),
+        days=len(days),
+        first_day=days[0],
+        last_day=days[-1],
+    )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move terminal tasks into compressed Parquet files")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status")
+    run = sub.add_parser("run")
+    run.add_argument("--older-than-hours", type=float, required=True)
+    run.add_argument("--batch-size", type=int, default=None)
+    run.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    settings = DatabaseSettings()
+    if args.cmd == "status":
+        print(json.dumps(archive_status(settings.archive_dir)))
+        return
+    if args.batch_size:
+        settings.archive_batch_size = args.batch_size
+    engine = create_db_engine(settings, application_name="archiver")
+    try:
+        print(json.dumps(run_archiver(engine, settings, args.older_than_hours, args.max_batches)))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
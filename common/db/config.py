@@ -0,0 +1,30 @@
+from pydantic_settings import BaseSettings
+
+
+class DatabaseSettings(BaseSettings):
+    database_url: str = "sqlite:///./test.db"
+    db_echo: bool = False
+    db_auto_migrate: bool = True
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_timeout_sec: float = 10.0
+    db_pool_recycle_sec: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    db_pgbouncer: bool = False
+    db_slow_checkout_ms: float = 100.0
+    db_application_name: str = ""
+    db_connect_timeout_sec: int = 0
+    database_read_url: str = ""
+    db_replica_max_lag_sec: float = 5.0
+    db_replica_lag_check_sec: float = 1.0
+    db_replica_connect_timeout_sec: int = 2
+    db_partition_days_ahead: int = 7
+    db_partition_retention_days: int = 0
+    db_partition_retention_mode: str = "detach"
+    db_partition_maintenance_sec: float = 3600.0
+    archive_dir: str = "/tmp/archive"
+    archive_after_hours: float = 0.0
+    archive_batch_size: int = 5000
+    archive_interval_sec: float = 300.0
+    archive_compression: str = "zstd"
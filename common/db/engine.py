@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    def __init__(self, capacity: Optional[int], slow_checkout_ms: float = 100.0):
+        self.capacity = capacity
+        self.slow_checkout_sec = max(0.0, slow_checkout_ms) / 1000.0
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.wait_total_sec = 0.0
+        self.wait_max_sec = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+
+    def observe_wait(self, wait_sec: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_total_sec += wait_sec
+            self.wait_max_sec = max(self.wait_max_sec, wait_sec)
+            slow = wait_sec >= self.slow_checkout_sec > 0
+            if slow:
+                self.slow_checkouts += 1
+        if slow:
+            logger.warning(
+                "DB pool checkout took %.1f ms (in_use=%d capacity=%s timed_out=%s)",
+                wait_sec * 1000.0,
+                self.in_use,
+                self.capacity,
+                timed_out,
+            )
+
+    def on_checkout(self) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def on_checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            n = self.checkouts
+            return {
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "saturation": round(self.in_use / self.capacity, 3) if self.capacity else None,
+                "checkouts": n,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_avg_ms": round(self.wait_total_sec / n * 1000.0, 3) if n else 0.0,
+                "wait_max_ms": round(self.wait_max_sec * 1000.0, 3),
+            }
+
+
+class _TimedCheckout:
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - t0, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_wait(time.perf_counter() - t0)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def _is_postgres(url) -> bool:
+    return url.get_backend_name() == "postgresql"
+
+
+def create_db_engine(settings: Any, application_name: str = "") -> Engine:
+    url = make_url(settings.database_url)
+    app_name = settings.db_application_name or application_name
+    timeout_ms = int(settings.db_statement_timeout_ms)
+    connect_timeout = int(settings.db_connect_timeout_sec)
+    pgbouncer = bool(settings.db_pgbouncer)
+    pooled = int(settings.db_pool_size) > 0
+
+    kwargs: Dict[str, Any] = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    connect_args: Dict[str, Any] = {}
+
+    memory_sqlite = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+    capacity: Optional[int] = None
+    if memory_sqlite:
+        pass
+    elif pooled:
+        kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=int(settings.db_pool_size),
+            max_overflow=int(settings.db_max_overflow),
+            pool_timeout=float(settings.db_pool_timeout_sec),
+            pool_recycle=int(settings.db_pool_recycle_sec),
+            pool_use_lifo=True,
+        )
+        capacity = int(settings.db_pool_size) + max(0, int(settings.db_max_overflow))
+    else:
+        kwargs["poolclass"] = InstrumentedNullPool
+
+    if _is_postgres(url):
+        if app_name:
+            connect_args["application_name"] = app_name
+        if connect_timeout > 0:
+            connect_args["connect_timeout"] = connect_timeout
+        if pgbouncer:
+            if url.get_driver_name() == "psycopg":
+                connect_args["prepare_threshold"] = None
+        elif timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+
+    engine = create_engine(url, **kwargs)
+
+    metrics = PoolMetrics(capacity, settings.db_slow_checkout_ms)
+    if isinstance(engine.pool, _TimedCheckout):
+        engine.pool.metrics = metrics
+    engine.pool_metrics = metrics
+    event.listen(engine, "checkout", lambda *_: metrics.on_checkout())
+    event.listen(engine, "checkin", lambda *_: metrics.on_checkin())
+
+    if _is_postgres(url) and pgbouncer and timeout_ms > 0:
+        @event.listens_for(engine, "begin")
+        def _set_local_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+    return engine
+
+
+def create_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    metrics: Optional[PoolMetrics] = getattr(engine, "pool_metrics", None)
+    out: Dict[str, Any] = metrics.snapshot() if metrics is not None else {}
+    out["pool"] = engine.pool.status()
+    return out
@@ -0,0 +1,79 @@
+import argparse
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from common.db.config import DatabaseSettings
+from common.db.engine import create_db_engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+ADVISORY_LOCK_KEY = 7_310_036
+
+
+def alembic_config(url: Optional[str] = None) -> Config:
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    if url:
+        cfg.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return cfg
+
+
+def upgrade_schema(engine: Engine, revision: str = "head") -> None:
+    cfg = alembic_config()
+    with engine.connect() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        if postgres:
+            conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": ADVISORY_LOCK_KEY})
+            conn.commit()
+        try:
+            cfg.attributes["connection"] = conn
+            command.upgrade(cfg, revision)
+            conn.commit()
+        finally:
+            if postgres:
+                conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": ADVISORY_LOCK_KEY})
+                conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run shared schema migrations")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    up = sub.add_parser("upgrade")
+    up.add_argument("revision", nargs="?", default="head")
+    down = sub.add_parser("downgrade")
+    down.add_argument("revision")
+    st = sub.add_parser("stamp")
+    st.add_argument("revision")
+    sub.add_parser("current")
+    sub.add_parser("history")
+    rev = sub.add_parser("revision")
+    rev.add_argument("-m", "--message", required=True)
+    rev.add_argument("--autogenerate", action="store_true")
+    args = parser.parse_args()
+
+    settings = DatabaseSettings()
+    if args.cmd == "upgrade":
+        engine = create_db_engine(settings, application_name="migrate")
+        upgrade_schema(engine, args.revision)
+        engine.dispose()
+        return
+
+    cfg = alembic_config(settings.database_url)
+    if args.cmd == "downgrade":
+        command.downgrade(cfg, args.revision)
+    elif args.cmd == "stamp":
+        command.stamp(cfg, args.revision)
+    elif args.cmd == "current":
+        command.current(cfg, verbose=True)
+    elif args.cmd == "history":
+        command.history(cfg)
+    elif args.cmd == "revision":
+        command.revision(cfg, message=args.message, autogenerate=args.autogenerate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""baseline tasks table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TASK_TYPES = ("CPU_INTENSIVE", "MEMORY_INTENSIVE")
+TASK_STATUSES = ("PENDING", "DISPATCHED", "RUNNING", "COMPLETED", "FAILED")
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("tasks"):
+        return
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("task_type", sa.Enum(*TASK_TYPES, name="tasktype"), nullable=False),
+        sa.Column("status", sa.Enum(*TASK_STATUSES, name="taskstatus"), nullable=False),
+        sa.Column("complexity", sa.Integer(), nullable=False),
+        sa.Column("expected_duration_sec", sa.Integer(), nullable=True),
+        sa.Column("payload_size_kb", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("dispatched_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+    op.create_index("ix_tasks_task_type", "tasks", ["task_type"])
+    op.create_index("ix_tasks_status", "tasks", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("tasks")
+    sa.Enum(name="tasktype").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="taskstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,32 @@
+"""task kernel and result columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _columns() -> set:
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns("tasks")}
+
+
+def upgrade() -> None:
+    existing = _columns()
+    with op.batch_alter_table("tasks") as batch:
+        if "kernel" not in existing:
+            batch.add_column(sa.Column("kernel", sa.String(32), nullable=True))
+        if "result" not in existing:
+            batch.add_column(sa.Column("result", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("result")
+        batch.drop_column("kernel")
@@ -0,0 +1,54 @@
+"""composite and partial indexes for dispatcher, worker and stats queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+LEGACY_INDEXES = ("ix_tasks_id", "ix_tasks_task_type", "ix_tasks_status")
+
+
+def _where(clause: str) -> dict:
+    return {"postgresql_where": sa.text(clause), "sqlite_where": sa.text(clause)}
+
+
+def _concurrently() -> dict:
+    return {"postgresql_concurrently": True} if op.get_bind().dialect.name == "postgresql" else {}
+
+
+def upgrade() -> None:
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("tasks")}
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_pending_created_at", "tasks", ["created_at"],
+            **_where("status = 'PENDING'"), **_concurrently(),
+        )
+        op.create_index(
+            "ix_tasks_dispatched_type_created_at", "tasks", ["task_type", "created_at"],
+            **_where("status = 'DISPATCHED'"), **_concurrently(),
+        )
+        op.create_index("ix_tasks_status_type", "tasks", ["status", "task_type"], **_concurrently())
+        op.create_index(
+            "ix_tasks_type_finished_at", "tasks", ["task_type", "finished_at"],
+            **_where("finished_at IS NOT NULL"), **_concurrently(),
+        )
+        for name in LEGACY_INDEXES:
+            if name in existing:
+                op.drop_index(name, table_name="tasks", **_concurrently())
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_id", "tasks", ["id"])
+    op.create_index("ix_tasks_task_type", "tasks", ["task_type"])
+    op.create_index("ix_tasks_status", "tasks", ["status"])
+    op.drop_index("ix_tasks_type_finished_at", table_name="tasks")
+    op.drop_index("ix_tasks_status_type", table_name="tasks")
+    op.drop_index("ix_tasks_dispatched_type_created_at", table_name="tasks")
+    op.drop_index("ix_tasks_pending_created_at", table_name="tasks")
@@ -0,0 +1,158 @@
+"""trigger-maintained task stats rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SHARDS = 16
+
+ROLLUP_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION tasks_rollup_apply(r tasks, p_sign integer, p_shard integer) RETURNS void AS $$
+DECLARE
+    waited boolean := r.started_at IS NOT NULL AND r.created_at IS NOT NULL;
+    ran boolean := r.started_at IS NOT NULL AND r.finished_at IS NOT NULL;
+    done boolean := r.status = 'COMPLETED' AND r.finished_at IS NOT NULL;
+BEGIN
+    INSERT INTO task_status_counts AS c (status, shard, count)
+    VALUES (r.status::text, p_shard, p_sign)
+    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+    INSERT INTO task_type_stats AS s (
+        task_type, shard, wait_sum_sec, wait_count, run_sum_sec, run_count,
+        completed_count, completed_first_finished_at, completed_last_finished_at
+    )
+    VALUES (
+        r.task_type::text,
+        p_shard,
+        CASE WHEN waited THEN p_sign * EXTRACT(EPOCH FROM r.started_at - r.created_at) ELSE 0 END,
+        CASE WHEN waited THEN p_sign ELSE 0 END,
+        CASE WHEN ran THEN p_sign * EXTRACT(EPOCH FROM r.finished_at - r.started_at) ELSE 0 END,
+        CASE WHEN ran THEN p_sign ELSE 0 END,
+        CASE WHEN done THEN p_sign ELSE 0 END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END
+    )
+    ON CONFLICT (task_type, shard) DO UPDATE SET
+        wait_sum_sec = s.wait_sum_sec + EXCLUDED.wait_sum_sec,
+        wait_count = s.wait_count + EXCLUDED.wait_count,
+        run_sum_sec = s.run_sum_sec + EXCLUDED.run_sum_sec,
+        run_count = s.run_count + EXCLUDED.run_count,
+        completed_count = s.completed_count + EXCLUDED.completed_count,
+        completed_first_finished_at = LEAST(s.completed_first_finished_at, EXCLUDED.completed_first_finished_at),
+        completed_last_finished_at = GREATEST(s.completed_last_finished_at, EXCLUDED.completed_last_finished_at);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_rollup_trigger() RETURNS trigger AS $$
+DECLARE
+    v_shard integer := pg_backend_pid() % {SHARDS};
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM tasks_rollup_apply(OLD, -1, v_shard);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM tasks_rollup_apply(NEW, 1, v_shard);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_rollup_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM task_status_counts;
+    DELETE FROM task_type_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+ROLLUP_TRIGGERS = """
+CREATE TRIGGER tasks_rollup_insert_delete
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_rollup_trigger();
+
+CREATE TRIGGER tasks_rollup_update
+    AFTER UPDATE ON tasks
+    FOR EACH ROW
+    WHEN (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.task_type IS DISTINCT FROM NEW.task_type
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        OR OLD.started_at IS DISTINCT FROM NEW.started_at
+        OR OLD.finished_at IS DISTINCT FROM NEW.finished_at
+    )
+    EXECUTE FUNCTION tasks_rollup_trigger();
+
+CREATE TRIGGER tasks_rollup_truncate
+    AFTER TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_rollup_truncate();
+"""
+
+BACKFILL = """
+INSERT INTO task_status_counts (status, shard, count)
+SELECT status::text, 0, COUNT(*) FROM tasks GROUP BY status;
+
+INSERT INTO task_type_stats (
+    task_type, shard, wait_sum_sec, wait_count, run_sum_sec, run_count,
+    completed_count, completed_first_finished_at, completed_last_finished_at
+)
+SELECT
+    task_type::text,
+    0,
+    COALESCE(SUM(EXTRACT(EPOCH FROM started_at - created_at)), 0),
+    COUNT(started_at),
+    COALESCE(SUM(EXTRACT(EPOCH FROM finished_at - started_at)), 0),
+    COUNT(finished_at - started_at),
+    COUNT(*) FILTER (WHERE status = 'COMPLETED' AND finished_at IS NOT NULL),
+    MIN(finished_at) FILTER (WHERE status = 'COMPLETED'),
+    MAX(finished_at) FILTER (WHERE status = 'COMPLETED')
+FROM tasks
+GROUP BY task_type;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_status_counts",
+        sa.Column("status", sa.String(16), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "task_type_stats",
+        sa.Column("task_type", sa.String(32), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        sa.Column("wait_sum_sec", sa.Float(), nullable=False),
+        sa.Column("wait_count", sa.BigInteger(), nullable=False),
+        sa.Column("run_sum_sec", sa.Float(), nullable=False),
+        sa.Column("run_count", sa.BigInteger(), nullable=False),
+        sa.Column("completed_count", sa.BigInteger(), nullable=False),
+        sa.Column("completed_first_finished_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_last_finished_at", sa.DateTime(), nullable=True),
+    )
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute(ROLLUP_FUNCTIONS)
+    op.execute(ROLLUP_TRIGGERS)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tasks_rollup_truncate ON tasks")
+        op.execute("DROP TRIGGER IF EXISTS tasks_rollup_update ON tasks")
+        op.execute("DROP TRIGGER IF EXISTS tasks_rollup_insert_delete ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS tasks_rollup_truncate()")
+        op.execute("DROP FUNCTION IF EXISTS tasks_rollup_trigger()")
+        op.execute("DROP FUNCTION IF EXISTS tasks_rollup_apply(tasks, integer, integer)")
+    op.drop_table("task_type_stats")
+    op.drop_table("task_status_counts")
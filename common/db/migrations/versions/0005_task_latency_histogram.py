@@ -0,0 +1,155 @@
+"""trigger-maintained latency histograms for percentile sketches
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SHARDS = 16
+GAMMA = (1 + 0.01) / (1 - 0.01)
+
+METRICS = (
+    ("queue_wait", "dispatched_at", "created_at"),
+    ("dispatch_to_start", "started_at", "dispatched_at"),
+    ("run", "finished_at", "started_at"),
+)
+
+
+def _seconds(row: str, end: str, start: str) -> str:
+    return f"EXTRACT(EPOCH FROM {row}.{end} - {row}.{start})::double precision"
+
+
+LATENCY_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION task_latency_bucket(seconds double precision) RETURNS integer AS $$
+    SELECT GREATEST(0, CEIL(LN(GREATEST(seconds * 1000.0, 1e-9)) / LN({GAMMA!r})))::integer
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+CREATE OR REPLACE FUNCTION tasks_latency_add(
+    p_type text, p_metric text, p_shard integer, p_seconds double precision, p_sign integer
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO task_latency_histogram AS h (task_type, metric, shard, bucket, count)
+    VALUES (p_type, p_metric, p_shard, task_latency_bucket(p_seconds), p_sign)
+    ON CONFLICT (task_type, metric, shard, bucket) DO UPDATE SET count = h.count + EXCLUDED.count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_latency_move(
+    p_metric text, p_shard integer,
+    p_old_type text, p_old_seconds double precision,
+    p_new_type text, p_new_seconds double precision
+) RETURNS void AS $$
+BEGIN
+    IF p_old_type IS NOT DISTINCT FROM p_new_type
+       AND task_latency_bucket(p_old_seconds) IS NOT DISTINCT FROM task_latency_bucket(p_new_seconds) THEN
+        RETURN;
+    END IF;
+    IF p_old_seconds IS NOT NULL THEN
+        PERFORM tasks_latency_add(p_old_type, p_metric, p_shard, p_old_seconds, -1);
+    END IF;
+    IF p_new_seconds IS NOT NULL THEN
+        PERFORM tasks_latency_add(p_new_type, p_metric, p_shard, p_new_seconds, 1);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_latency_trigger() RETURNS trigger AS $$
+DECLARE
+    v_shard integer := pg_backend_pid() % {SHARDS};
+BEGIN
+""" + "".join(
+    f"""    PERFORM tasks_latency_move(
+        '{metric}', v_shard,
+        OLD.task_type::text, {_seconds("OLD", end, start)},
+        NEW.task_type::text, {_seconds("NEW", end, start)}
+    );
+"""
+    for metric, end, start in METRICS
+) + """    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_rollup_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM task_status_counts;
+    DELETE FROM task_type_stats;
+    DELETE FROM task_latency_histogram;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+LATENCY_TRIGGERS = """
+CREATE TRIGGER tasks_latency_insert_delete
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_latency_trigger();
+
+CREATE TRIGGER tasks_latency_update
+    AFTER UPDATE ON tasks
+    FOR EACH ROW
+    WHEN (
+        OLD.task_type IS DISTINCT FROM NEW.task_type
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        OR OLD.dispatched_at IS DISTINCT FROM NEW.dispatched_at
+        OR OLD.started_at IS DISTINCT FROM NEW.started_at
+        OR OLD.finished_at IS DISTINCT FROM NEW.finished_at
+    )
+    EXECUTE FUNCTION tasks_latency_trigger();
+"""
+
+BACKFILL = "".join(
+    f"""
+INSERT INTO task_latency_histogram (task_type, metric, shard, bucket, count)
+SELECT task_type::text, '{metric}', 0, task_latency_bucket({_seconds("tasks", end, start)}), COUNT(*)
+FROM tasks
+WHERE {end} IS NOT NULL AND {start} IS NOT NULL
+GROUP BY 1, 4;
+"""
+    for metric, end, start in METRICS
+)
+
+RESTORE_TRUNCATE = """
+CREATE OR REPLACE FUNCTION tasks_rollup_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM task_status_counts;
+    DELETE FROM task_type_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_latency_histogram",
+        sa.Column("task_type", sa.String(32), primary_key=True),
+        sa.Column("metric", sa.String(24), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        sa.Column("bucket", sa.Integer(), primary_key=True),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+    )
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute(LATENCY_FUNCTIONS)
+    op.execute(LATENCY_TRIGGERS)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tasks_latency_update ON tasks")
+        op.execute("DROP TRIGGER IF EXISTS tasks_latency_insert_delete ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS tasks_latency_trigger()")
+        op.execute("DROP FUNCTION IF EXISTS tasks_latency_move(text, integer, text, double precision, text, double precision)")
+        op.execute("DROP FUNCTION IF EXISTS tasks_latency_add(text, text, integer, double precision, integer)")
+        op.execute("DROP FUNCTION IF EXISTS task_latency_bucket(double precision)")
+        op.execute(RESTORE_TRUNCATE)
+    op.drop_table("task_latency_histogram")
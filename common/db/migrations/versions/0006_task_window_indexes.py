@@ -0,0 +1,32 @@
+"""range indexes for time-bucketed stats
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _concurrently() -> dict:
+    return {"postgresql_concurrently": True} if op.get_bind().dialect.name == "postgresql" else {}
+
+
+def upgrade() -> None:
+    where = sa.text("finished_at IS NOT NULL")
+    with op.get_context().autocommit_block():
+        op.create_index("ix_tasks_created_at", "tasks", ["created_at"], **_concurrently())
+        op.create_index(
+            "ix_tasks_finished_at", "tasks", ["finished_at"],
+            postgresql_where=where, sqlite_where=where, **_concurrently(),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_finished_at", table_name="tasks")
+    op.drop_index("ix_tasks_created_at", table_name="tasks")
@@ -0,0 +1,300 @@
+"""range-partition tasks by created_at
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+DAYS_AHEAD = 7
+
+INDEXES = (
+    ("ix_tasks_pending_created_at", "(created_at) WHERE status = 'PENDING'"),
+    ("ix_tasks_dispatched_type_created_at", "(task_type, created_at) WHERE status = 'DISPATCHED'"),
+    ("ix_tasks_status_type", "(status, task_type)"),
+    ("ix_tasks_type_finished_at", "(task_type, finished_at) WHERE finished_at IS NOT NULL"),
+    ("ix_tasks_created_at", "(created_at)"),
+    ("ix_tasks_finished_at", "(finished_at) WHERE finished_at IS NOT NULL"),
+)
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS tasks_rollup_insert_delete ON tasks;
+DROP TRIGGER IF EXISTS tasks_rollup_update ON tasks;
+DROP TRIGGER IF EXISTS tasks_rollup_truncate ON tasks;
+DROP TRIGGER IF EXISTS tasks_latency_insert_delete ON tasks;
+DROP TRIGGER IF EXISTS tasks_latency_update ON tasks;
+"""
+
+TRIGGERS = """
+CREATE TRIGGER tasks_rollup_insert_delete
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_rollup_trigger();
+
+CREATE TRIGGER tasks_rollup_update
+    AFTER UPDATE ON tasks
+    FOR EACH ROW
+    WHEN (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.task_type IS DISTINCT FROM NEW.task_type
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        OR OLD.started_at IS DISTINCT FROM NEW.started_at
+        OR OLD.finished_at IS DISTINCT FROM NEW.finished_at
+    )
+    EXECUTE FUNCTION tasks_rollup_trigger();
+
+CREATE TRIGGER tasks_rollup_truncate
+    AFTER TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_rollup_truncate();
+
+CREATE TRIGGER tasks_latency_insert_delete
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_latency_trigger();
+
+CREATE TRIGGER tasks_latency_update
+    AFTER UPDATE ON tasks
+    FOR EACH ROW
+    WHEN (
+        OLD.task_type IS DISTINCT FROM NEW.task_type
+        OR OLD.created_at IS DISTINCT FROM NEW.created_at
+        OR OLD.dispatched_at IS DISTINCT FROM NEW.dispatched_at
+        OR OLD.started_at IS DISTINCT FROM NEW.started_at
+        OR OLD.finished_at IS DISTINCT FROM NEW.finished_at
+    )
+    EXECUTE FUNCTION tasks_latency_trigger();
+"""
+
+ROLLUP_APPLY_BODY = """
+DECLARE
+    waited boolean := r.started_at IS NOT NULL AND r.created_at IS NOT NULL;
+    ran boolean := r.started_at IS NOT NULL AND r.finished_at IS NOT NULL;
+    done boolean := r.status = 'COMPLETED' AND r.finished_at IS NOT NULL;
+BEGIN
+    INSERT INTO task_status_counts AS c (status, shard, count)
+    VALUES (r.status::text, p_shard, p_sign)
+    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+    INSERT INTO task_type_stats AS s (
+        task_type, shard, wait_sum_sec, wait_count, run_sum_sec, run_count,
+        completed_count, completed_first_finished_at, completed_last_finished_at
+    )
+    VALUES (
+        r.task_type::text,
+        p_shard,
+        CASE WHEN waited THEN p_sign * EXTRACT(EPOCH FROM r.started_at - r.created_at) ELSE 0 END,
+        CASE WHEN waited THEN p_sign ELSE 0 END,
+        CASE WHEN ran THEN p_sign * EXTRACT(EPOCH FROM r.finished_at - r.started_at) ELSE 0 END,
+        CASE WHEN ran THEN p_sign ELSE 0 END,
+        CASE WHEN done THEN p_sign ELSE 0 END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END
+    )
+    ON CONFLICT (task_type, shard) DO UPDATE SET
+        wait_sum_sec = s.wait_sum_sec + EXCLUDED.wait_sum_sec,
+        wait_count = s.wait_count + EXCLUDED.wait_count,
+        run_sum_sec = s.run_sum_sec + EXCLUDED.run_sum_sec,
+        run_count = s.run_count + EXCLUDED.run_count,
+        completed_count = s.completed_count + EXCLUDED.completed_count,
+        completed_first_finished_at = LEAST(s.completed_first_finished_at, EXCLUDED.completed_first_finished_at),
+        completed_last_finished_at = GREATEST(s.completed_last_finished_at, EXCLUDED.completed_last_finished_at);
+END;
+"""
+
+
+def _rollup_apply(row_type: str) -> str:
+    return (
+        f"CREATE OR REPLACE FUNCTION tasks_rollup_apply(r {row_type}, p_sign integer, p_shard integer) "
+        f"RETURNS void AS $${ROLLUP_APPLY_BODY}$$ LANGUAGE plpgsql;"
+    )
+
+
+LATENCY_METRICS = (
+    ("queue_wait", "dispatched_at", "created_at"),
+    ("dispatch_to_start", "started_at", "dispatched_at"),
+    ("run", "finished_at", "started_at"),
+)
+
+SUBTRACT_PARTITION = """
+    EXECUTE format(
+        'INSERT INTO task_status_counts AS c (status, shard, count)
+         SELECT status::text, 0, -COUNT(*) FROM %I GROUP BY status
+         ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count',
+        p_name);
+    EXECUTE format(
+        'INSERT INTO task_type_stats AS s (
+             task_type, shard, wait_sum_sec, wait_count, run_sum_sec, run_count, completed_count
+         )
+         SELECT task_type::text, 0,
+             -COALESCE(SUM(EXTRACT(EPOCH FROM started_at - created_at)), 0),
+             -COUNT(started_at),
+             -COALESCE(SUM(EXTRACT(EPOCH FROM finished_at - started_at)), 0),
+             -COUNT(finished_at - started_at),
+             -COUNT(*) FILTER (WHERE status = ''COMPLETED'' AND finished_at IS NOT NULL)
+         FROM %I GROUP BY task_type
+         ON CONFLICT (task_type, shard) DO UPDATE SET
+             wait_sum_sec = s.wait_sum_sec + EXCLUDED.wait_sum_sec,
+             wait_count = s.wait_count + EXCLUDED.wait_count,
+             run_sum_sec = s.run_sum_sec + EXCLUDED.run_sum_sec,
+             run_count = s.run_count + EXCLUDED.run_count,
+             completed_count = s.completed_count + EXCLUDED.completed_count',
+        p_name);
+""" + "".join(
+    f"""    EXECUTE format(
+        'INSERT INTO task_latency_histogram AS h (task_type, metric, shard, bucket, count)
+         SELECT task_type::text, ''{metric}'', 0,
+             task_latency_bucket(EXTRACT(EPOCH FROM {end} - {start})::double precision), -COUNT(*)
+         FROM %I WHERE {end} IS NOT NULL AND {start} IS NOT NULL GROUP BY 1, 4
+         ON CONFLICT (task_type, metric, shard, bucket) DO UPDATE SET count = h.count + EXCLUDED.count',
+        p_name);
+"""
+    for metric, end, start in LATENCY_METRICS
+)
+
+PARTITION_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION tasks_ensure_partition(p_day date) RETURNS text AS $$
+DECLARE
+    v_name text := 'tasks_p' || to_char(p_day, 'YYYYMMDD');
+    v_from timestamp := p_day::timestamp;
+    v_to timestamp := (p_day + 1)::timestamp;
+    v_moved bigint;
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL OR EXISTS (
+        SELECT 1 FROM tasks_partitions()
+        WHERE NOT is_default
+          AND (range_from IS NULL OR range_from < v_to)
+          AND (range_to IS NULL OR range_to > v_from)
+    ) THEN
+        RETURN NULL;
+    END IF;
+
+    CREATE TEMP TABLE IF NOT EXISTS tasks_partition_moving (LIKE tasks) ON COMMIT DELETE ROWS;
+    WITH moved AS (
+        DELETE FROM tasks_default WHERE created_at >= v_from AND created_at < v_to RETURNING *
+    )
+    INSERT INTO tasks_partition_moving SELECT * FROM moved;
+    GET DIAGNOSTICS v_moved = ROW_COUNT;
+
+    EXECUTE format('CREATE TABLE %I (LIKE tasks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', v_name);
+    EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK (created_at >= %L AND created_at < %L)',
+        v_name, v_name || '_range', v_from, v_to);
+    EXECUTE format('ALTER TABLE tasks ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', v_name, v_from, v_to);
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', v_name, v_name || '_range');
+
+    IF v_moved > 0 THEN
+        INSERT INTO tasks SELECT * FROM tasks_partition_moving;
+        DELETE FROM tasks_partition_moving;
+    END IF;
+    RETURN v_name;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_partitions() RETURNS TABLE (
+    name text, is_default boolean, range_from timestamp, range_to timestamp, approx_rows bigint
+) AS $$
+    SELECT
+        c.relname::text,
+        b.bound = 'DEFAULT',
+        CASE WHEN b.bound LIKE 'FOR VALUES FROM (''%' THEN substring(b.bound FROM 'FROM \\(''([^'']+)''\\)')::timestamp END,
+        CASE WHEN b.bound LIKE '% TO (''%' THEN substring(b.bound FROM 'TO \\(''([^'']+)''\\)')::timestamp END,
+        GREATEST(c.reltuples, 0)::bigint
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    CROSS JOIN LATERAL (SELECT pg_get_expr(c.relpartbound, c.oid) AS bound) b
+    WHERE i.inhparent = 'tasks'::regclass
+    ORDER BY 3 NULLS FIRST, 1
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION tasks_retire_partition(p_name text, p_drop boolean) RETURNS void AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM tasks_partitions() WHERE name = p_name AND NOT is_default) THEN
+        RAISE EXCEPTION '% is not a range partition of tasks', p_name;
+    END IF;
+""" + SUBTRACT_PARTITION + """
+    EXECUTE format('ALTER TABLE tasks DETACH PARTITION %I', p_name);
+    UPDATE task_type_stats s SET
+        completed_first_finished_at = CASE
+            WHEN m.first_finished IS NULL THEN NULL
+            ELSE GREATEST(s.completed_first_finished_at, m.first_finished)
+        END,
+        completed_last_finished_at = CASE WHEN m.first_finished IS NULL THEN NULL ELSE s.completed_last_finished_at END
+    FROM (
+        SELECT t.task_type, (
+            SELECT MIN(finished_at) FROM tasks
+            WHERE status = 'COMPLETED' AND finished_at IS NOT NULL AND task_type::text = t.task_type
+        ) AS first_finished
+        FROM (SELECT DISTINCT task_type FROM task_type_stats) t
+    ) m
+    WHERE s.task_type = m.task_type;
+    IF p_drop THEN
+        EXECUTE format('DROP TABLE %I', p_name);
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def _rename_legacy_indexes(old: str, new: str) -> None:
+    op.execute(f"ALTER INDEX IF EXISTS {old}_pkey RENAME TO {new}_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {name} RENAME TO {name.replace('ix_tasks_', f'ix_{new}_', 1)}")
+
+
+def _create_indexes() -> None:
+    for name, definition in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON tasks {definition}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute(DROP_TRIGGERS)
+    op.execute("DROP FUNCTION IF EXISTS tasks_rollup_apply(tasks, integer, integer)")
+    op.execute("ALTER TABLE tasks RENAME TO tasks_legacy")
+    _rename_legacy_indexes("tasks", "tasks_legacy")
+
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id, created_at)")
+    _create_indexes()
+    op.execute("ALTER TABLE tasks_legacy DROP CONSTRAINT tasks_legacy_pkey")
+    op.execute("ALTER TABLE tasks_legacy ADD CONSTRAINT tasks_legacy_pkey PRIMARY KEY (id, created_at)")
+    op.execute(
+        "ALTER TABLE tasks ATTACH PARTITION tasks_legacy "
+        "FOR VALUES FROM (MINVALUE) TO (date_trunc('day', now() AT TIME ZONE 'utc') + interval '1 day')"
+    )
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+
+    op.execute(_rollup_apply("record"))
+    op.execute(PARTITION_FUNCTIONS)
+    op.execute(TRIGGERS)
+    op.execute(
+        f"SELECT tasks_ensure_partition((now() AT TIME ZONE 'utc')::date + d) "
+        f"FROM generate_series(1, {DAYS_AHEAD}) AS d"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute(DROP_TRIGGERS)
+    op.execute("CREATE TABLE tasks_flat (LIKE tasks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute("INSERT INTO tasks_flat SELECT * FROM tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_retire_partition(text, boolean)")
+    op.execute("DROP FUNCTION IF EXISTS tasks_ensure_partition(date)")
+    op.execute("DROP FUNCTION IF EXISTS tasks_partitions()")
+    op.execute("DROP TABLE tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_rollup_apply(record, integer, integer)")
+    op.execute("ALTER TABLE tasks_flat RENAME TO tasks")
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id)")
+    _create_indexes()
+    op.execute(_rollup_apply("tasks"))
+    op.execute(TRIGGERS)
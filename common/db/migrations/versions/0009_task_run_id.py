@@ -0,0 +1,30 @@
+"""task run id
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("run_id", sa.String(64), nullable=True))
+    op.create_index(
+        "ix_tasks_run_id_created_at",
+        "tasks",
+        ["run_id", "created_at"],
+        postgresql_where=sa.text("run_id IS NOT NULL"),
+        sqlite_where=sa.text("run_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_run_id_created_at", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("run_id")
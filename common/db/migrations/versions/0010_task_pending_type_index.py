@@ -0,0 +1,28 @@
+"""per-type pending index for backlog age
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    where = sa.text("status = 'PENDING'")
+    op.create_index(
+        "ix_tasks_pending_type_created_at",
+        "tasks",
+        ["task_type", "created_at"],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_pending_type_created_at", table_name="tasks")
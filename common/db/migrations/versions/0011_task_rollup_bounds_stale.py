@@ -0,0 +1,81 @@
+"""flag completed finish bounds for recompute after removals
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+ROLLUP_APPLY_BODY = """
+DECLARE
+    waited boolean := r.started_at IS NOT NULL AND r.created_at IS NOT NULL;
+    ran boolean := r.started_at IS NOT NULL AND r.finished_at IS NOT NULL;
+    done boolean := r.status = 'COMPLETED' AND r.finished_at IS NOT NULL;
+BEGIN
+    INSERT INTO task_status_counts AS c (status, shard, count)
+    VALUES (r.status::text, p_shard, p_sign)
+    ON CONFLICT (status, shard) DO UPDATE SET count = c.count + EXCLUDED.count;
+
+    INSERT INTO task_type_stats AS s (
+        task_type, shard, wait_sum_sec, wait_count, run_sum_sec, run_count,
+        completed_count, completed_first_finished_at, completed_last_finished_at{stale_column}
+    )
+    VALUES (
+        r.task_type::text,
+        p_shard,
+        CASE WHEN waited THEN p_sign * EXTRACT(EPOCH FROM r.started_at - r.created_at) ELSE 0 END,
+        CASE WHEN waited THEN p_sign ELSE 0 END,
+        CASE WHEN ran THEN p_sign * EXTRACT(EPOCH FROM r.finished_at - r.started_at) ELSE 0 END,
+        CASE WHEN ran THEN p_sign ELSE 0 END,
+        CASE WHEN done THEN p_sign ELSE 0 END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END,
+        CASE WHEN done AND p_sign > 0 THEN r.finished_at END{stale_value}
+    )
+    ON CONFLICT (task_type, shard) DO UPDATE SET
+        wait_sum_sec = s.wait_sum_sec + EXCLUDED.wait_sum_sec,
+        wait_count = s.wait_count + EXCLUDED.wait_count,
+        run_sum_sec = s.run_sum_sec + EXCLUDED.run_sum_sec,
+        run_count = s.run_count + EXCLUDED.run_count,
+        completed_count = s.completed_count + EXCLUDED.completed_count,
+        completed_first_finished_at = LEAST(s.completed_first_finished_at, EXCLUDED.completed_first_finished_at),
+        completed_last_finished_at = GREATEST(s.completed_last_finished_at, EXCLUDED.completed_last_finished_at){stale_update};
+END;
+"""
+
+
+def _rollup_apply(stale: bool) -> str:
+    body = ROLLUP_APPLY_BODY.format(
+        stale_column=", completed_bounds_stale" if stale else "",
+        stale_value=",\n        done AND p_sign < 0" if stale else "",
+        stale_update=(
+            ",\n        completed_bounds_stale = s.completed_bounds_stale OR EXCLUDED.completed_bounds_stale"
+            if stale
+            else ""
+        ),
+    )
+    return (
+        "CREATE OR REPLACE FUNCTION tasks_rollup_apply(r record, p_sign integer, p_shard integer) "
+        f"RETURNS void AS $${body}$$ LANGUAGE plpgsql;"
+    )
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_type_stats",
+        sa.Column("completed_bounds_stale", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(_rollup_apply(stale=True))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(_rollup_apply(stale=False))
+    with op.batch_alter_table("task_type_stats") as batch:
+        batch.drop_column("completed_bounds_stale")
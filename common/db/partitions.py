@@ -0,0 +1,131 @@
+import argparse
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from common.db.config import DatabaseSettings
+from common.db.engine import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DROP = "drop"
+RETENTION_DETACH = "detach"
+MAINTENANCE_LOCK_KEY = 7_310_046
+
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('tasks')")
+        ).scalar()
+    )
+
+
+def list_partitions(conn: Connection) -> List[Dict[str, Any]]:
+    rows = conn.execute(
+        text("SELECT name, is_default, range_from, range_to, approx_rows FROM tasks_partitions()")
+    ).mappings()
+    return [dict(r) for r in rows]
+
+
+def ensure_partitions(conn: Connection, days_ahead: int, today: Optional[datetime] = None) -> List[str]:
+    today = (today or datetime.utcnow()).date()
+    created = []
+    for offset in range(0, max(0, days_ahead) + 1):
+        day = today + timedelta(days=offset)
+        name = conn.execute(text("SELECT tasks_ensure_partition(:day)"), {"day": day}).scalar()
+        if name:
+            created.append(name)
+    return created
+
+
+def expired_partitions(conn: Connection, retention_days: int, now: Optional[datetime] = None) -> List[str]:
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    return [
+        p["name"]
+        for p in list_partitions(conn)
+        if not p["is_default"] and p["range_to"] is not None and p["range_to"] <= cutoff
+    ]
+
+
+def retire_partition(conn: Connection, name: str, mode: str) -> None:
+    if mode not in (RETENTION_DROP, RETENTION_DETACH):
+        raise ValueError(f"Unknown retention mode: {mode}")
+    conn.execute(text("SELECT tasks_retire_partition(:name, :drop)"), {"name": name, "drop": mode == RETENTION_DROP})
+
+
+def maintain_partitions(engine: Engine, settings: Any) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"created": [], "retired": []}
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return out
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": MAINTENANCE_LOCK_KEY}).scalar()
+        conn.commit()
+        if not locked:
+            return out
+        try:
+            out["created"] = ensure_partitions(conn, int(settings.db_partition_days_ahead))
+            conn.commit()
+            if int(settings.db_partition_retention_days) > 0:
+                for name in expired_partitions(conn, int(settings.db_partition_retention_days)):
+                    retire_partition(conn, name, settings.db_partition_retention_mode)
+                    conn.commit()
+                    out["retired"].append(name)
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": MAINTENANCE_LOCK_KEY})
+            conn.commit()
+    if out["created"] or out["retired"]:
+        logger.info("Partition maintenance: created=%s retired=%s", out["created"], out["retired"])
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain time-range partitions of the tasks table")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status")
+    ens = sub.add_parser("ensure")
+    ens.add_argument("--days-ahead", type=int, default=None)
+    ret = sub.add_parser("retain")
+    ret.add_argument("--days", type=int, required=True)
+    ret.add_argument("--mode", choices=[RETENTION_DROP, RETENTION_DETACH], default=None)
+    ret.add_argument("--dry-run", action="store_true")
+    sub.add_parser("maintain")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    settings = DatabaseSettings()
+    engine = create_db_engine(settings, application_name="partitions")
+    try:
+        if args.cmd == "maintain":
+            print(json.dumps(maintain_partitions(engine, settings)))
+            return
+        with engine.connect() as conn:
+            if not is_partitioned(conn):
+                raise SystemExit("tasks is not partitioned on this database")
+            if args.cmd == "status":
+                for p in list_partitions(conn):
+                    print(json.dumps(p, default=str))
+            elif args.cmd == "ensure":
+                days = settings.db_partition_days_ahead if args.days_ahead is None else args.days_ahead
+                print(json.dumps({"created": ensure_partitions(conn, days)}))
+                conn.commit()
+            elif args.cmd == "retain":
+                names = expired_partitions(conn, args.days)
+                if not args.dry_run:
+                    for name in names:
+                        retire_partition(conn, name, args.mode or settings.db_partition_retention_mode)
+                        conn.commit()
+                print(json.dumps({"retired": names, "dry_run": args.dry_run}))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
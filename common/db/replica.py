@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from common.db.engine import create_db_engine
+
+logger = logging.getLogger(__name__)
+
+ROUTE_PRIMARY = "primary"
+ROUTE_REPLICA = "replica"
+
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0.0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+            AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0.0
+        ELSE EXTRACT(EPOCH FROM clock_timestamp() - pg_last_xact_replay_timestamp())::float8
+    END
+    """
+)
+
+
+def create_read_engine(settings: Any, application_name: str = "") -> Optional[Engine]:
+    if not settings.database_read_url:
+        return None
+    read_settings = settings.model_copy(
+        update={
+            "database_url": settings.database_read_url,
+            "db_connect_timeout_sec": settings.db_replica_connect_timeout_sec,
+        }
+    )
+    return create_db_engine(read_settings, application_name=application_name)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Optional[Engine],
+        max_lag_sec: float = 5.0,
+        check_interval_sec: float = 1.0,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.max_lag_sec = float(max_lag_sec)
+        self.check_interval_sec = float(check_interval_sec)
+        self._probe_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._lag_sec: Optional[float] = None
+        self._error: Optional[str] = None
+        self.routed: Dict[str, int] = {ROUTE_PRIMARY: 0, ROUTE_REPLICA: 0}
+
+    def _probe(self) -> None:
+        try:
+            with self.replica.connect() as conn:
+                lag = conn.execute(LAG_QUERY).scalar() if conn.dialect.name == "postgresql" else 0.0
+            self._lag_sec = float(lag) if lag is not None else None
+            self._error = None if lag is not None else "replica has not replayed any transaction yet"
+        except Exception as e:
+            self._lag_sec = None
+            self._error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            logger.warning("Replica lag check failed: %s", self._error)
+        self._checked_at = time.monotonic()
+
+    def _stale(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval_sec
+
+    def lag_sec(self) -> Optional[float]:
+        if self.replica is None:
+            return None
+        if self._stale() and self._probe_lock.acquire(blocking=self._checked_at is None):
+            try:
+                if self._stale():
+                    self._probe()
+            finally:
+                self._probe_lock.release()
+        return self._lag_sec
+
+    def replica_usable(self) -> bool:
+        lag = self.lag_sec()
+        return lag is not None and lag <= self.max_lag_sec
+
+    def read_engine(self) -> Engine:
+        route = ROUTE_REPLICA if self.replica is not None and self.replica_usable() else ROUTE_PRIMARY
+        with self._count_lock:
+            self.routed[route] += 1
+        return self.replica if route == ROUTE_REPLICA else self.primary
+
+    def status(self) -> Dict[str, Any]:
+        if self.replica is None:
+            return {"configured": False, "route": ROUTE_PRIMARY}
+        usable = self.replica_usable()
+        return {
+            "configured": True,
+            "route": ROUTE_REPLICA if usable else ROUTE_PRIMARY,
+            "lag_sec": self._lag_sec,
+            "max_lag_sec": self.max_lag_sec,
+            "checked_age_sec": round(time.monotonic() - self._checked_at, 3) if self._checked_at else None,
+            "last_error": self._error,
+            "routed": dict(self.routed),
+        }
+
+    def collect(self, service: str) -> Iterable[Any]:
+        lag = GaugeMetricFamily("db_replica_lag_seconds", "Replay lag of the read replica.", labels=["service"])
+        if self._lag_sec is not None:
+            lag.add_metric([service], self._lag_sec)
+        yield lag
+        routed = CounterMetricFamily("db_read_routes", "Read sessions by routed target.", labels=["service", "target"])
+        with self._count_lock:
+            for target, count in self.routed.items():
+                routed.add_metric([service, target], float(count))
+        yield routed
+
+
+def create_read_session_factory(router: ReplicaRouter) -> Callable[[], Session]:
+    factory = sessionmaker(autoflush=False, autocommit=False)
+    return lambda: factory(bind=router.read_engine())
@@ -0,0 +1,11 @@
+from .stats import TaskLatencyHistogram, TaskStatusCount, TaskTypeStats
+from .task import Task, TaskStatus, TaskType
+
+__all__ = [
+    "Task",
+    "TaskStatus",
+    "TaskType",
+    "TaskStatusCount",
+    "TaskTypeStats",
+    "TaskLatencyHistogram",
+]
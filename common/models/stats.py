@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, Integer, SmallInteger, String, false
+
+from common.db.base import Base
+
+
+class TaskStatusCount(Base):
+    __tablename__ = "task_status_counts"
+
+    status = Column(String(16), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+
+class TaskTypeStats(Base):
+    __tablename__ = "task_type_stats"
+
+    task_type = Column(String(32), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+
+    wait_sum_sec = Column(Float, nullable=False, default=0.0)
+    wait_count = Column(BigInteger, nullable=False, default=0)
+    run_sum_sec = Column(Float, nullable=False, default=0.0)
+    run_count = Column(BigInteger, nullable=False, default=0)
+
+    completed_count = Column(BigInteger, nullable=False, default=0)
+    completed_first_finished_at = Column(DateTime, nullable=True)
+    completed_last_finished_at = Column(DateTime, nullable=True)
+    completed_bounds_stale = Column(Boolean, nullable=False, default=False, server_default=false())
+
+
+class TaskLatencyHistogram(Base):
+    __tablename__ = "task_latency_histogram"
+
+    task_type = Column(String(32), primary_key=True)
+    metric = Column(String(24), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,59 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text, text
+
+from common.db.base import Base
+
+
+class TaskType(str, enum.Enum):
+    CPU_INTENSIVE = "CPU_INTENSIVE"
+    MEMORY_INTENSIVE = "MEMORY_INTENSIVE"
+
+
+class TaskStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    DISPATCHED = "DISPATCHED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+def _where(clause: str) -> dict:
+    return {"postgresql_where": text(clause), "sqlite_where": text(clause)}
+
+
+class Task(Base):
+    __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_pending_created_at", "created_at", **_where("status = 'PENDING'")),
+        Index("ix_tasks_pending_type_created_at", "task_type", "created_at", **_where("status = 'PENDING'")),
+        Index("ix_tasks_dispatched_type_created_at", "task_type", "created_at", **_where("status = 'DISPATCHED'")),
+        Index("ix_tasks_status_type", "status", "task_type"),
+        Index("ix_tasks_type_finished_at", "task_type", "finished_at", **_where("finished_at IS NOT NULL")),
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_finished_at", "finished_at", **_where("finished_at IS NOT NULL")),
+        Index("ix_tasks_run_id_created_at", "run_id", "created_at", **_where("run_id IS NOT NULL")),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    task_type = Column(Enum(TaskType), nullable=False)
+    status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING)
+
+    complexity = Column(Integer, nullable=False)
+    kernel = Column(String(32), nullable=True)
+    expected_duration_sec = Column(Integer, nullable=True)
+    payload_size_kb = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    dispatched_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    error_message = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+
+    trace_id = Column(String(32), nullable=True)
+    run_id = Column(String(64), nullable=True)
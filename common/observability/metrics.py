@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Histogram, generate_latest, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RUN_TIME_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK"}
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["service", "method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "DB round-trip time per statement.",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_RUN_SECONDS = Histogram(
+    "worker_task_run_seconds",
+    "Task run time from start to finish as reported by the worker.",
+    ["task_type", "status"],
+    buckets=RUN_TIME_BUCKETS,
+)
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:16].split(None, 1)
+    op = head[0].upper() if head else ""
+    return op if op in SQL_OPERATIONS else "OTHER"
+
+
+class PoolCollector(Collector):
+    FIELDS = (
+        ("capacity", "db_pool_capacity", "Configured pool size plus overflow."),
+        ("in_use", "db_pool_in_use", "Connections currently checked out."),
+        ("in_use_peak", "db_pool_in_use_peak", "Highest concurrent checkouts observed."),
+        ("wait_max_ms", "db_pool_checkout_wait_max_ms", "Longest pool checkout wait."),
+    )
+    COUNTERS = (
+        ("checkouts", "db_pool_checkouts", "Successful pool checkouts."),
+        ("timeouts", "db_pool_checkout_timeouts", "Pool checkouts that timed out."),
+        ("slow_checkouts", "db_pool_slow_checkouts", "Checkouts slower than db_slow_checkout_ms."),
+    )
+
+    def __init__(self, engines: Dict[str, Engine]):
+        self.engines = engines
+
+    def collect(self) -> Iterable[Any]:
+        snapshots = []
+        for service, engine in self.engines.items():
+            metrics = getattr(engine, "pool_metrics", None)
+            if metrics is not None:
+                snapshots.append((service, metrics.snapshot()))
+        for key, name, doc in self.FIELDS:
+            family = GaugeMetricFamily(name, doc, labels=["service"])
+            for service, snap in snapshots:
+                if snap.get(key) is not None:
+                    family.add_metric([service], float(snap[key]))
+            yield family
+        for key, name, doc in self.COUNTERS:
+            family = CounterMetricFamily(name, doc, labels=["service"])
+            for service, snap in snapshots:
+                family.add_metric([service], float(snap[key]))
+            yield family
+
+
+_engines: Dict[str, Engine] = {}
+_pool_collector = PoolCollector(_engines)
+REGISTRY.register(_pool_collector)
+
+
+def instrument_engine(engine: Engine, service: str) -> None:
+    if _engines.get(service) is engine:
+        return
+    _engines[service] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started: List[float] = conn.info.get("query_started") or []
+        if started:
+            DB_QUERY_SECONDS.labels(service, _operation(statement)).observe(time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        started: List[float] = ctx.connection.info.get("query_started") if ctx.connection is not None else None
+        if started:
+            started.pop()
+
+
+class FunctionCollector(Collector):
+    def __init__(self, collect: Callable[[], Iterable[Any]]):
+        self._collect = collect
+
+    def collect(self) -> Iterable[Any]:
+        return self._collect()
+
+    def describe(self) -> Iterable[Any]:
+        return []
+
+
+def register_collector(collect: Callable[[], Iterable[Any]]) -> Collector:
+    collector = FunctionCollector(collect)
+    REGISTRY.register(collector)
+    return collector
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0") -> bool:
+    if port <= 0:
+        return False
+    start_http_server(port, addr=addr)
+    logger.info("Serving Prometheus metrics on %s:%d/metrics", addr, port)
+    return True
+
+
+class HttpMetricsMiddleware:
+    def __init__(self, app: Any, service: str, exclude: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.service = service
+        self.exclude = exclude
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def _send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(self.service, scope["method"], route, str(status["code"])).observe(
+                time.perf_counter() - started
+            )
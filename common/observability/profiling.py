@@ -0,0 +1,299 @@
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from pydantic_settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+Response = Tuple[int, str, bytes]
+TOKEN_HEADER = "x-debug-token"
+SITE_PACKAGES = "site-packages" + os.sep
+
+
+class ProfilingSettings(BaseSettings):
+    profiling_enabled: bool = False
+    profiling_token: str = ""
+    profiling_port: int = 9101
+    profiling_bind_addr: str = "127.0.0.1"
+    profile_dir: str = "/tmp/profiles"
+    profile_max_sec: float = 120.0
+    profile_interval_ms: float = 10.0
+    tracemalloc_frames: int = 25
+
+
+@lru_cache
+def get_profiling_settings() -> ProfilingSettings:
+    return ProfilingSettings()
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    idx = filename.rfind(SITE_PACKAGES)
+    filename = filename[idx + len(SITE_PACKAGES):] if idx >= 0 else os.path.join(*filename.split(os.sep)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    def __init__(self, service: str, out_dir: str, max_sec: float = 120.0):
+        self.service = service
+        self.out_dir = out_dir
+        self.max_sec = float(max_sec)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last: Optional[Dict[str, Any]] = None
+        self._running: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval_ms: float) -> Dict[str, Any]:
+        seconds = min(max(0.1, float(seconds)), self.max_sec)
+        interval = max(1.0, float(interval_ms)) / 1000.0
+        with self._lock:
+            if self.running:
+                raise ProfilerBusy("a profile is already running")
+            self._running = {
+                "started_at": datetime.utcnow().isoformat(),
+                "seconds": seconds,
+                "interval_ms": interval * 1000,
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(seconds, interval), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        return dict(self._running)
+
+    def _sample(self, counts: Counter, me: int) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            counts[";".join(reversed(stack))] += 1
+
+    def _run(self, seconds: float, interval: float) -> None:
+        counts: Counter = Counter()
+        me = threading.get_ident()
+        samples = 0
+        overhead = 0.0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            t0 = time.perf_counter()
+            if t0 >= deadline:
+                break
+            self._sample(counts, me)
+            samples += 1
+            t1 = time.perf_counter()
+            overhead += t1 - t0
+            time.sleep(max(0.0, interval - (t1 - t0)))
+        elapsed = time.perf_counter() - started
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(self.out_dir, f"{self.service}-{os.getpid()}-{stamp}.collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in counts.most_common():
+                f.write(f"{stack} {n}\n")
+
+        leaves: Counter = Counter()
+        for stack, n in counts.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        total = sum(counts.values()) or 1
+        with self._lock:
+            self._last = {
+                **(self._running or {}),
+                "path": path,
+                "samples": samples,
+                "elapsed_sec": round(elapsed, 3),
+                "sampler_overhead_pct": round(overhead / elapsed * 100.0, 2) if elapsed else None,
+                "top_self": [{"frame": k, "pct": round(v / total * 100.0, 2)} for k, v in leaves.most_common(15)],
+            }
+            self._running = None
+        logger.info("Wrote %d profile samples to %s", samples, path)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"running": self._running, "last": self._last}
+
+    def latest_collapsed(self) -> Optional[bytes]:
+        last = self._last
+        if not last or not os.path.exists(last["path"]):
+            return None
+        with open(last["path"], "rb") as f:
+            return f.read()
+
+
+class AllocationTracker:
+    def __init__(self, frames: int = 25):
+        self.frames = int(frames)
+        self._previous: Optional[tracemalloc.Snapshot] = None
+
+    def start(self, frames: Optional[int] = None) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(int(frames or self.frames))
+        self._previous = None
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        out = self.status()
+        tracemalloc.stop()
+        self._previous = None
+        return out
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+        }
+
+    @staticmethod
+    def _stat(stat: Any, diff: bool) -> Dict[str, Any]:
+        out = {
+            "size_bytes": stat.size,
+            "count": stat.count,
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        }
+        if diff:
+            out["size_diff_bytes"] = stat.size_diff
+            out["count_diff"] = stat.count_diff
+        return out
+
+    def snapshot(self, limit: int = 25, key_type: str = "lineno") -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        if key_type not in ("lineno", "filename", "traceback"):
+            raise ValueError("key must be lineno, filename or traceback")
+        snap = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        out = self.status()
+        out["top"] = [self._stat(s, False) for s in snap.statistics(key_type)[:limit]]
+        if self._previous is not None:
+            out["growth"] = [self._stat(s, True) for s in snap.compare_to(self._previous, key_type)[:limit]]
+        self._previous = snap
+        return out
+
+
+def _json(status: int, payload: Any) -> Response:
+    return status, "application/json", json.dumps(payload, default=str).encode()
+
+
+class ProfilingController:
+    def __init__(self, service: str, settings: ProfilingSettings, allocations: bool = False):
+        self.settings = settings
+        self.profiler = SamplingProfiler(service, settings.profile_dir, settings.profile_max_sec)
+        self.allocations = AllocationTracker(settings.tracemalloc_frames) if allocations else None
+        if settings.profiling_enabled and not settings.profiling_token:
+            logger.warning("Profiling is enabled without PROFILING_TOKEN; debug endpoints stay disabled")
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.profiling_enabled and bool(self.settings.profiling_token)
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return self.enabled and hmac.compare_digest(self.settings.profiling_token, token or "")
+
+    def handle(self, method: str, path: str, params: Mapping[str, str], token: Optional[str]) -> Response:
+        if not self.authorized(token):
+            return _json(403, {"detail": "profiling endpoints disabled"})
+        path = "/" + path.strip("/")
+        try:
+            if path == "/profile" and method == "GET":
+                return _json(200, self.profiler.status())
+            if path == "/profile" and method == "POST":
+                started = self.profiler.start(
+                    float(params.get("seconds", 10)),
+                    float(params.get("interval_ms", self.settings.profile_interval_ms)),
+                )
+                return _json(202, started)
+            if path == "/profile/latest" and method == "GET":
+                body = self.profiler.latest_collapsed()
+                if body is None:
+                    return _json(404, {"detail": "no profile recorded yet"})
+                return 200, "text/plain; charset=utf-8", body
+            if path.startswith("/tracemalloc") and self.allocations is not None:
+                if path == "/tracemalloc/start" and method == "POST":
+                    frames = params.get("frames")
+                    return _json(200, self.allocations.start(int(frames) if frames else None))
+                if path == "/tracemalloc/stop" and method == "POST":
+                    return _json(200, self.allocations.stop())
+                if path == "/tracemalloc/snapshot" and method == "GET":
+                    return _json(
+                        200,
+                        self.allocations.snapshot(int(params.get("limit", 25)), params.get("key", "lineno")),
+                    )
+        except ProfilerBusy as e:
+            return _json(409, {"detail": str(e)})
+        except (ValueError, RuntimeError) as e:
+            return _json(400, {"detail": str(e)})
+        return _json(404, {"detail": "not found"})
+
+
+def build_controller(service: str, allocations: bool = False) -> ProfilingController:
+    return ProfilingController(service, get_profiling_settings(), allocations=allocations)
+
+
+def start_profiling_server(controller: ProfilingController) -> Optional[ThreadingHTTPServer]:
+    settings = controller.settings
+    if not controller.enabled or settings.profiling_port <= 0:
+        return None
+
+    class Handler(BaseHTTPRequestHandler):
+        def _dispatch(self) -> None:
+            url = urlsplit(self.path)
+            if not url.path.startswith("/debug/"):
+                status, content_type, body = _json(404, {"detail": "not found"})
+            else:
+                status, content_type, body = controller.handle(
+                    self.command,
+                    url.path[len("/debug"):],
+                    dict(parse_qsl(url.query)),
+                    self.headers.get(TOKEN_HEADER),
+                )
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _dispatch
+        do_POST = _dispatch
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format, *args)
+
+    server = ThreadingHTTPServer((settings.profiling_bind_addr, settings.profiling_port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="profiling-server", daemon=True).start()
+    logger.info("Profiling endpoints on %s:%d/debug", settings.profiling_bind_addr, settings.profiling_port)
+    return server
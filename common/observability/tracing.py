@@ -0,0 +1,201 @@
+import atexit
+import json
+import logging
+import os
+import random
+import secrets
+import threading
+import urllib.request
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+
+logger = logging.getLogger(__name__)
+
+EXPORTER_NONE = "none"
+EXPORTER_FILE = "file"
+EXPORTER_OTLP = "otlp"
+EXPORTERS = (EXPORTER_NONE, EXPORTER_FILE, EXPORTER_OTLP)
+SCOPE_NAME = "praca_inz.tasks"
+
+
+class TracingSettings(BaseSettings):
+    trace_exporter: str = EXPORTER_NONE
+    trace_sample_ratio: float = 0.0
+    trace_dir: str = "/tmp/traces"
+    trace_file_max_mb: float = 64.0
+    trace_otlp_endpoint: str = "http://localhost:4318"
+    trace_flush_interval_sec: float = 1.0
+    trace_max_batch: int = 512
+
+
+@lru_cache
+def get_tracing_settings() -> TracingSettings:
+    return TracingSettings()
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def root_span_id(trace_id: str) -> str:
+    return trace_id[16:32]
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(parts[3], 16) & 1)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+def _attr(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanExporter:
+    def __init__(self, service: str, settings: TracingSettings):
+        self.service = service
+        self.settings = settings
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._path = os.path.join(settings.trace_dir, f"{service}-{os.getpid()}.jsonl")
+        if settings.trace_exporter == EXPORTER_FILE:
+            os.makedirs(settings.trace_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._flush_loop, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(span)
+            full = len(self._buffer) >= self.settings.trace_max_batch
+        if full:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(self.settings.trace_flush_interval_sec)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Span export failed")
+
+    def _payload(self, spans: List[Dict[str, Any]]) -> bytes:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_attr("service.name", self.service)]},
+                    "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}],
+                }
+            ]
+        }
+        return json.dumps(request, separators=(",", ":")).encode()
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if not spans:
+            return
+        payload = self._payload(spans)
+        if self.settings.trace_exporter == EXPORTER_OTLP:
+            req = urllib.request.Request(
+                self.settings.trace_otlp_endpoint.rstrip("/") + "/v1/traces",
+                data=payload,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            urllib.request.urlopen(req, timeout=5).close()
+        elif self.settings.trace_exporter == EXPORTER_FILE:
+            self._rotate(len(payload) + 1)
+            with open(self._path, "ab") as f:
+                f.write(payload + b"\n")
+
+    def _rotate(self, incoming: int) -> None:
+        limit = self.settings.trace_file_max_mb * 1024 * 1024
+        try:
+            size = os.path.getsize(self._path)
+        except OSError:
+            return
+        if limit > 0 and size + incoming > limit:
+            os.replace(self._path, self._path + ".1")
+
+
+class Tracer:
+    def __init__(self, service: str, exporter: Optional[SpanExporter], sample_ratio: float = 1.0):
+        self.service = service
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def sample(self) -> bool:
+        return self.enabled and (self.sample_ratio >= 1.0 or random.random() < self.sample_ratio)
+
+    def record(
+        self,
+        name: str,
+        trace_id: Optional[str],
+        start_ns: int,
+        end_ns: int,
+        parent_id: Optional[str] = None,
+        span_id: Optional[str] = None,
+        error: Optional[str] = None,
+        **attributes: Any,
+    ) -> None:
+        if self.exporter is None or not trace_id:
+            return
+        span: Dict[str, Any] = {
+            "traceId": trace_id,
+            "spanId": span_id or new_span_id(),
+            "name": name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(start_ns)),
+            "endTimeUnixNano": str(int(max(start_ns, end_ns))),
+            "attributes": [_attr(k, v) for k, v in attributes.items() if v is not None],
+            "status": {"code": 2, "message": error} if error else {"code": 1},
+        }
+        if parent_id:
+            span["parentSpanId"] = parent_id
+        self.exporter.export(span)
+
+
+_tracers: Dict[str, Tracer] = {}
+
+
+def get_tracer(service: str) -> Tracer:
+    tracer = _tracers.get(service)
+    if tracer is None:
+        settings = get_tracing_settings()
+        if settings.trace_exporter not in EXPORTERS:
+            raise ValueError(f"Unknown trace exporter: {settings.trace_exporter}")
+        exporter = None
+        if settings.trace_exporter != EXPORTER_NONE:
+            exporter = SpanExporter(service, settings)
+        tracer = _tracers[service] = Tracer(service, exporter, settings.trace_sample_ratio)
+    return tracer
@@ -0,0 +1,37 @@
+from typing import List, Optional
+
+from common.db.config import DatabaseSettings
+
+
+class WorkerSettings(DatabaseSettings):
+    db_pool_size: int = 1
+    db_max_overflow: int = 1
+
+    worker_task_types: str = "CPU_INTENSIVE"
+    poll_interval_sec: float = 1.0
+    metrics_port: int = 9100
+
+    cpu_capacity: int = 50
+    process_concurrency: int = 8
+    chunk_target_overhead_ratio: float = 0.05
+    max_chunk_size: int = 64
+    payload_transport: str = "shm"
+    payload_pool_max_mb: int = 256
+
+    memory_capacity: int = 32
+    executor_backend: str = "threads"
+    max_threads: int = 16
+    process_workers: int = 2
+    memory_budget_mb: Optional[int] = None
+    memory_budget_fraction: float = 0.6
+    oversized_task_policy: str = "fail"
+    arena_max_retained_mb: int = 192
+    arena_max_buffers_per_class: int = 4
+    mmap_backing: str = "heap"
+    mmap_threshold_mb: int = 64
+    mmap_window_mb: int = 64
+    mmap_scratch_dir: str = "/tmp"
+    mmap_hugepages: bool = True
+
+    def task_types(self) -> List[str]:
+        return [t.strip() for t in self.worker_task_types.split(",") if t.strip()]
@@ -0,0 +1,303 @@
+import json
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from prometheus_client.core import GaugeMetricFamily
+
+from common.models.task import Task, TaskStatus, TaskType
+from common.observability.metrics import TASK_RUN_SECONDS
+from common.observability.tracing import Tracer, get_tracer, root_span_id
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    id: str
+    task_type: str
+    complexity: int
+    kernel: Optional[str] = None
+    payload_size_kb: int = 0
+
+
+@dataclass
+class TaskOutcome:
+    task_id: str
+    ok: bool
+    error: Optional[str]
+    finished_at: datetime
+    started_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+def _unix_ns(ts: datetime) -> int:
+    return int(ts.replace(tzinfo=timezone.utc).timestamp() * 1_000_000_000)
+
+
+class WorkerPool(ABC):
+    task_type: str = ""
+
+    def __init__(self, capacity: int, outcomes: "queue.Queue[TaskOutcome]"):
+        self.capacity = max(1, int(capacity))
+        self.outcomes = outcomes
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def free_slots(self) -> int:
+        return max(0, self.capacity - self._in_flight)
+
+    def queue_depth(self) -> int:
+        return 0
+
+    def _started(self, n: int) -> None:
+        with self._lock:
+            self._in_flight += n
+
+    def _finished(self, outcome: TaskOutcome) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self.outcomes.put(outcome)
+
+    def start(self, specs: List[TaskSpec]) -> None:
+        self._started(len(specs))
+        try:
+            self.submit(specs)
+        except Exception as exc:
+            logger.exception("%s pool rejected %d tasks", self.task_type, len(specs))
+            now = datetime.utcnow()
+            for spec in specs:
+                self._finished(TaskOutcome(spec.id, False, f"Submit failed: {exc}", now))
+
+    @abstractmethod
+    def submit(self, specs: List[TaskSpec]) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        pass
+
+
+PoolFactory = Callable[[Any, "queue.Queue[TaskOutcome]"], WorkerPool]
+
+
+class WorkerRuntime:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        pools: List[WorkerPool],
+        outcomes: "queue.Queue[TaskOutcome]",
+        poll_interval_sec: float = 1.0,
+        tracer: Optional[Tracer] = None,
+    ):
+        self.session_factory = session_factory
+        self.pools = pools
+        self.outcomes = outcomes
+        self.poll_interval_sec = float(poll_interval_sec)
+        self.tracer = tracer or get_tracer("worker")
+        self._claims: Dict[str, Tuple[datetime, Optional[str]]] = {}
+        self._unwritten: List[TaskOutcome] = []
+
+    def fetch_dispatched(self, db: Session, task_type: str, limit: int) -> List[Task]:
+        return (
+            db.query(Task)
+            .filter(
+                Task.status == TaskStatus.DISPATCHED,
+                Task.task_type == TaskType(task_type),
+            )
+            .order_by(Task.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def _span(self, name: str, trace_id: str, start: int, end: int, **attributes: Any) -> None:
+        self.tracer.record(name, trace_id, start, end, parent_id=root_span_id(trace_id), **attributes)
+
+    def fill_pools(self, db: Session) -> int:
+        claimed: Dict[WorkerPool, List[TaskSpec]] = {}
+        traced: List[Tuple[str, str, str]] = []
+        claims: Dict[str, Tuple[datetime, Optional[str]]] = {}
+        start = time.time_ns()
+        now = datetime.utcnow()
+        for pool in self.pools:
+            slots = pool.free_slots()
+            if slots <= 0:
+                continue
+            tasks = self.fetch_dispatched(db, pool.task_type, slots)
+            if not tasks:
+                continue
+            specs = []
+            for task in tasks:
+                task.status = TaskStatus.RUNNING
+                task.started_at = now
+                claims[str(task.id)] = (task.created_at, task.trace_id)
+                if task.trace_id:
+                    traced.append((str(task.id), task.trace_id, pool.task_type))
+                specs.append(
+                    TaskSpec(
+                        id=str(task.id),
+                        task_type=pool.task_type,
+                        complexity=int(task.complexity),
+                        kernel=task.kernel,
+                        payload_size_kb=int(task.payload_size_kb or 0),
+                    )
+                )
+            claimed[pool] = specs
+        if not claimed:
+            return 0
+        db.commit()
+        end = time.time_ns()
+        self._claims.update(claims)
+        for task_id, trace_id, task_type in traced:
+            self._span("task.claim", trace_id, start, end, **{"task.id": task_id, "task.type": task_type})
+        for pool, specs in claimed.items():
+            pool.start(specs)
+        return sum(len(specs) for specs in claimed.values())
+
+    def collect(self, timeout: float) -> List[TaskOutcome]:
+        out: List[TaskOutcome] = []
+        try:
+            out.append(self.outcomes.get(timeout=timeout))
+        except queue.Empty:
+            return out
+        while True:
+            try:
+                out.append(self.outcomes.get_nowait())
+            except queue.Empty:
+                return out
+
+    def write_back(self, db: Session, outcomes: List[TaskOutcome]) -> None:
+        start = time.time_ns()
+        by_id = {o.task_id: o for o in outcomes}
+        claims = [self._claims.get(task_id) for task_id in by_id]
+        run_seconds: List[Tuple[str, str, float]] = []
+        query = db.query(Task).filter(Task.id.in_(list(by_id)))
+        if claims and all(c is not None for c in claims):
+            query = query.filter(Task.created_at >= min(c[0] for c in claims))
+        for task in query.all():
+            o = by_id[str(task.id)]
+            if o.started_at is not None:
+                task.started_at = o.started_at
+            task.finished_at = o.finished_at
+            task.result = json.dumps(o.result) if o.result is not None else None
+            if o.ok:
+                task.status = TaskStatus.COMPLETED
+                task.error_message = None
+            else:
+                task.status = TaskStatus.FAILED
+                task.error_message = o.error
+            if task.started_at is not None:
+                run_seconds.append(
+                    (task.task_type.value, task.status.value, (task.finished_at - task.started_at).total_seconds())
+                )
+        db.commit()
+        end = time.time_ns()
+        for task_id in by_id:
+            self._claims.pop(task_id, None)
+        for task_type, status, seconds in run_seconds:
+            TASK_RUN_SECONDS.labels(task_type, status).observe(max(0.0, seconds))
+        for o, claim in zip(by_id.values(), claims):
+            trace_id = claim[1] if claim is not None else None
+            if not trace_id:
+                continue
+            if o.started_at is not None:
+                self._span(
+                    "task.execute",
+                    trace_id,
+                    _unix_ns(o.started_at),
+                    _unix_ns(o.finished_at),
+                    error=o.error,
+                    **{"task.id": o.task_id},
+                )
+            self._span(
+                "task.write_back", trace_id, start, end, **{"task.id": o.task_id, "write_back.batch_size": len(outcomes)}
+            )
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            claimed = self.fill_pools(db)
+            busy = any(pool.in_flight for pool in self.pools)
+            timeout = 0.01 if claimed else self.poll_interval_sec
+            outcomes = self._unwritten + self.collect(timeout)
+            if not outcomes and not claimed and not busy:
+                return 0
+            if outcomes:
+                self._unwritten = outcomes
+                self.write_back(db, outcomes)
+                self._unwritten = []
+            return claimed + len(outcomes)
+        finally:
+            db.close()
+
+    def collect_metrics(self) -> Iterable[GaugeMetricFamily]:
+        families = (
+            ("worker_pool_capacity", "Configured task slots per pool.", lambda p: p.capacity),
+            ("worker_pool_in_flight", "Tasks claimed and not yet reported back.", lambda p: p.in_flight),
+            ("worker_executor_queue_depth", "Work items waiting inside the pool executor.", lambda p: p.queue_depth()),
+            ("worker_outcomes_pending", "Finished tasks waiting for DB write-back.", None),
+        )
+        pending = self.outcomes.qsize() + len(self._unwritten)
+        for name, doc, read in families:
+            family = GaugeMetricFamily(name, doc, labels=["task_type"])
+            for pool in self.pools:
+                family.add_metric([pool.task_type], float(read(pool) if read else pending))
+            yield family
+
+    def run_forever(self) -> None:
+        try:
+            while True:
+                try:
+                    self.run_once()
+                except Exception:
+                    logger.exception("Worker loop iteration failed; %d outcomes kept for retry", len(self._unwritten))
+                    time.sleep(self.poll_interval_sec)
+        finally:
+            for pool in self.pools:
+                pool.shutdown()
+
+
+_POOL_FACTORIES: Dict[str, PoolFactory] = {}
+
+
+def register_pool(task_type: str, factory: PoolFactory) -> None:
+    _POOL_FACTORIES[task_type] = factory
+
+
+def _load_builtin_pools() -> None:
+    from common.workloads.cpu.pool import build_cpu_pool
+    from common.workloads.memory.pool import build_memory_pool
+
+    _POOL_FACTORIES.setdefault("CPU_INTENSIVE", build_cpu_pool)
+    _POOL_FACTORIES.setdefault("MEMORY_INTENSIVE", build_memory_pool)
+
+
+def build_runtime(
+    settings: Any, session_factory: Callable[[], Session], tracer: Optional[Tracer] = None
+) -> WorkerRuntime:
+    _load_builtin_pools()
+    outcomes: "queue.Queue[TaskOutcome]" = queue.Queue()
+    pools: List[WorkerPool] = []
+    for task_type in settings.task_types():
+        factory = _POOL_FACTORIES.get(task_type)
+        if factory is None:
+            raise ValueError(f"No worker pool registered for task type: {task_type}")
+        pools.append(factory(settings, outcomes))
+    return WorkerRuntime(
+        session_factory=session_factory,
+        pools=pools,
+        outcomes=outcomes,
+        poll_interval_sec=settings.poll_interval_sec,
+        tracer=tracer,
+    )
@@ -0,0 +1,58 @@
+import math
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class ChunkPlanner:
+    def __init__(
+        self,
+        target_overhead_ratio: float = 0.05,
+        max_chunk_size: int = 64,
+        initial_overhead_sec: float = 0.002,
+        smoothing: float = 0.2,
+    ):
+        self.target_overhead_ratio = max(1e-6, float(target_overhead_ratio))
+        self.max_chunk_size = max(1, int(max_chunk_size))
+        self.smoothing = min(1.0, max(0.0, float(smoothing)))
+        self.overhead_sec = float(initial_overhead_sec)
+        self.sec_per_unit: Dict[str, float] = {}
+
+    def _blend(self, old: Optional[float], new: float) -> float:
+        if old is None:
+            return new
+        return (1.0 - self.smoothing) * old + self.smoothing * new
+
+    def estimate_task_sec(self, kernel: str, complexity: int) -> Optional[float]:
+        per_unit = self.sec_per_unit.get(kernel)
+        if per_unit is None:
+            return None
+        return per_unit * max(1, int(complexity))
+
+    def chunk_size(self, kernel: str, complexity: int, n_tasks: int, workers: int) -> int:
+        if n_tasks <= 1:
+            return 1
+        task_sec = self.estimate_task_sec(kernel, complexity)
+        if task_sec is None:
+            return 1
+        wanted = math.ceil(self.overhead_sec / (self.target_overhead_ratio * max(task_sec, 1e-9)))
+        fair_share = math.ceil(n_tasks / max(1, int(workers)))
+        return max(1, min(wanted, self.max_chunk_size, fair_share))
+
+    def observe_compute(self, kernel: str, compute_sec: float, total_complexity: int) -> None:
+        if total_complexity <= 0 or compute_sec <= 0:
+            return
+        sample = compute_sec / total_complexity
+        self.sec_per_unit[kernel] = self._blend(self.sec_per_unit.get(kernel), sample)
+
+    def observe_batch(self, elapsed_sec: float, compute_sec: float, submissions: int, workers: int) -> None:
+        if submissions <= 0:
+            return
+        busy_workers = max(1, min(int(workers), submissions))
+        lost_sec = max(0.0, elapsed_sec * busy_workers - compute_sec)
+        self.overhead_sec = self._blend(self.overhead_sec, lost_sec / submissions)
+
+
+def split_chunks(items: Sequence[T], size: int) -> List[List[T]]:
+    size = max(1, int(size))
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
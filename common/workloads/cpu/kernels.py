@@ -0,0 +1,140 @@
+import cmath
+from typing import Callable, Dict
+
+import numpy as np
+
+DEFAULT_KERNEL = "legacy"
+
+MATMUL_SIZE = 64
+FFT_SIZE = 1 << 11
+SORT_SIZE = 1 << 15
+HASH_SIZE = 1 << 13
+
+KERNEL_REPEATS: Dict[str, int] = {"legacy": 1, "matmul": 1, "fft": 2, "sort": 2, "hash": 3}
+
+_U64_MASK = (1 << 64) - 1
+_SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+_SPLITMIX_M1 = 0xBF58476D1CE4E5B9
+_SPLITMIX_M2 = 0x94D049BB133111EB
+
+
+def _rounds(complexity: int, kernel: str) -> int:
+    return max(1, int(complexity)) * KERNEL_REPEATS[kernel]
+
+
+def _rng(complexity: int) -> np.random.Generator:
+    return np.random.default_rng(max(1, int(complexity)))
+
+
+def legacy_python(complexity: int) -> None:
+    iterations = _rounds(complexity, "legacy") * 100000
+    x = 0.001
+    for i in range(iterations):
+        x = (x * i + 1.2345) % 123456.789
+
+
+def legacy_numpy(complexity: int) -> None:
+    i = np.arange(100000, dtype=np.float64)
+    x = np.full_like(i, 0.001)
+    for _ in range(_rounds(complexity, "legacy")):
+        x = np.fmod(x * i + 1.2345, 123456.789)
+
+
+def matmul_python(complexity: int) -> None:
+    n = MATMUL_SIZE
+    rng = _rng(complexity)
+    a = rng.random((n, n)).tolist()
+    b = rng.random((n, n)).tolist()
+    bt = list(zip(*b))
+    for _ in range(_rounds(complexity, "matmul")):
+        a = [[sum(x * y for x, y in zip(row, col)) / n for col in bt] for row in a]
+
+
+def matmul_numpy(complexity: int) -> None:
+    rng = _rng(complexity)
+    a = rng.random((MATMUL_SIZE, MATMUL_SIZE))
+    b = rng.random((MATMUL_SIZE, MATMUL_SIZE))
+    for _ in range(_rounds(complexity, "matmul")):
+        a = (a @ b) / MATMUL_SIZE
+
+
+def _fft_python(values: list) -> list:
+    n = len(values)
+    if n == 1:
+        return values
+    even = _fft_python(values[0::2])
+    odd = _fft_python(values[1::2])
+    out = [0j] * n
+    for k in range(n // 2):
+        t = cmath.exp(-2j * cmath.pi * k / n) * odd[k]
+        out[k] = even[k] + t
+        out[k + n // 2] = even[k] - t
+    return out
+
+
+def fft_python(complexity: int) -> None:
+    signal = _rng(complexity).random(FFT_SIZE).tolist()
+    for _ in range(_rounds(complexity, "fft")):
+        _fft_python(signal)
+
+
+def fft_numpy(complexity: int) -> None:
+    signal = _rng(complexity).random(FFT_SIZE)
+    for _ in range(_rounds(complexity, "fft")):
+        np.fft.fft(signal)
+
+
+def sort_python(complexity: int) -> None:
+    values = _rng(complexity).random(SORT_SIZE).tolist()
+    for _ in range(_rounds(complexity, "sort")):
+        sorted(values)
+
+
+def sort_numpy(complexity: int) -> None:
+    values = _rng(complexity).random(SORT_SIZE)
+    for _ in range(_rounds(complexity, "sort")):
+        np.sort(values, kind="quicksort")
+
+
+def _splitmix_python(x: int) -> int:
+    x = (x + _SPLITMIX_GAMMA) & _U64_MASK
+    x = ((x ^ (x >> 30)) * _SPLITMIX_M1) & _U64_MASK
+    x = ((x ^ (x >> 27)) * _SPLITMIX_M2) & _U64_MASK
+    return x ^ (x >> 31)
+
+
+def hash_python(complexity: int) -> None:
+    x = _rng(complexity).integers(0, _U64_MASK, size=HASH_SIZE, dtype=np.uint64, endpoint=True).tolist()
+    for _ in range(_rounds(complexity, "hash")):
+        x = [_splitmix_python(v) for v in x]
+
+
+def hash_numpy(complexity: int) -> None:
+    x = _rng(complexity).integers(0, _U64_MASK, size=HASH_SIZE, dtype=np.uint64, endpoint=True)
+    with np.errstate(over="ignore"):
+        for _ in range(_rounds(complexity, "hash")):
+            x = x + np.uint64(_SPLITMIX_GAMMA)
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(_SPLITMIX_M1)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(_SPLITMIX_M2)
+            x = x ^ (x >> np.uint64(31))
+
+
+CPU_KERNELS: Dict[str, Callable[[int], None]] = {
+    "legacy": legacy_python,
+    "legacy_numpy": legacy_numpy,
+    "matmul": matmul_numpy,
+    "matmul_python": matmul_python,
+    "fft": fft_numpy,
+    "fft_python": fft_python,
+    "sort": sort_numpy,
+    "sort_python": sort_python,
+    "hash": hash_numpy,
+    "hash_python": hash_python,
+}
+
+
+def get_cpu_kernel(name: str) -> Callable[[int], None]:
+    kernel = CPU_KERNELS.get(name or DEFAULT_KERNEL)
+    if kernel is None:
+        raise ValueError(f"Unknown CPU kernel: {name}")
+    return kernel
@@ -0,0 +1,125 @@
+import atexit
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+TRANSPORT_SHM = "shm"
+TRANSPORT_PICKLE = "pickle"
+
+MIN_SLOT_BYTES = 64 * 1024
+
+PayloadRef = Tuple[str, int]
+PayloadArg = Union[None, bytes, PayloadRef]
+
+
+def _size_class(size_bytes: int) -> int:
+    size = max(MIN_SLOT_BYTES, int(size_bytes))
+    return 1 << (size - 1).bit_length()
+
+
+def payload_seed(task_id: str) -> int:
+    return zlib.crc32(task_id.encode("utf-8"))
+
+
+def fill_payload(buf: memoryview, task_id: str) -> None:
+    out = np.frombuffer(buf, dtype=np.uint8)
+    out[:] = np.random.default_rng(payload_seed(task_id)).integers(0, 256, size=out.size, dtype=np.uint8)
+    del out
+
+
+def make_pickled_payload(task_id: str, size_bytes: int) -> bytes:
+    buf = bytearray(size_bytes)
+    fill_payload(memoryview(buf), task_id)
+    return bytes(buf)
+
+
+class SharedPayloadPool:
+    def __init__(self, max_retained_bytes: int = 256 * 1024 * 1024):
+        self.max_retained_bytes = max(0, int(max_retained_bytes))
+        self._free: Dict[int, List[SharedMemory]] = defaultdict(list)
+        self._in_use: Dict[str, SharedMemory] = {}
+        self.retained_bytes = 0
+        self.created = 0
+        self.reused = 0
+        atexit.register(self.close)
+
+    def acquire(self, task_id: str, size_bytes: int) -> PayloadRef:
+        cls = _size_class(size_bytes)
+        free = self._free[cls]
+        if free:
+            shm = free.pop()
+            self.retained_bytes -= cls
+            self.reused += 1
+        else:
+            shm = SharedMemory(create=True, size=cls)
+            self.created += 1
+        view = shm.buf[:size_bytes]
+        try:
+            fill_payload(view, task_id)
+        finally:
+            view.release()
+        self._in_use[shm.name] = shm
+        return shm.name, int(size_bytes)
+
+    def release(self, ref: PayloadRef) -> None:
+        shm = self._in_use.pop(ref[0], None)
+        if shm is None:
+            return
+        cls = _size_class(shm.size)
+        if self.retained_bytes + cls <= self.max_retained_bytes:
+            self._free[cls].append(shm)
+            self.retained_bytes += cls
+            return
+        shm.close()
+        shm.unlink()
+
+    def close(self) -> None:
+        for shm in list(self._in_use.values()) + [s for slots in self._free.values() for s in slots]:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._in_use.clear()
+        self._free.clear()
+        self.retained_bytes = 0
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+@contextmanager
+def open_payload(arg: PayloadArg) -> Iterator[Optional[memoryview]]:
+    if arg is None:
+        yield None
+        return
+    if isinstance(arg, (bytes, bytearray)):
+        view = memoryview(arg)
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+    name, size = arg
+    shm = _attach(name)
+    view = shm.buf[:size]
+    try:
+        yield view
+    finally:
+        view.release()
+        shm.close()
+
+
+def consume_payload(view: memoryview) -> int:
+    data = np.frombuffer(view, dtype=np.uint8)
+    checksum = int(data.sum(dtype=np.uint64))
+    del data
+    return checksum
@@ -0,0 +1,177 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.worker.runtime import TaskOutcome, TaskSpec, WorkerPool
+from common.workloads.cpu.chunking import ChunkPlanner, split_chunks
+from common.workloads.cpu.kernels import DEFAULT_KERNEL
+from common.workloads.cpu.payloads import (
+    TRANSPORT_PICKLE,
+    TRANSPORT_SHM,
+    PayloadArg,
+    SharedPayloadPool,
+    make_pickled_payload,
+)
+from common.workloads.cpu.tasks import run_cpu_chunk
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self, submissions: int):
+        self.submissions = submissions
+        self.remaining = submissions
+        self.compute_sec = 0.0
+        self.started = time.perf_counter()
+
+
+class CpuPool(WorkerPool):
+    task_type = "CPU_INTENSIVE"
+
+    def __init__(
+        self,
+        capacity: int,
+        outcomes: "queue.Queue[TaskOutcome]",
+        process_concurrency: int,
+        planner: Optional[ChunkPlanner] = None,
+        payload_transport: str = TRANSPORT_SHM,
+        payload_pool: Optional[SharedPayloadPool] = None,
+    ):
+        super().__init__(capacity, outcomes)
+        self.process_concurrency = max(1, int(process_concurrency))
+        self.planner = planner or ChunkPlanner()
+        self.payload_transport = payload_transport
+        self.payload_pool = None
+        if payload_transport == TRANSPORT_SHM:
+            self.payload_pool = payload_pool or SharedPayloadPool()
+        self._state_lock = threading.Lock()
+        self._chunks_outstanding = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.process_concurrency,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+
+    def _submit_chunk(self, complexity: int, kernel: str, payloads: List[PayloadArg]) -> Future:
+        args = ([complexity] * len(payloads), [kernel] * len(payloads), payloads)
+        try:
+            return self._executor.submit(run_cpu_chunk, *args)
+        except BrokenExecutor:
+            logger.warning("CPU process pool is broken; starting a new one")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            return self._executor.submit(run_cpu_chunk, *args)
+
+    def _make_payload(self, spec: TaskSpec) -> PayloadArg:
+        size_bytes = spec.payload_size_kb * 1024
+        if size_bytes <= 0:
+            return None
+        if self.payload_transport == TRANSPORT_PICKLE:
+            return make_pickled_payload(spec.id, size_bytes)
+        with self._state_lock:
+            return self.payload_pool.acquire(spec.id, size_bytes)
+
+    def _release_payloads(self, payloads: List[PayloadArg]) -> None:
+        if self.payload_pool is None:
+            return
+        with self._state_lock:
+            for ref in payloads:
+                if isinstance(ref, tuple):
+                    self.payload_pool.release(ref)
+
+    def submit(self, specs: List[TaskSpec]) -> None:
+        groups: Dict[Tuple[str, int], List[TaskSpec]] = defaultdict(list)
+        for spec in specs:
+            groups[(spec.kernel or DEFAULT_KERNEL, spec.complexity)].append(spec)
+
+        chunks: List[Tuple[str, int, List[TaskSpec]]] = []
+        with self._state_lock:
+            for (kernel, complexity), group in groups.items():
+                size = self.planner.chunk_size(kernel, complexity, len(group), self.process_concurrency)
+                for chunk in split_chunks(group, size):
+                    chunks.append((kernel, complexity, chunk))
+
+        batch = _Batch(len(chunks))
+        with self._state_lock:
+            self._chunks_outstanding += len(chunks)
+        for kernel, complexity, chunk in chunks:
+            payloads: List[PayloadArg] = []
+            try:
+                for spec in chunk:
+                    payloads.append(self._make_payload(spec))
+                fut = self._submit_chunk(complexity, kernel, payloads)
+            except Exception as exc:
+                fut = Future()
+                fut.set_exception(exc)
+            fut.add_done_callback(partial(self._on_chunk_done, batch, kernel, complexity, chunk, payloads))
+
+    def _on_chunk_done(
+        self,
+        batch: _Batch,
+        kernel: str,
+        complexity: int,
+        chunk: List[TaskSpec],
+        payloads: List[PayloadArg],
+        fut: Future,
+    ) -> None:
+        self._release_payloads(payloads)
+        try:
+            compute_sec, finished, errors, started = fut.result()
+        except Exception as exc:
+            compute_sec, finished, errors, started = 0.0, None, {i: str(exc) for i in range(len(chunk))}, None
+
+        with self._state_lock:
+            if compute_sec > 0:
+                self.planner.observe_compute(kernel, compute_sec, complexity * len(chunk))
+            batch.compute_sec += compute_sec
+            batch.remaining -= 1
+            self._chunks_outstanding -= 1
+            if batch.remaining == 0:
+                elapsed = time.perf_counter() - batch.started
+                self.planner.observe_batch(elapsed, batch.compute_sec, batch.submissions, self.process_concurrency)
+
+        now = datetime.utcnow()
+        for i, spec in enumerate(chunk):
+            err = errors.get(i)
+            started_at = None
+            if finished is not None:
+                finished_at = datetime.utcfromtimestamp(finished[i])
+                started_at = datetime.utcfromtimestamp(finished[i - 1] if i else started)
+            else:
+                finished_at = now
+            self._finished(TaskOutcome(spec.id, err is None, err, finished_at, started_at=started_at))
+
+    def queue_depth(self) -> int:
+        return max(0, self._chunks_outstanding - self.process_concurrency)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self.payload_pool is not None:
+            self.payload_pool.close()
+
+
+def build_cpu_pool(settings: Any, outcomes: "queue.Queue[TaskOutcome]") -> CpuPool:
+    planner = ChunkPlanner(
+        target_overhead_ratio=settings.chunk_target_overhead_ratio,
+        max_chunk_size=settings.max_chunk_size,
+    )
+    payload_pool = None
+    if settings.payload_transport == TRANSPORT_SHM:
+        payload_pool = SharedPayloadPool(max_retained_bytes=settings.payload_pool_max_mb * 1024 * 1024)
+    return CpuPool(
+        capacity=settings.cpu_capacity,
+        outcomes=outcomes,
+        process_concurrency=settings.process_concurrency,
+        planner=planner,
+        payload_transport=settings.payload_transport,
+        payload_pool=payload_pool,
+    )
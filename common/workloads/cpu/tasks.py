@@ -0,0 +1,34 @@
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from common.workloads.cpu.kernels import DEFAULT_KERNEL, get_cpu_kernel
+from common.workloads.cpu.payloads import PayloadArg, consume_payload, open_payload
+
+ChunkResult = Tuple[float, array, Dict[int, str], float]
+
+
+def simulate_cpu_load(complexity: int, kernel: str = DEFAULT_KERNEL) -> None:
+    get_cpu_kernel(kernel)(complexity)
+
+
+def run_cpu_chunk(
+    complexities: List[int],
+    kernels: List[str],
+    payloads: Optional[List[PayloadArg]] = None,
+) -> ChunkResult:
+    finished = array("d")
+    errors: Dict[int, str] = {}
+    payloads = payloads or [None] * len(complexities)
+    started = time.time()
+    t0 = time.perf_counter()
+    for i, (complexity, kernel, payload) in enumerate(zip(complexities, kernels, payloads)):
+        try:
+            with open_payload(payload) as view:
+                if view is not None:
+                    consume_payload(view)
+            simulate_cpu_load(complexity, kernel)
+        except Exception as exc:
+            errors[i] = str(exc)
+        finished.append(time.time())
+    return time.perf_counter() - t0, finished, errors, started
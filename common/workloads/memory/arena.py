@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from common.workloads.memory.budget import MB, MemoryBudget
+
+
+def size_class(size_bytes: int) -> int:
+    return max(1, -(-int(size_bytes) // MB)) * MB
+
+
+class BufferArena:
+    def __init__(
+        self,
+        max_retained_bytes: int,
+        max_buffers_per_class: int = 4,
+        budget: Optional[MemoryBudget] = None,
+    ):
+        self.max_retained_bytes = max(0, int(max_retained_bytes))
+        self.max_buffers_per_class = max(1, int(max_buffers_per_class))
+        self.budget = budget
+        self._free: "OrderedDict[int, List[bytearray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _pop_locked(self, cls: int) -> Optional[bytearray]:
+        free = self._free.get(cls)
+        if not free:
+            return None
+        buf = free.pop()
+        if not free:
+            del self._free[cls]
+        self.resident_bytes -= cls
+        self.hits += 1
+        return buf
+
+    def take(self, size_bytes: int) -> Optional[bytearray]:
+        with self._lock:
+            return self._pop_locked(size_class(size_bytes))
+
+    def acquire(self, size_bytes: int) -> bytearray:
+        cls = size_class(size_bytes)
+        with self._lock:
+            buf = self._pop_locked(cls)
+            if buf is not None:
+                if self.budget is not None:
+                    self.budget.release(cls)
+                return buf
+            self.misses += 1
+        return bytearray(cls)
+
+    def release(self, buf: bytearray) -> None:
+        cls = len(buf)
+        if cls > self.max_retained_bytes:
+            return
+        with self._lock:
+            if len(self._free.get(cls, ())) >= self.max_buffers_per_class:
+                return
+            overflow = self.resident_bytes + cls - self.max_retained_bytes
+            if overflow > 0 and self._evict_locked(overflow, keep_class=cls) < overflow:
+                return
+            self._free.setdefault(cls, []).append(buf)
+            self._free.move_to_end(cls)
+            self.resident_bytes += cls
+            if self.budget is not None:
+                self.budget.charge(cls)
+
+    def evict(self, nbytes: int) -> int:
+        with self._lock:
+            return self._evict_locked(nbytes)
+
+    def _evict_locked(self, nbytes: int, keep_class: Optional[int] = None) -> int:
+        freed = 0
+        for cls in list(self._free.keys()):
+            if freed >= nbytes:
+                break
+            if cls == keep_class:
+                continue
+            free = self._free[cls]
+            while free and freed < nbytes:
+                free.pop()
+                freed += cls
+                self.resident_bytes -= cls
+                self.evictions += 1
+            if not free:
+                del self._free[cls]
+        if freed and self.budget is not None:
+            self.budget.release(freed)
+        return freed
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "resident_bytes": self.resident_bytes,
+                "buffers": sum(len(v) for v in self._free.values()),
+            }
@@ -0,0 +1,79 @@
+import threading
+from pathlib import Path
+from typing import Optional
+
+MB = 1024 * 1024
+
+_CGROUP_LIMIT_FILES = (
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+)
+_UNLIMITED_THRESHOLD = 1 << 60
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        raw = Path(path).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    if not raw or raw == "max":
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def detect_memory_limit_bytes() -> Optional[int]:
+    for path in _CGROUP_LIMIT_FILES:
+        limit = _read_int(path)
+        if limit is not None and limit < _UNLIMITED_THRESHOLD:
+            return limit
+    try:
+        for line in Path("/proc/meminfo").read_text(encoding="utf-8").splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def resolve_budget_bytes(budget_mb: Optional[int], fraction: float, fallback_mb: int = 256) -> int:
+    if budget_mb is not None and budget_mb > 0:
+        return int(budget_mb) * MB
+    limit = detect_memory_limit_bytes()
+    if limit is None:
+        return int(fallback_mb) * MB
+    return max(MB, int(limit * fraction))
+
+
+class MemoryBudget:
+    def __init__(self, total_bytes: int):
+        self.total_bytes = max(1, int(total_bytes))
+        self.in_use_bytes = 0
+        self._cond = threading.Condition()
+
+    @property
+    def available_bytes(self) -> int:
+        return self.total_bytes - self.in_use_bytes
+
+    def fits(self, nbytes: int) -> bool:
+        return nbytes <= self.total_bytes
+
+    def acquire(self, nbytes: int, timeout: Optional[float] = None) -> bool:
+        if not self.fits(nbytes):
+            raise ValueError(f"Requested {nbytes} bytes exceeds memory budget of {self.total_bytes} bytes")
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self.in_use_bytes + nbytes <= self.total_bytes, timeout=timeout)
+            if ok:
+                self.in_use_bytes += nbytes
+            return ok
+
+    def charge(self, nbytes: int) -> None:
+        with self._cond:
+            self.in_use_bytes += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.in_use_bytes = max(0, self.in_use_bytes - nbytes)
+            self._cond.notify_all()
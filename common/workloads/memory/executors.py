@@ -0,0 +1,42 @@
+import logging
+import multiprocessing
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+BACKEND_THREADS = "threads"
+BACKEND_PROCESSES = "processes"
+
+
+class TaskExecutor:
+    def __init__(self, backend: str, workers: int):
+        self.backend = backend
+        self.workers = max(1, int(workers))
+        self._executor = self._create()
+
+    def _create(self) -> Executor:
+        if self.backend == BACKEND_THREADS:
+            return ThreadPoolExecutor(max_workers=self.workers)
+        if self.backend == BACKEND_PROCESSES:
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        raise ValueError(f"Unknown executor backend: {self.backend}")
+
+    @property
+    def shares_memory(self) -> bool:
+        return self.backend == BACKEND_THREADS
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenExecutor:
+            logger.warning("Executor backend %s is broken; starting a new one", self.backend)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create()
+            return self._executor.submit(fn, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,83 @@
+import time
+import traceback
+from typing import Callable, Dict
+
+import numpy as np
+
+PAGE_SIZE = 4096
+CACHE_LINE = 64
+STRIDE_PAGES = 16
+
+DEFAULT_PATTERN = "sequential"
+
+
+def legacy_touch(block: np.ndarray) -> int:
+    view = memoryview(block)
+    for i in range(0, len(block), PAGE_SIZE):
+        view[i] = (view[i] + 1) % 256
+    return 2 * CACHE_LINE * (-(-len(block) // PAGE_SIZE))
+
+
+def sequential_touch(block: np.ndarray) -> int:
+    pages = block[::PAGE_SIZE]
+    np.add(pages, 1, out=pages)
+    return 2 * CACHE_LINE * pages.size
+
+
+def strided_touch(block: np.ndarray) -> int:
+    stride = PAGE_SIZE * STRIDE_PAGES
+    touched = 0
+    for offset in range(0, min(stride, len(block)), PAGE_SIZE):
+        pages = block[offset::stride]
+        np.add(pages, 1, out=pages)
+        touched += pages.size
+    return 2 * CACHE_LINE * touched
+
+
+def random_touch(block: np.ndarray) -> int:
+    n_pages = -(-len(block) // PAGE_SIZE)
+    order = np.random.default_rng(n_pages).permutation(n_pages) * PAGE_SIZE
+    block[order] += 1
+    return 2 * CACHE_LINE * n_pages
+
+
+def read_modify_write(block: np.ndarray) -> int:
+    np.add(block, 1, out=block)
+    return 2 * block.nbytes
+
+
+MEMORY_PATTERNS: Dict[str, Callable[[np.ndarray], int]] = {
+    "legacy": legacy_touch,
+    "sequential": sequential_touch,
+    "strided": strided_touch,
+    "random": random_touch,
+    "rmw": read_modify_write,
+}
+
+
+def get_memory_pattern(name: str) -> Callable[[np.ndarray], int]:
+    pattern = MEMORY_PATTERNS.get(name or DEFAULT_PATTERN)
+    if pattern is None:
+        raise ValueError(f"Unknown memory access pattern: {name}")
+    return pattern
+
+
+def run_pattern(buf, size_bytes: int, pattern: str, offset: int = 0) -> Dict[str, float]:
+    fn = get_memory_pattern(pattern)
+    block = np.frombuffer(buf, dtype=np.uint8, count=size_bytes, offset=offset)
+    t0 = time.perf_counter()
+    try:
+        moved = fn(block)
+    except BaseException as exc:
+        traceback.clear_frames(exc.__traceback__)
+        raise
+    finally:
+        del block
+    elapsed = time.perf_counter() - t0
+    return {
+        "pattern": pattern or DEFAULT_PATTERN,
+        "bytes": size_bytes,
+        "moved_bytes": moved,
+        "elapsed_sec": elapsed,
+        "bandwidth_mb_s": (moved / elapsed / (1024 * 1024)) if elapsed > 0 else None,
+    }
@@ -0,0 +1,128 @@
+import mmap
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+
+from common.workloads.memory.budget import MB
+from common.workloads.memory.kernels import DEFAULT_PATTERN, run_pattern
+
+BACKING_HEAP = "heap"
+BACKING_ANON = "mmap_anon"
+BACKING_FILE = "mmap_file"
+IN_MEMORY_FILESYSTEMS = ("tmpfs", "ramfs", "hugetlbfs")
+
+
+@lru_cache(maxsize=None)
+def in_memory_dir(path: str) -> bool:
+    path = os.path.realpath(path)
+    best, fstype = "", ""
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                fields = line.split()
+                mount = fields[1].replace("\\040", " ")
+                if (path == mount or path.startswith(mount.rstrip("/") + "/")) and len(mount) >= len(best):
+                    best, fstype = mount, fields[2]
+    except OSError:
+        return False
+    return fstype in IN_MEMORY_FILESYSTEMS
+
+
+@dataclass(frozen=True)
+class MmapConfig:
+    backing: str = BACKING_HEAP
+    threshold_bytes: int = 64 * MB
+    window_bytes: int = 64 * MB
+    scratch_dir: str = "/tmp"
+    hugepages: bool = True
+
+    def applies(self, size_bytes: int) -> bool:
+        return self.backing != BACKING_HEAP and size_bytes >= self.threshold_bytes
+
+    def resident_bytes(self, size_bytes: int) -> int:
+        if self.backing == BACKING_FILE and self.applies(size_bytes) and not in_memory_dir(self.scratch_dir):
+            return min(size_bytes, self.window_bytes)
+        return size_bytes
+
+
+def _madvise(mm: mmap.mmap, advice_name: str, start: int = 0, length: int = 0) -> None:
+    advice = getattr(mmap, advice_name, None)
+    if advice is None:
+        return
+    try:
+        mm.madvise(advice, start, length)
+    except OSError:
+        pass
+
+
+@contextmanager
+def anon_mapping(size_bytes: int, hugepages: bool = True) -> Iterator[mmap.mmap]:
+    mm = mmap.mmap(-1, size_bytes, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    if hugepages:
+        _madvise(mm, "MADV_HUGEPAGE")
+    try:
+        yield mm
+    finally:
+        _madvise(mm, "MADV_DONTNEED")
+        mm.close()
+
+
+@contextmanager
+def file_mapping(size_bytes: int, scratch_dir: str) -> Iterator[Tuple[mmap.mmap, int]]:
+    os.makedirs(scratch_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="memtask-", dir=scratch_dir)
+    try:
+        os.unlink(path)
+        os.ftruncate(fd, size_bytes)
+        mm = mmap.mmap(fd, size_bytes, flags=mmap.MAP_SHARED)
+    except BaseException:
+        os.close(fd)
+        raise
+    _madvise(mm, "MADV_SEQUENTIAL")
+    try:
+        yield mm, fd
+    finally:
+        _madvise(mm, "MADV_DONTNEED")
+        mm.close()
+        os.close(fd)
+
+
+def _evict_window(mm: mmap.mmap, fd: int, offset: int, length: int) -> None:
+    mm.flush(offset, length)
+    _madvise(mm, "MADV_DONTNEED", offset, length)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+
+
+def _run_windowed(
+    mm: mmap.mmap, size_bytes: int, window_bytes: int, pattern: str, backing: str, fd: Optional[int] = None
+) -> Dict[str, float]:
+    window_bytes = max(MB, window_bytes - window_bytes % mmap.PAGESIZE)
+    moved = 0
+    t0 = time.perf_counter()
+    for offset in range(0, size_bytes, window_bytes):
+        length = min(window_bytes, size_bytes - offset)
+        moved += run_pattern(mm, length, pattern, offset=offset)["moved_bytes"]
+        if fd is not None:
+            _evict_window(mm, fd, offset, length)
+    elapsed = time.perf_counter() - t0
+    return {
+        "pattern": pattern or DEFAULT_PATTERN,
+        "backing": backing,
+        "bytes": size_bytes,
+        "moved_bytes": moved,
+        "elapsed_sec": elapsed,
+        "bandwidth_mb_s": (moved / elapsed / MB) if elapsed > 0 else None,
+    }
+
+
+def run_mapped(size_bytes: int, pattern: str, config: MmapConfig) -> Dict[str, float]:
+    if config.backing == BACKING_FILE:
+        with file_mapping(size_bytes, config.scratch_dir) as (mm, fd):
+            return _run_windowed(mm, size_bytes, config.window_bytes, pattern, BACKING_FILE, fd)
+    with anon_mapping(size_bytes, config.hugepages) as mm:
+        return _run_windowed(mm, size_bytes, size_bytes, pattern, BACKING_ANON)
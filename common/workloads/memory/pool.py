@@ -0,0 +1,151 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+from functools import partial
+from typing import Any, Deque, List, Optional
+
+from common.worker.runtime import TaskOutcome, TaskSpec, WorkerPool
+from common.workloads.memory.arena import BufferArena
+from common.workloads.memory.budget import MB, MemoryBudget, resolve_budget_bytes
+from common.workloads.memory.executors import BACKEND_THREADS, TaskExecutor
+from common.workloads.memory.kernels import DEFAULT_PATTERN
+from common.workloads.memory.mmap_backing import MmapConfig
+from common.workloads.memory.tasks import declared_task_bytes, run_mem_task
+
+OVERSIZED_FAIL = "fail"
+OVERSIZED_EXCLUSIVE = "exclusive"
+
+
+class MemoryPool(WorkerPool):
+    task_type = "MEMORY_INTENSIVE"
+
+    def __init__(
+        self,
+        capacity: int,
+        outcomes: "queue.Queue[TaskOutcome]",
+        budget: MemoryBudget,
+        executor: TaskExecutor,
+        oversized_policy: str = OVERSIZED_FAIL,
+        arena: Optional[BufferArena] = None,
+        mmap_config: Optional[MmapConfig] = None,
+    ):
+        super().__init__(capacity, outcomes)
+        self.budget = budget
+        self.executor = executor
+        self.oversized_policy = oversized_policy
+        self.arena = arena if executor.shares_memory else None
+        self.mmap_config = mmap_config
+        self._pending: Deque[TaskSpec] = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._admitter = threading.Thread(target=self._admission_loop, name="memory-admission", daemon=True)
+        self._admitter.start()
+
+    def submit(self, specs: List[TaskSpec]) -> None:
+        with self._cond:
+            self._pending.extend(specs)
+            self._cond.notify()
+
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def _need_bytes(self, size_bytes: int) -> int:
+        if self.mmap_config is not None:
+            return self.mmap_config.resident_bytes(size_bytes)
+        return size_bytes
+
+    def _admit(self, need: int) -> None:
+        while not self.budget.acquire(need, timeout=0.05):
+            if self.arena is not None:
+                self.arena.evict(need - self.budget.available_bytes)
+
+    def _admission_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped:
+                    return
+                spec = self._pending.popleft()
+            self._start_task(spec)
+
+    def _start_task(self, spec: TaskSpec) -> None:
+        size_bytes = declared_task_bytes(spec.complexity)
+        need = self._need_bytes(size_bytes)
+        if not self.budget.fits(need):
+            if self.oversized_policy != OVERSIZED_EXCLUSIVE:
+                err = (
+                    f"Task needs {need // MB} MB which exceeds the memory budget "
+                    f"of {self.budget.total_bytes // MB} MB"
+                )
+                self._finished(TaskOutcome(spec.id, False, err, datetime.utcnow()))
+                return
+            need = self.budget.total_bytes
+
+        mapped = self.mmap_config is not None and self.mmap_config.applies(size_bytes)
+        block = None
+        if self.arena is not None and not mapped and need < self.budget.total_bytes:
+            block = self.arena.take(need)
+        if block is None:
+            self._admit(need)
+        started_at = datetime.utcnow()
+
+        pattern = spec.kernel or DEFAULT_PATTERN
+        try:
+            if self.executor.shares_memory:
+                fut = self.executor.submit(run_mem_task, spec.complexity, pattern, self.mmap_config, self.arena, block)
+            else:
+                fut = self.executor.submit(run_mem_task, spec.complexity, pattern, self.mmap_config)
+        except Exception as exc:
+            fut = Future()
+            fut.set_exception(exc)
+        fut.add_done_callback(partial(self._on_task_done, spec, need, started_at))
+
+    def _on_task_done(self, spec: TaskSpec, need: int, started_at: datetime, fut: Future) -> None:
+        self.budget.release(need)
+        try:
+            ok, err, finished_ts, metrics = fut.result()
+            finished_at = datetime.utcfromtimestamp(finished_ts)
+        except Exception as exc:
+            ok, err, finished_at, metrics = False, str(exc), datetime.utcnow(), None
+        self._finished(TaskOutcome(spec.id, ok, err, finished_at, started_at=started_at, result=metrics))
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self.executor.shutdown()
+
+
+def build_memory_pool(settings: Any, outcomes: "queue.Queue[TaskOutcome]") -> MemoryPool:
+    budget = MemoryBudget(
+        resolve_budget_bytes(settings.memory_budget_mb, settings.memory_budget_fraction)
+    )
+    if settings.executor_backend == BACKEND_THREADS:
+        executor = TaskExecutor(BACKEND_THREADS, settings.max_threads)
+    else:
+        executor = TaskExecutor(settings.executor_backend, settings.process_workers)
+    arena = None
+    if settings.arena_max_retained_mb > 0 and executor.shares_memory:
+        arena = BufferArena(
+            max_retained_bytes=settings.arena_max_retained_mb * MB,
+            max_buffers_per_class=settings.arena_max_buffers_per_class,
+            budget=budget,
+        )
+    mmap_config = MmapConfig(
+        backing=settings.mmap_backing,
+        threshold_bytes=settings.mmap_threshold_mb * MB,
+        window_bytes=settings.mmap_window_mb * MB,
+        scratch_dir=settings.mmap_scratch_dir,
+        hugepages=settings.mmap_hugepages,
+    )
+    return MemoryPool(
+        capacity=settings.memory_capacity,
+        outcomes=outcomes,
+        budget=budget,
+        executor=executor,
+        oversized_policy=settings.oversized_task_policy,
+        arena=arena,
+        mmap_config=mmap_config,
+    )
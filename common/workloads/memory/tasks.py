@@ -0,0 +1,47 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from common.workloads.memory.arena import BufferArena
+from common.workloads.memory.budget import MB
+from common.workloads.memory.kernels import DEFAULT_PATTERN, run_pattern
+from common.workloads.memory.mmap_backing import MmapConfig, run_mapped
+
+MemRunResult = Tuple[bool, Optional[str], float, Optional[Dict[str, float]]]
+
+
+def declared_task_bytes(complexity: int) -> int:
+    return max(1, int(complexity)) * MB
+
+
+def simulate_memory_load(
+    complexity: int,
+    arena: Optional[BufferArena] = None,
+    block: Optional[bytearray] = None,
+    pattern: str = DEFAULT_PATTERN,
+    mmap_config: Optional[MmapConfig] = None,
+) -> Dict[str, float]:
+    size_bytes = declared_task_bytes(complexity)
+    if block is None and mmap_config is not None and mmap_config.applies(size_bytes):
+        return run_mapped(size_bytes, pattern, mmap_config)
+    if block is None:
+        block = arena.acquire(size_bytes) if arena is not None else bytearray(size_bytes)
+    try:
+        return run_pattern(block, size_bytes, pattern)
+    finally:
+        if arena is not None:
+            arena.release(block)
+        del block
+
+
+def run_mem_task(
+    complexity: int,
+    pattern: str = DEFAULT_PATTERN,
+    mmap_config: Optional[MmapConfig] = None,
+    arena: Optional[BufferArena] = None,
+    block: Optional[bytearray] = None,
+) -> MemRunResult:
+    try:
+        metrics = simulate_memory_load(complexity, arena, block, pattern, mmap_config)
+        return True, None, time.time(), metrics
+    except Exception as exc:
+        return False, str(exc), time.time(), None
@@ -27,7 +27,7 @@ foreach ($k in $repos.PSObject.Properties.Name) {
   $path = $buildPaths[$k]
   if (!(Test-Path $path)) { throw "Brakuje katalogu: $path" }
 
-  docker build -t "$repo`:$Tag" "$path"
+  docker build -t "$repo`:$Tag" -f "$path\Dockerfile" "$Root"
   docker push "$repo`:$Tag"
 }
 
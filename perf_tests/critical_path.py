@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from report import _percentile
+from utils import write_csv, write_json
+
+STAGES = ["task.insert", "task.dispatch", "task.claim", "task.execute", "task.write_back"]
+SEGMENTS: List[Tuple[str, str, str, str]] = [
+    ("api_insert", "task.insert", "start", "end"),
+    ("pending_wait", "task.insert", "end", "task.dispatch"),
+    ("dispatch", "task.dispatch", "start", "end"),
+    ("dispatched_wait", "task.dispatch", "end", "task.claim"),
+    ("claim", "task.claim", "start", "end"),
+    ("executor_queue", "task.claim", "end", "task.execute"),
+    ("execute", "task.execute", "start", "end"),
+    ("write_back_wait", "task.execute", "end", "task.write_back"),
+    ("write_back", "task.write_back", "start", "end"),
+]
+SEGMENT_NAMES = [s[0] for s in SEGMENTS]
+
+Span = Dict[str, Any]
+
+
+def _attr_value(value: Dict[str, Any]) -> Any:
+    for key in ("stringValue", "intValue", "doubleValue", "boolValue"):
+        if key in value:
+            return int(value[key]) if key == "intValue" else value[key]
+    return None
+
+
+def iter_span_files(paths: Iterable[str]) -> Iterator[Path]:
+    for raw in paths:
+        p = Path(raw)
+        if p.is_dir():
+            yield from sorted(p.rglob("*.jsonl"))
+        else:
+            yield p
+
+
+def read_spans(paths: Iterable[str]) -> Iterator[Span]:
+    for path in iter_span_files(paths):
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                for rs in json.loads(line).get("resourceSpans", []):
+                    resource = {a["key"]: _attr_value(a["value"]) for a in rs.get("resource", {}).get("attributes", [])}
+                    for ss in rs.get("scopeSpans", []):
+                        for span in ss.get("spans", []):
+                            yield {
+                                "trace_id": span["traceId"],
+                                "name": span["name"],
+                                "service": resource.get("service.name"),
+                                "start": int(span["startTimeUnixNano"]) / 1e9,
+                                "end": int(span["endTimeUnixNano"]) / 1e9,
+                                "error": (span.get("status") or {}).get("code") == 2,
+                                "attributes": {a["key"]: _attr_value(a["value"]) for a in span.get("attributes", [])},
+                            }
+
+
+def group_traces(spans: Iterable[Span]) -> Dict[str, Dict[str, Span]]:
+    traces: Dict[str, Dict[str, Span]] = defaultdict(dict)
+    for span in spans:
+        if span["name"] not in STAGES:
+            continue
+        stages = traces[span["trace_id"]]
+        prev = stages.get(span["name"])
+        if prev is None or span["end"] > prev["end"]:
+            stages[span["name"]] = span
+    return traces
+
+
+def critical_path(trace_id: str, stages: Dict[str, Span]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"trace_id": trace_id, "task_id": None, "task_type": None}
+    for span in stages.values():
+        row["task_id"] = row["task_id"] or span["attributes"].get("task.id")
+        row["task_type"] = row["task_type"] or span["attributes"].get("task.type")
+    for name, stage, edge, until in SEGMENTS:
+        span = stages.get(stage)
+        if span is None:
+            row[name] = None
+        elif until in ("start", "end"):
+            row[name] = span[until] - span[edge]
+        else:
+            nxt = stages.get(until)
+            row[name] = nxt["start"] - span[edge] if nxt is not None else None
+    first = stages.get(STAGES[0])
+    last = stages.get(STAGES[-1])
+    row["total"] = last["end"] - first["start"] if first and last else None
+    known = [(row[n], n) for n in SEGMENT_NAMES if row[n] is not None]
+    row["dominant"] = max(known)[1] if known else None
+    row["complete"] = all(s in stages for s in STAGES)
+    row["failed"] = any(s["error"] for s in stages.values())
+    return row
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    complete = [r for r in rows if r["complete"]]
+    total_sum = sum(r["total"] for r in complete) or 0.0
+    segments: Dict[str, Any] = {}
+    for name in SEGMENT_NAMES + ["total"]:
+        vals = sorted(r[name] for r in complete if r[name] is not None)
+        segments[name] = {
+            "count": len(vals),
+            "mean_sec": sum(vals) / len(vals) if vals else None,
+            "p50_sec": _percentile(vals, 50),
+            "p95_sec": _percentile(vals, 95),
+            "p99_sec": _percentile(vals, 99),
+            "share_of_total": (sum(vals) / total_sum) if total_sum and name != "total" else None,
+        }
+    dominant: Dict[str, int] = defaultdict(int)
+    for r in complete:
+        dominant[r["dominant"]] += 1
+    return {
+        "traces": len(rows),
+        "complete_traces": len(complete),
+        "segments": segments,
+        "dominant_segment_counts": dict(sorted(dominant.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def _fmt(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v * 1000:.1f}"
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"traces={summary['traces']} complete={summary['complete_traces']}")
+    print(f"{'segment':<16}{'mean_ms':>12}{'p50_ms':>12}{'p95_ms':>12}{'p99_ms':>12}{'share':>8}")
+    for name, s in summary["segments"].items():
+        share = "-" if s["share_of_total"] is None else f"{s['share_of_total'] * 100:.1f}%"
+        print(f"{name:<16}{_fmt(s['mean_sec']):>12}{_fmt(s['p50_sec']):>12}{_fmt(s['p95_sec']):>12}{_fmt(s['p99_sec']):>12}{share:>8}")
+    print("dominant:", ", ".join(f"{k}={v}" for k, v in summary["dominant_segment_counts"].items()))
+
+
+def print_trace(trace_id: str, stages: Dict[str, Span]) -> None:
+    spans = sorted(stages.values(), key=lambda s: s["start"])
+    if not spans:
+        print(f"trace {trace_id} not found")
+        return
+    t0 = spans[0]["start"]
+    for s in spans:
+        print(f"{(s['start'] - t0) * 1000:>10.1f}ms {(s['end'] - s['start']) * 1000:>10.1f}ms  {s['name']:<16} {s['service']}")
+    row = critical_path(trace_id, stages)
+    for name in SEGMENT_NAMES + ["total"]:
+        print(f"  {name:<16}{_fmt(row[name]):>10} ms")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Rebuild per-task critical paths from exported span files.")
+    ap.add_argument("paths", nargs="+", help="span .jsonl files or directories containing them")
+    ap.add_argument("--trace-id", default=None)
+    ap.add_argument("--out-dir", default=None)
+    args = ap.parse_args()
+
+    traces = group_traces(read_spans(args.paths))
+    if args.trace_id:
+        print_trace(args.trace_id, traces.get(args.trace_id, {}))
+        return
+
+    rows = [critical_path(tid, stages) for tid, stages in traces.items()]
+    summary = summarize(rows)
+    print_summary(summary)
+    if args.out_dir:
+        out = Path(args.out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        fields = ["trace_id", "task_id", "task_type"] + SEGMENT_NAMES + ["total", "dominant", "complete", "failed"]
+        write_csv(out / "critical_paths.csv", rows, fields)
+        write_json(out / "critical_path_summary.json", summary)
+
+
+if __name__ == "__main__":
+    main()
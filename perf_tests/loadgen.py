@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import secrets
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -18,11 +20,20 @@ class RequestResult:
     error_type: str
 
 
-async def _post_task(client: httpx.AsyncClient, url: str, payload: Dict[str, Any]) -> RequestResult:
+def _trace_headers(trace_sample_ratio: Optional[float]) -> Optional[Dict[str, str]]:
+    if trace_sample_ratio is None:
+        return None
+    flags = "01" if random.random() < trace_sample_ratio else "00"
+    return {"traceparent": f"00-{secrets.token_hex(16)}-{secrets.token_hex(8)}-{flags}"}
+
+
+async def _post_task(
+    client: httpx.AsyncClient, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+) -> RequestResult:
     ts = utc_now_iso()
     t0 = asyncio.get_event_loop().time()
     try:
-        r = await client.post(url, json=payload)
+        r = await client.post(url, json=payload, headers=headers)
         t1 = asyncio.get_event_loop().time()
         latency_ms = (t1 - t0) * 1000.0
         ok = r.status_code == 201
@@ -61,6 +72,7 @@ async def _run_segment(
     duration_sec: float,
     sem: asyncio.Semaphore,
     results: List[RequestResult],
+    trace_sample_ratio: Optional[float] = None,
 ) -> None:
     if duration_sec <= 0:
         return
@@ -77,7 +89,7 @@ async def _run_segment(
 
     async def one_request() -> None:
         async with sem:
-            res = await _post_task(client, url, payload)
+            res = await _post_task(client, url, payload, _trace_headers(trace_sample_ratio))
             results.append(res)
 
     start = asyncio.get_event_loop().time()
@@ -93,13 +105,17 @@ async def _run_segment(
     await asyncio.gather(*tasks, return_exceptions=True)
 
 
-async def generate_load(client: httpx.AsyncClient, task_api_base_url: str, spec: TestSpec) -> List[RequestResult]:
+async def generate_load(
+    client: httpx.AsyncClient, task_api_base_url: str, spec: TestSpec, run_id: Optional[str] = None
+) -> List[RequestResult]:
     url = f"{task_api_base_url}/tasks/"
     payload = {
         "task_type": spec.task_type,
         "complexity": int(spec.complexity),
+        "kernel": spec.kernel,
         "expected_duration_sec": None,
-        "payload_size_kb": 0,
+        "payload_size_kb": int(spec.payload_size_kb),
+        "run_id": run_id,
     }
 
     sem = asyncio.Semaphore(int(spec.concurrency))
@@ -115,6 +131,7 @@ async def generate_load(client: httpx.AsyncClient, task_api_base_url: str, spec:
             duration_sec=float(seg["duration_sec"]),
             sem=sem,
             results=results,
+            trace_sample_ratio=spec.trace_sample_ratio,
         )
 
     return results
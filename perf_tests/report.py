@@ -45,27 +45,17 @@ def compute_http_report(latencies_ms: List[float], oks: List[bool], duration_sec
     }
 
 
-def diff_stats(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
-    out: Dict[str, Any] = {}
-
-    b_counts = before.get("status_counts", {}) or {}
-    a_counts = after.get("status_counts", {}) or {}
-
-    out["total_tasks_before"] = before.get("total_tasks")
-    out["total_tasks_after"] = after.get("total_tasks")
-
-    out["status_counts_before"] = b_counts
-    out["status_counts_after"] = a_counts
-
-    out["delta_completed"] = (a_counts.get("COMPLETED", 0) - b_counts.get("COMPLETED", 0))
-
-    out["avg_wait_time_sec_before"] = before.get("avg_wait_time_sec")
-    out["avg_wait_time_sec_after"] = after.get("avg_wait_time_sec")
-
-    out["avg_run_time_sec_by_type_before"] = before.get("avg_run_time_sec_by_type")
-    out["avg_run_time_sec_by_type_after"] = after.get("avg_run_time_sec_by_type")
-
-    out["throughput_tasks_per_min_before"] = before.get("throughput_tasks_per_min")
-    out["throughput_tasks_per_min_after"] = after.get("throughput_tasks_per_min")
-
-    return out
+def run_stats_report(stats: Dict[str, Any]) -> Dict[str, Any]:
+    counts = stats.get("status_counts", {}) or {}
+    return {
+        "run_id": stats.get("run_id"),
+        "total_tasks": stats.get("total_tasks"),
+        "status_counts": counts,
+        "completed": counts.get("COMPLETED", 0),
+        "failed": counts.get("FAILED", 0),
+        "unfinished": sum(counts.get(s, 0) for s in ("PENDING", "DISPATCHED", "RUNNING")),
+        "avg_wait_time_sec": stats.get("avg_wait_time_sec"),
+        "avg_run_time_sec_by_type": stats.get("avg_run_time_sec_by_type"),
+        "throughput_tasks_per_min": stats.get("throughput_tasks_per_min"),
+        "latency_percentiles_sec": stats.get("latency_percentiles_sec"),
+    }
@@ -9,13 +9,14 @@ import httpx
 import yaml
 
 from loadgen import generate_load
-from report import compute_http_report, diff_stats
-from snapshots import health_checks, snapshot_summary
+from report import compute_http_report, run_stats_report
+from snapshots import health_checks, snapshot_summary, snapshot_timeseries
 from utils import (
     EnvConfig,
     TestSpec,
     ensure_dir,
     folder_name_for_test,
+    new_run_id,
     today_ymd_utc,
     utc_now_iso,
     write_csv,
@@ -70,6 +71,9 @@ def load_matrix(path: str) -> List[TestSpec]:
                 concurrency=int(t["concurrency"]),
                 mode=str(t["mode"]),
                 schedule=schedule,
+                kernel=t.get("kernel"),
+                payload_size_kb=int(t.get("payload_size_kb", 0)),
+                trace_sample_ratio=float(t["trace_sample_ratio"]) if t.get("trace_sample_ratio") is not None else None,
             )
         )
 
@@ -93,7 +97,9 @@ def select_tests(all_tests: List[TestSpec], test_id: Optional[str], group: Optio
     raise SystemExit("Provide --test-id or --group or --all")
 
 
-async def drain_end_to_end(env: EnvConfig, client: httpx.AsyncClient, out_jsonl: Path, poll_sec: int, timeout_sec: int) -> None:
+async def drain_end_to_end(
+    env: EnvConfig, client: httpx.AsyncClient, out_jsonl: Path, poll_sec: int, timeout_sec: int, run_id: str
+) -> None:
     start = asyncio.get_event_loop().time()
     while True:
         now = asyncio.get_event_loop().time()
@@ -102,8 +108,11 @@ async def drain_end_to_end(env: EnvConfig, client: httpx.AsyncClient, out_jsonl:
                 f.write(f'{{"timestamp_utc":"{utc_now_iso()}","event":"drain_timeout"}}\n')
             return
 
-        stats = await snapshot_summary(env, client)
+        stats = await snapshot_summary(env, client, fresh=False, run_id=run_id)
         counts = stats.get("status_counts", {}) or {}
+        if not any(int(counts.get(s, 0)) for s in ("PENDING", "DISPATCHED", "RUNNING")):
+            stats = await snapshot_summary(env, client, run_id=run_id)
+            counts = stats.get("status_counts", {}) or {}
         pending = int(counts.get("PENDING", 0))
         dispatched = int(counts.get("DISPATCHED", 0))
         running = int(counts.get("RUNNING", 0))
@@ -130,14 +139,19 @@ async def run_one(env: EnvConfig, spec: TestSpec, autoscaling: str, workers: str
     ensure_dir(run_dir)
 
     start_time = utc_now_iso()
+    run_id = new_run_id(spec.test_id)
 
     timeout = httpx.Timeout(env.request_timeout_sec)
     async with httpx.AsyncClient(headers=env.default_headers, timeout=timeout, verify=env.verify_tls) as client:
         meta: Dict[str, Any] = {
             "project_name": env.project_name,
             "test_id": spec.test_id,
+            "run_id": run_id,
             "task_type": spec.task_type,
             "complexity": spec.complexity,
+            "kernel": spec.kernel,
+            "payload_size_kb": spec.payload_size_kb,
+            "trace_sample_ratio": spec.trace_sample_ratio,
             "rate": spec.rate,
             "duration_sec": spec.duration_sec,
             "concurrency": spec.concurrency,
@@ -158,11 +172,8 @@ async def run_one(env: EnvConfig, spec: TestSpec, autoscaling: str, workers: str
         hc = await health_checks(env, client)
         write_json(run_dir / "health.json", hc)
 
-        stats_before = await snapshot_summary(env, client)
-        write_json(run_dir / "stats_before.json", stats_before)
-
         load_start = utc_now_iso()
-        req_results = await generate_load(client, env.task_api_base_url, spec)
+        req_results = await generate_load(client, env.task_api_base_url, spec, run_id=run_id)
         load_end = utc_now_iso()
 
         rows = []
@@ -179,10 +190,11 @@ async def run_one(env: EnvConfig, spec: TestSpec, autoscaling: str, workers: str
         write_csv(run_dir / "request_results.csv", rows, fieldnames=["timestamp_utc", "status_code", "ok", "latency_ms", "error_type"])
 
         if spec.mode.lower() == "end_to_end":
-            await drain_end_to_end(env, client, run_dir / "drain_log.jsonl", poll_sec=10, timeout_sec=1800)
+            await drain_end_to_end(env, client, run_dir / "drain_log.jsonl", poll_sec=10, timeout_sec=1800, run_id=run_id)
 
-        stats_after = await snapshot_summary(env, client)
-        write_json(run_dir / "stats_after.json", stats_after)
+        stats_run = await snapshot_summary(env, client, run_id=run_id)
+        write_json(run_dir / "stats_run.json", stats_run)
+        write_json(run_dir / "timeseries_run.json", await snapshot_timeseries(env, client, run_id))
 
         end_time = utc_now_iso()
         meta["end_time_utc"] = end_time
@@ -192,11 +204,11 @@ async def run_one(env: EnvConfig, spec: TestSpec, autoscaling: str, workers: str
         lat = [float(x.latency_ms) for x in req_results]
         oks = [bool(x.ok) for x in req_results]
         http_rep = compute_http_report(lat, oks, spec.duration_sec)
-        stats_rep = diff_stats(stats_before, stats_after)
+        stats_rep = run_stats_report(stats_run)
 
         report_out = {
             "http": http_rep,
-            "stats_diff": stats_rep,
+            "stats_run": stats_rep,
             "time_window_utc": {
                 "start_time_utc": start_time,
                 "end_time_utc": end_time,
@@ -218,7 +230,8 @@ async def run_one(env: EnvConfig, spec: TestSpec, autoscaling: str, workers: str
     print(f"\nRESULT_DIR: {run_dir}")
     print(f"TIME_UTC: {start_time} -> {end_time}")
     print(f"HTTP: error_rate={http_rep['error_rate']:.4f}, p95_ms={http_rep['p95_latency_ms']}, achieved_rps={http_rep['achieved_rps']}")
-    print(f"PIPE: delta_completed={stats_rep['delta_completed']}, avg_wait_after={stats_rep['avg_wait_time_sec_after']}, throughput_after={stats_rep['throughput_tasks_per_min_after']}")
+    print(f"RUN_ID: {run_id}")
+    print(f"PIPE: completed={stats_rep['completed']}, failed={stats_rep['failed']}, avg_wait={stats_rep['avg_wait_time_sec']}, throughput={stats_rep['throughput_tasks_per_min']}")
     return run_dir
 
 
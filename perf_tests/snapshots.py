@@ -1,20 +1,34 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import httpx
 
 from utils import EnvConfig
 
 
-async def get_json(client: httpx.AsyncClient, url: str) -> Dict[str, Any]:
-    r = await client.get(url)
+async def get_json(client: httpx.AsyncClient, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    r = await client.get(url, params=params)
     r.raise_for_status()
     return r.json()
 
 
-async def snapshot_summary(env: EnvConfig, client: httpx.AsyncClient) -> Dict[str, Any]:
-    return await get_json(client, f"{env.result_service_base_url}/stats/summary")
+async def snapshot_summary(
+    env: EnvConfig, client: httpx.AsyncClient, fresh: bool = True, run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if fresh:
+        params["fresh"] = "true"
+    if run_id:
+        params["run_id"] = run_id
+    return await get_json(client, f"{env.result_service_base_url}/stats/summary", params or None)
+
+
+async def snapshot_timeseries(
+    env: EnvConfig, client: httpx.AsyncClient, run_id: str, bucket_sec: int = 10
+) -> Dict[str, Any]:
+    params = {"run_id": run_id, "bucket": bucket_sec}
+    return await get_json(client, f"{env.result_service_base_url}/stats/timeseries", params)
 
 
 async def health_checks(env: EnvConfig, client: httpx.AsyncClient) -> Dict[str, Any]:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import csv
 import json
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -17,6 +18,11 @@ def today_ymd_utc() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
 
+def new_run_id(test_id: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return f"{test_id[:40]}-{stamp}-{uuid.uuid4().hex[:6]}"
+
+
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
@@ -62,6 +68,9 @@ class TestSpec:
     concurrency: int
     mode: str
     schedule: Optional[List[Dict[str, Any]]] = None
+    kernel: Optional[str] = None
+    payload_size_kb: int = 0
+    trace_sample_ratio: Optional[float] = None
 
 
 def folder_name_for_test(spec: TestSpec, workers: str) -> str:
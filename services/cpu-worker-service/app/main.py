@@ -1,31 +1,21 @@
-import time
-
 from app.core.config import get_settings
-from app.core.db import SessionLocal, Base, engine
-from app.services.cpu_worker import process_dispatched_cpu_tasks
+from app.core.db import SessionLocal, engine
+from common.db.migrate import upgrade_schema
+from common.observability.metrics import register_collector, start_metrics_server
+from common.observability.profiling import build_controller, start_profiling_server
+from common.observability.tracing import get_tracer
+from common.worker.runtime import build_runtime
 
 
 def main():
-    Base.metadata.create_all(bind=engine)
     settings = get_settings()
-
-    process_concurrency = 8
-
-    while True:
-        db = SessionLocal()
-        try:
-            processed = process_dispatched_cpu_tasks(
-                db,
-                batch_size=50,
-                process_concurrency=int(process_concurrency),
-            )
-        finally:
-            db.close()
-
-        if processed == 0:
-            time.sleep(float(settings.poll_interval_sec))
-        else:
-            time.sleep(0.01)
+    if settings.db_auto_migrate:
+        upgrade_schema(engine)
+    runtime = build_runtime(settings, SessionLocal, tracer=get_tracer("cpu-worker"))
+    register_collector(runtime.collect_metrics)
+    start_metrics_server(settings.metrics_port)
+    start_profiling_server(build_controller("cpu-worker"))
+    runtime.run_forever()
 
 
 if __name__ == "__main__":
@@ -1,3 +0,0 @@
-from .cpu_worker import process_dispatched_cpu_tasks
-
-__all__ = ["process_dispatched_cpu_tasks"]
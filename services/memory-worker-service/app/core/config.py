@@ -1,14 +1,16 @@
 from functools import lru_cache
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
+from common.worker.config import WorkerSettings
 
-class Settings(BaseSettings):
+
+class Settings(WorkerSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_url: str = "sqlite:///./test.db"
-    poll_interval_sec: int = 5
-    batch_size: int = 10
+    worker_task_types: str = "MEMORY_INTENSIVE"
+    poll_interval_sec: float = 1
 
 
 @lru_cache
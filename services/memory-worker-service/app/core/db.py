@@ -1,22 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from common.db.base import Base
+from common.db.engine import create_db_engine, create_session_factory
+from common.observability.metrics import instrument_engine
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+engine = create_db_engine(settings, application_name="memory-worker")
+instrument_engine(engine, "memory-worker")
 
-class Base(DeclarativeBase):
-    pass
-
-
-engine = create_engine(
-    settings.database_url,
-    echo=False,
-)
-
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-)
+SessionLocal = create_session_factory(engine)
@@ -1,29 +1,21 @@
-import time
-
-from app.core.db import SessionLocal
-from app.services.memory_worker import process_dispatched_memory_tasks
+from app.core.config import get_settings
+from app.core.db import SessionLocal, engine
+from common.db.migrate import upgrade_schema
+from common.observability.metrics import register_collector, start_metrics_server
+from common.observability.profiling import build_controller, start_profiling_server
+from common.observability.tracing import get_tracer
+from common.worker.runtime import build_runtime
 
 
 def main():
-    thread_concurrency = 2
-    batch_size = 5
-    poll_interval_sec = 1.0
-
-    while True:
-        db = SessionLocal()
-        try:
-            processed = process_dispatched_memory_tasks(
-                db,
-                batch_size=batch_size,
-                thread_concurrency=thread_concurrency,
-            )
-        finally:
-            db.close()
-
-        if processed == 0:
-            time.sleep(poll_interval_sec)
-        else:
-            time.sleep(0.01)
+    settings = get_settings()
+    if settings.db_auto_migrate:
+        upgrade_schema(engine)
+    runtime = build_runtime(settings, SessionLocal, tracer=get_tracer("memory-worker"))
+    register_collector(runtime.collect_metrics)
+    start_metrics_server(settings.metrics_port)
+    start_profiling_server(build_controller("memory-worker", allocations=True))
+    runtime.run_forever()
 
 
 if __name__ == "__main__":
@@ -1,3 +0,0 @@
-from .memory_worker import process_dispatched_memory_tasks
-
-__all__ = ["process_dispatched_memory_tasks"]
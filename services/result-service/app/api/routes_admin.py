@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.db import SessionLocal
+from app.api.routes_stats import summary_cache
+from app.services.rollups import check_drift, rebuild_rollups
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -24,4 +26,27 @@ def truncate_tasks(db: Session = Depends(get_db)):
 
     db.execute(text("TRUNCATE TABLE tasks RESTART IDENTITY;"))
     db.commit()
+    summary_cache.invalidate()
     return {"ok": True}
+
+
+@router.get("/rollups/drift")
+def rollups_drift(db: Session = Depends(get_db)):
+    settings = get_settings()
+    if not settings.enable_db_admin:
+        raise HTTPException(status_code=403, detail="DB admin endpoints disabled")
+
+    return check_drift(db)
+
+
+@router.post("/rollups/reconcile")
+def rollups_reconcile(force: bool = False, db: Session = Depends(get_db)):
+    settings = get_settings()
+    if not settings.enable_db_admin:
+        raise HTTPException(status_code=403, detail="DB admin endpoints disabled")
+
+    report = check_drift(db)
+    if force or report["drift"]:
+        report = rebuild_rollups(db)
+        summary_cache.invalidate()
+    return report
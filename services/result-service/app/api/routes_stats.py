@@ -1,16 +1,67 @@
-from typing import Any, Dict
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.db import SessionLocal
+from app.core.config import get_settings
+from app.core.db import ReadSessionLocal
+from app.services.backlog import backlog_metrics, get_backlog
+from app.services.broadcaster import StatsBroadcaster
+from app.services.cache import SingleFlightCache
+from app.services.history import get_history_stats
 from app.services.stats_service import get_summary_stats
+from app.services.timeseries import get_timeseries
+from common.observability.metrics import register_collector
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+summary_cache = SingleFlightCache(get_settings().stats_cache_ttl_sec, get_settings().stats_cache_max_entries)
+backlog_cache = SingleFlightCache(get_settings().stats_backlog_cache_ttl_sec)
+
+
+def _cached_backlog(fresh: bool = False):
+    db = ReadSessionLocal()
+    try:
+        return backlog_cache.get("backlog", lambda: get_backlog(db), fresh=fresh)
+    finally:
+        db.close()
+
+
+def _collect_backlog() -> Iterable[Any]:
+    try:
+        backlog, _, _ = _cached_backlog()
+    except Exception:
+        logger.exception("Backlog metrics collection failed")
+        return []
+    return backlog_metrics(backlog)
+
+
+register_collector(_collect_backlog)
+
+
+def _broadcast_summary() -> Dict[str, Any]:
+    db = ReadSessionLocal()
+    try:
+        stats, _, _ = summary_cache.get("summary", lambda: get_summary_stats(db), fresh=True)
+        return stats
+    finally:
+        db.close()
+
+
+broadcaster = StatsBroadcaster(
+    _broadcast_summary,
+    interval_sec=get_settings().stats_stream_interval_sec,
+    heartbeat_sec=get_settings().stats_stream_heartbeat_sec,
+)
+
 
 def get_db():
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -18,5 +69,61 @@ def get_db():
 
 
 @router.get("/summary")
-def stats_summary(db: Session = Depends(get_db)) -> Dict[str, Any]:
-    return get_summary_stats(db)
+def stats_summary(
+    response: Response,
+    fresh: bool = False,
+    run_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    key = ("summary", run_id) if run_id is not None else "summary"
+    stats, status, age = summary_cache.get(key, lambda: get_summary_stats(db, run_id), fresh=fresh)
+    response.headers["X-Cache"] = status
+    response.headers["Age"] = str(int(age))
+    response.headers["Cache-Control"] = f"max-age={int(summary_cache.ttl_sec)}"
+    return stats
+
+
+@router.get("/backlog")
+def stats_backlog(response: Response, fresh: bool = False) -> Dict[str, Any]:
+    backlog, status, age = _cached_backlog(fresh)
+    response.headers["X-Cache"] = status
+    response.headers["Age"] = str(int(age))
+    response.headers["Cache-Control"] = f"max-age={int(backlog_cache.ttl_sec)}"
+    return backlog
+
+
+@router.get("/timeseries")
+def stats_timeseries(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    bucket: int = 60,
+    run_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    try:
+        return get_timeseries(db, start, end, bucket, run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/history")
+def stats_history(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    include_live: bool = True,
+    run_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    try:
+        return get_history_stats(db, start, end, include_live, run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/stream")
+async def stats_stream(request: Request) -> StreamingResponse:
+    return StreamingResponse(
+        broadcaster.stream(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -128,6 +128,17 @@ def dashboard():
     button:hover {
       background: #111827;
     }
+    .charts {
+      display: grid;
+      grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+      gap: 16px;
+      margin-bottom: 24px;
+    }
+    canvas {
+      width: 100%;
+      height: 160px;
+      display: block;
+    }
   </style>
 </head>
 <body>
@@ -162,6 +173,19 @@ def dashboard():
       </div>
     </div>
 
+    <div class="charts">
+      <div class="card">
+        <h2>Throughput</h2>
+        <canvas id="throughputChart"></canvas>
+        <div class="sub">completed tasks/second</div>
+      </div>
+      <div class="card">
+        <h2>Backlog</h2>
+        <canvas id="backlogChart"></canvas>
+        <div class="sub">pending + dispatched + running</div>
+      </div>
+    </div>
+
     <h3>Status counts</h3>
     <div class="card">
       <div class="pill-row" id="statusCounts"></div>
@@ -177,6 +201,20 @@ def dashboard():
       </thead>
       <tbody id="runTimesBody"></tbody>
     </table>
+
+    <h3>Run time percentiles by type</h3>
+    <table>
+      <thead>
+        <tr>
+          <th>Type</th>
+          <th>p50 [s]</th>
+          <th>p95 [s]</th>
+          <th>p99 [s]</th>
+          <th>max [s]</th>
+        </tr>
+      </thead>
+      <tbody id="percentilesBody"></tbody>
+    </table>
   </main>
 
   <script>
@@ -185,17 +223,117 @@ def dashboard():
       return Number(x).toFixed(digits);
     }
 
+    const HISTORY_POINTS = 300;
+    const ACTIVE = ["PENDING", "DISPATCHED", "RUNNING"];
+    let state = {};
+    let history = { throughput: [], backlog: [] };
+    let lastCompleted = null;
+    let lastTs = null;
+
+    function pushPoint(series, ts, value) {
+      series.push([ts, value]);
+      if (series.length > HISTORY_POINTS) series.shift();
+    }
+
+    function drawChart(id, points, color) {
+      const canvas = document.getElementById(id);
+      const ratio = window.devicePixelRatio || 1;
+      const w = canvas.clientWidth, h = canvas.clientHeight;
+      canvas.width = w * ratio;
+      canvas.height = h * ratio;
+      const ctx = canvas.getContext("2d");
+      ctx.scale(ratio, ratio);
+      ctx.clearRect(0, 0, w, h);
+      if (points.length < 2) return;
+      const t0 = points[0][0], t1 = points[points.length - 1][0];
+      const vmax = Math.max(1e-9, ...points.map(p => p[1]));
+      ctx.strokeStyle = "#1e293b";
+      ctx.beginPath();
+      ctx.moveTo(0, h - 0.5);
+      ctx.lineTo(w, h - 0.5);
+      ctx.stroke();
+      ctx.strokeStyle = color;
+      ctx.lineWidth = 2;
+      ctx.beginPath();
+      points.forEach(([t, v], i) => {
+        const x = t1 > t0 ? ((t - t0) / (t1 - t0)) * w : 0;
+        const y = h - 4 - (v / vmax) * (h - 20);
+        if (i === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+      });
+      ctx.stroke();
+      ctx.fillStyle = "#9ca3af";
+      ctx.font = "11px system-ui";
+      ctx.fillText("max " + formatNumber(vmax), 4, 12);
+    }
+
+    function drawCharts() {
+      drawChart("throughputChart", history.throughput, "#38bdf8");
+      drawChart("backlogChart", history.backlog, "#f59e0b");
+    }
+
+    function recordLive(data, ts) {
+      const counts = data.status_counts || {};
+      const backlog = ACTIVE.reduce((acc, k) => acc + (counts[k] || 0), 0);
+      pushPoint(history.backlog, ts, backlog);
+      const completed = counts.COMPLETED || 0;
+      if (lastCompleted !== null && ts > lastTs) {
+        pushPoint(history.throughput, ts, Math.max(0, completed - lastCompleted) / (ts - lastTs));
+      }
+      lastCompleted = completed;
+      lastTs = ts;
+      drawCharts();
+    }
+
+    async function seedHistory() {
+      try {
+        const to = new Date();
+        const from = new Date(to.getTime() - 5 * 60 * 1000);
+        const params = new URLSearchParams({ from: from.toISOString(), to: to.toISOString(), bucket: "5" });
+        const res = await fetch("/stats/timeseries?" + params);
+        if (!res.ok) return;
+        const ts = await res.json();
+        const seeded = { throughput: [], backlog: [] };
+        ts.buckets.forEach((b, i) => {
+          const t = Date.parse(b + "Z") / 1000 + ts.bucket_sec;
+          let done = 0, backlog = 0;
+          for (const s of Object.values(ts.by_type)) {
+            done += s.completions[i];
+            backlog += s.backlog[i];
+          }
+          seeded.throughput.push([t, done / ts.bucket_sec]);
+          seeded.backlog.push([t, backlog]);
+        });
+        history.throughput = seeded.throughput.concat(history.throughput).slice(-HISTORY_POINTS);
+        history.backlog = seeded.backlog.concat(history.backlog).slice(-HISTORY_POINTS);
+        drawCharts();
+      } catch (e) {}
+    }
+
+    function applyMessage(kind, msg) {
+      state = kind === "snapshot" ? msg.data : Object.assign({}, state, msg.data);
+      renderStats(state);
+      if (msg.data.status_counts) recordLive(state, msg.ts);
+    }
+
     async function fetchStats() {
       try {
-        const res = await fetch("/stats/summary");
+        const res = await fetch("/stats/summary?fresh=true");
         if (!res.ok) throw new Error(res.status);
-        const data = await res.json();
-        renderStats(data);
+        applyMessage("snapshot", { data: await res.json(), ts: Date.now() / 1000 });
       } catch (e) {
         document.getElementById("updatedAt").textContent = "Error fetching stats";
       }
     }
 
+    function connect() {
+      const source = new EventSource("/stats/stream");
+      source.addEventListener("snapshot", e => applyMessage("snapshot", JSON.parse(e.data)));
+      source.addEventListener("delta", e => applyMessage("delta", JSON.parse(e.data)));
+      source.onerror = () => {
+        document.getElementById("updatedAt").textContent = "Stream disconnected, reconnecting...";
+      };
+    }
+
     function renderStats(data) {
       document.getElementById("updatedAt").textContent =
         "Last update: " + new Date().toLocaleTimeString();
@@ -227,6 +365,20 @@ def dashboard():
           "</td>";
         body.appendChild(tr);
       }
+
+      const pBody = document.getElementById("percentilesBody");
+      pBody.innerHTML = "";
+      const latency = data.latency_percentiles_sec || {};
+      for (const t of order) {
+        const run = (latency[t] || {}).run;
+        if (!run) continue;
+        const tr = document.createElement("tr");
+        tr.innerHTML =
+          "<td>" + t + "</td><td>" + formatNumber(run.p50, 3) + "</td><td>" +
+          formatNumber(run.p95, 3) + "</td><td>" + formatNumber(run.p99, 3) +
+          "</td><td>" + formatNumber(run.max, 3) + "</td>";
+        pBody.appendChild(tr);
+      }
     }
 
     document.getElementById("refreshBtn").addEventListener("click", fetchStats);
@@ -241,8 +393,9 @@ def dashboard():
       fetchStats();
     });
 
-    fetchStats();
-    setInterval(fetchStats, 5000);
+    window.addEventListener("resize", drawCharts);
+    seedHistory();
+    connect();
   </script>
 </body>
 </html>
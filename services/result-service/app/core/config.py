@@ -1,13 +1,24 @@
 from functools import lru_cache
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
+from common.db.config import DatabaseSettings
 
-class Settings(BaseSettings):
+
+class Settings(DatabaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_url: str = "sqlite:///./test.db"
+    db_pool_size: int = 3
+    db_max_overflow: int = 2
     enable_db_admin: bool = True
+    stats_use_rollups: bool = True
+    stats_cache_ttl_sec: float = 2.0
+    stats_cache_max_entries: int = 256
+    stats_backlog_cache_ttl_sec: float = 1.0
+    stats_backlog_lookback_hours: float = 24.0
+    stats_stream_interval_sec: float = 1.0
+    stats_stream_heartbeat_sec: float = 15.0
 
 
 @lru_cache
@@ -1,12 +1,27 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 
 from app.api.routes_admin import router as admin_router
-from app.api.routes_stats import router as stats_router
+from app.api.routes_stats import broadcaster, router as stats_router
 from app.api.routes_ui import router as ui_router
+from app.core.db import engine, replica_router
+from common.db.engine import pool_stats
+from common.observability.metrics import HttpMetricsMiddleware, render_metrics
+from common.observability.profiling import TOKEN_HEADER, build_controller
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await broadcaster.start()
+    yield
+    await broadcaster.stop()
+
 
 app = FastAPI(
     title="Result Service",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 
@@ -15,6 +30,36 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/db-pool")
+def db_pool_health():
+    return pool_stats(engine)
+
+
+@app.get("/health/db-replica")
+def db_replica_health():
+    return replica_router.status()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+profiling = build_controller("result")
+
+
+@app.api_route("/debug/{path:path}", methods=["GET", "POST"], include_in_schema=False)
+def debug(path: str, request: Request):
+    status, content_type, body = profiling.handle(
+        request.method, path, dict(request.query_params), request.headers.get(TOKEN_HEADER)
+    )
+    return Response(content=body, status_code=status, media_type=content_type)
+
+
+app.add_middleware(HttpMetricsMiddleware, service="result", exclude=("/metrics", "/stats/stream"))
+
+
 app.include_router(stats_router)
 app.include_router(ui_router)
 app.include_router(admin_router)
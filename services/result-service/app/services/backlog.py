@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus, TaskType
+
+BACKLOG_STATUSES = (TaskStatus.PENDING, TaskStatus.DISPATCHED, TaskStatus.RUNNING)
+AGE_STATUSES = (TaskStatus.PENDING, TaskStatus.DISPATCHED)
+
+
+def _counts(db: Session) -> List[Tuple[TaskStatus, TaskType, int]]:
+    return (
+        db.query(Task.status, Task.task_type, func.count())
+        .filter(Task.status.in_(BACKLOG_STATUSES))
+        .group_by(Task.status, Task.task_type)
+        .all()
+    )
+
+
+def _oldest(db: Session) -> Dict[Tuple[TaskType, TaskStatus], Any]:
+    keys = [(t, s) for t in TaskType for s in AGE_STATUSES]
+    columns = [
+        select(func.min(Task.created_at)).where(Task.status == s, Task.task_type == t).scalar_subquery()
+        for t, s in keys
+    ]
+    return dict(zip(keys, db.execute(select(*columns)).one()))
+
+
+def get_backlog(db: Session) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    by_type: Dict[str, Dict[str, Any]] = {}
+    for t in TaskType:
+        by_type[t.value] = {s.value.lower(): 0 for s in BACKLOG_STATUSES}
+    for status, task_type, count in _counts(db):
+        by_type[task_type.value][status.value.lower()] = int(count)
+    for (task_type, status), oldest in _oldest(db).items():
+        age = max((now - oldest).total_seconds(), 0.0) if oldest is not None else None
+        by_type[task_type.value][f"oldest_{status.value.lower()}_age_sec"] = age
+    totals = {s.value.lower(): sum(row[s.value.lower()] for row in by_type.values()) for s in BACKLOG_STATUSES}
+    return {"as_of": now.isoformat(), "totals": totals, "by_type": by_type}
+
+
+def backlog_metrics(backlog: Dict[str, Any]) -> Iterable[Any]:
+    tasks = GaugeMetricFamily("task_backlog_tasks", "Unfinished tasks by status.", labels=["task_type", "status"])
+    age = GaugeMetricFamily(
+        "task_backlog_oldest_age_seconds",
+        "Age of the oldest task still in the given status.",
+        labels=["task_type", "status"],
+    )
+    for task_type, row in backlog["by_type"].items():
+        for s in BACKLOG_STATUSES:
+            tasks.add_metric([task_type, s.value], float(row[s.value.lower()]))
+        for s in AGE_STATUSES:
+            value = row[f"oldest_{s.value.lower()}_age_sec"]
+            age.add_metric([task_type, s.value], float(value) if value is not None else 0.0)
+    yield tasks
+    yield age
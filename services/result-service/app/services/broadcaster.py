@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+Message = Tuple[str, Dict[str, Any]]
+
+
+def format_sse(event: str, payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, default=str, separators=(",", ":"))
+    return f"event: {event}\nid: {payload.get('seq', 0)}\ndata: {data}\n\n"
+
+
+class StatsBroadcaster:
+    def __init__(
+        self,
+        compute: Callable[[], Dict[str, Any]],
+        interval_sec: float = 1.0,
+        heartbeat_sec: float = 15.0,
+        queue_size: int = 32,
+    ):
+        self.compute = compute
+        self.interval_sec = max(0.1, float(interval_sec))
+        self.heartbeat_sec = float(heartbeat_sec)
+        self.queue_size = int(queue_size)
+        self._subscribers: Set["asyncio.Queue[Message]"] = set()
+        self._last: Optional[Dict[str, Any]] = None
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _snapshot(self) -> Message:
+        return "snapshot", {"seq": self._seq, "ts": time.time(), "data": self._last or {}}
+
+    def subscribe(self) -> "asyncio.Queue[Message]":
+        q: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=self.queue_size)
+        if self._last is not None:
+            q.put_nowait(self._snapshot())
+        self._subscribers.add(q)
+        self._wake.set()
+        return q
+
+    def unsubscribe(self, q: "asyncio.Queue[Message]") -> None:
+        self._subscribers.discard(q)
+
+    def publish(self, stats: Dict[str, Any]) -> None:
+        previous = self._last or {}
+        delta = {k: v for k, v in stats.items() if k not in previous or previous[k] != v}
+        self._last = stats
+        if not delta:
+            return
+        self._seq += 1
+        message: Message = ("delta", {"seq": self._seq, "ts": time.time(), "data": delta})
+        for q in list(self._subscribers):
+            try:
+                q.put_nowait(message)
+            except asyncio.QueueFull:
+                while not q.empty():
+                    q.get_nowait()
+                q.put_nowait(self._snapshot())
+
+    async def _run(self) -> None:
+        while True:
+            if not self._subscribers:
+                self._wake.clear()
+                await self._wake.wait()
+            started = time.monotonic()
+            try:
+                stats = await anyio.to_thread.run_sync(self.compute)
+            except Exception:
+                logger.exception("Stats broadcast tick failed")
+            else:
+                self.publish(stats)
+            await asyncio.sleep(max(0.0, self.interval_sec - (time.monotonic() - started)))
+
+    async def stream(self, is_disconnected: Callable[[], Any]) -> AsyncIterator[str]:
+        q = self.subscribe()
+        try:
+            yield f"retry: {int(self.interval_sec * 1000) * 3}\n\n"
+            while True:
+                try:
+                    event, payload = await asyncio.wait_for(q.get(), timeout=self.heartbeat_sec)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event, payload)
+        finally:
+            self.unsubscribe(q)
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_SHARED = "shared"
+
+
+class _Flight:
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightCache:
+    def __init__(self, ttl_sec: float, max_entries: int = 256):
+        self.ttl_sec = float(ttl_sec)
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def get(self, key: Hashable, compute: Callable[[], Any], fresh: bool = False) -> Tuple[Any, str, float]:
+        requested_at = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not fresh and requested_at - entry[0] < self.ttl_sec:
+                self._entries.move_to_end(key)
+                return entry[1], CACHE_HIT, requested_at - entry[0]
+            flight = self._flights.get(key)
+            leader = flight is None or (fresh and flight.started_at < requested_at)
+            if leader:
+                flight = _Flight(requested_at)
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, CACHE_SHARED, time.monotonic() - flight.started_at
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if flight.error is None:
+                    current = self._entries.get(key)
+                    if current is None or current[0] <= flight.started_at:
+                        self._store(key, flight.started_at, flight.value)
+            flight.done.set()
+        return flight.value, CACHE_MISS, 0.0
+
+    def _store(self, key: Hashable, stored_at: float, value: Any) -> None:
+        now = time.monotonic()
+        for stale in [k for k, (at, _) in self._entries.items() if now - at >= self.ttl_sec]:
+            del self._entries[stale]
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
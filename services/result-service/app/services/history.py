@@ -0,0 +1,174 @@
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.task import Task, TaskStatus
+from app.services.latency import GAMMA, LATENCY_METRICS, HistogramKey, live_histograms, summarize_histograms
+from app.services.stats_service import TYPE_FIELDS, live_aggregates, summarize_aggregates
+from app.services.timeseries import _naive_utc
+from common.db.archive import PARTITION_FIELD, TERMINAL_STATUSES, open_archive
+
+ARCHIVE_COLUMNS = ["task_type", "status", "created_at", "dispatched_at", "started_at", "finished_at"]
+ARCHIVE_LATENCIES = {metric: (end.name, start.name) for metric, (end, start) in LATENCY_METRICS.items()}
+SCAN_BATCH_ROWS = 64 * 1024
+LOG_GAMMA = math.log(GAMMA)
+
+Aggregates = Dict[str, Any]
+Histograms = Dict[HistogramKey, Dict[int, int]]
+
+
+def _seconds(end: pa.ChunkedArray, start: pa.ChunkedArray) -> pa.ChunkedArray:
+    micros = pc.cast(pc.subtract(end, start), pa.int64())
+    return pc.divide(pc.cast(micros, pa.float64()), 1e6)
+
+
+def _bucket(seconds: pa.ChunkedArray) -> pa.ChunkedArray:
+    ms = pc.max_element_wise(pc.multiply(seconds, 1000.0), 1e-9, skip_nulls=False)
+    index = pc.max_element_wise(pc.ceil(pc.divide(pc.ln(ms), LOG_GAMMA)), 0.0, skip_nulls=False)
+    return pc.cast(index, pa.int64())
+
+
+def _archive_filter(
+    start: Optional[datetime], end: Optional[datetime], run_id: Optional[str]
+) -> Optional[ds.Expression]:
+    clauses = []
+    if run_id is not None:
+        clauses.append(ds.field("run_id") == run_id)
+    if start is not None:
+        clauses.append(ds.field(PARTITION_FIELD) >= start.date().isoformat())
+        clauses.append(ds.field("finished_at") >= pa.scalar(start, pa.timestamp("us")))
+    if end is not None:
+        clauses.append(ds.field(PARTITION_FIELD) <= end.date().isoformat())
+        clauses.append(ds.field("finished_at") < pa.scalar(end, pa.timestamp("us")))
+    expr = None
+    for clause in clauses:
+        expr = clause if expr is None else expr & clause
+    return expr
+
+
+def _table_aggregates(table: pa.Table) -> Aggregates:
+    status_counts = {
+        row["status"]: row["status_count"]
+        for row in table.group_by("status").aggregate([("status", "count")]).to_pylist()
+    }
+    done = pc.equal(table["status"], TaskStatus.COMPLETED.value)
+    work = pa.table(
+        {
+            "task_type": table["task_type"],
+            "wait": _seconds(table["started_at"], table["created_at"]),
+            "run": _seconds(table["finished_at"], table["started_at"]),
+            "done": pc.cast(done, pa.int64()),
+            "done_at": pc.if_else(done, table["finished_at"], pa.scalar(None, pa.timestamp("us"))),
+        }
+    )
+    grouped = work.group_by("task_type").aggregate(
+        [
+            ("wait", "sum"),
+            ("wait", "count"),
+            ("run", "sum"),
+            ("run", "count"),
+            ("done", "sum"),
+            ("done_at", "min"),
+            ("done_at", "max"),
+        ]
+    )
+    names = ["wait_sum", "wait_count", "run_sum", "run_count", "done_sum", "done_at_min", "done_at_max"]
+    by_type = {
+        row["task_type"]: dict(zip(TYPE_FIELDS, (row[n] for n in names))) for row in grouped.to_pylist()
+    }
+    return {"status_counts": status_counts, "by_type": by_type}
+
+
+def _table_histograms(table: pa.Table) -> Histograms:
+    out: Histograms = defaultdict(dict)
+    for metric, (end, start) in ARCHIVE_LATENCIES.items():
+        buckets = pa.table({"task_type": table["task_type"], "bucket": _bucket(_seconds(table[end], table[start]))})
+        rows = buckets.filter(pc.is_valid(buckets["bucket"])).group_by(["task_type", "bucket"]).aggregate(
+            [("bucket", "count")]
+        )
+        for row in rows.to_pylist():
+            out[(row["task_type"], metric)][row["bucket"]] = row["bucket_count"]
+    return out
+
+
+def merge_aggregates(into: Aggregates, other: Aggregates) -> None:
+    for status, count in other["status_counts"].items():
+        into["status_counts"][status] = into["status_counts"].get(status, 0) + int(count)
+    for task_type, agg in other["by_type"].items():
+        current = into["by_type"].setdefault(task_type, dict.fromkeys(TYPE_FIELDS))
+        for field in TYPE_FIELDS:
+            a, b = current[field], agg.get(field)
+            if a is None or b is None:
+                current[field] = b if a is None else a
+            elif field == "completed_first_finished_at":
+                current[field] = min(a, b)
+            elif field == "completed_last_finished_at":
+                current[field] = max(a, b)
+            elif field.endswith("_count"):
+                current[field] = int(a) + int(b)
+            else:
+                current[field] = float(a) + float(b)
+
+
+def merge_histograms(into: Histograms, other: Histograms) -> None:
+    for key, buckets in other.items():
+        target = into.setdefault(key, {})
+        for index, count in buckets.items():
+            target[int(index)] = target.get(int(index), 0) + int(count)
+
+
+def get_history_stats(
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_live: bool = True,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    start = _naive_utc(start) if start is not None else None
+    end = _naive_utc(end) if end is not None else None
+    if start is not None and end is not None and start >= end:
+        raise ValueError("from must be earlier than to")
+
+    aggregates: Aggregates = {"status_counts": {}, "by_type": {}}
+    histograms: Histograms = {}
+    sources = {"archive_files": 0, "archive_rows": 0, "live_rows": 0}
+
+    dataset = open_archive(get_settings().archive_dir)
+    if dataset is not None:
+        expr = _archive_filter(start, end, run_id)
+        sources["archive_files"] = sum(1 for _ in dataset.get_fragments(filter=expr))
+        for batch in dataset.to_batches(columns=ARCHIVE_COLUMNS, filter=expr, batch_size=SCAN_BATCH_ROWS):
+            if not batch.num_rows:
+                continue
+            table = pa.Table.from_batches([batch])
+            merge_aggregates(aggregates, _table_aggregates(table))
+            merge_histograms(histograms, _table_histograms(table))
+            sources["archive_rows"] += batch.num_rows
+
+    if include_live:
+        filters = [Task.status.in_(TERMINAL_STATUSES), Task.finished_at.isnot(None)]
+        if run_id is not None:
+            filters.append(Task.run_id == run_id)
+        if start is not None:
+            filters.append(Task.finished_at >= start)
+        if end is not None:
+            filters.append(Task.finished_at < end)
+        live = live_aggregates(db, *filters)
+        sources["live_rows"] = sum(live["status_counts"].values())
+        merge_aggregates(aggregates, live)
+        merge_histograms(histograms, live_histograms(db, *filters))
+
+    summary = summarize_aggregates(aggregates)
+    summary["latency_percentiles_sec"] = summarize_histograms(histograms)
+    summary["from"] = start.isoformat() if start is not None else None
+    summary["to"] = end.isoformat() if end is not None else None
+    summary["run_id"] = run_id
+    summary["sources"] = sources
+    return summary
@@ -0,0 +1,132 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskType
+from common.models.stats import TaskLatencyHistogram
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+PERCENTILES = (50, 90, 95, 99)
+
+LATENCY_METRICS = {
+    "queue_wait": (Task.dispatched_at, Task.created_at),
+    "dispatch_to_start": (Task.started_at, Task.dispatched_at),
+    "run": (Task.finished_at, Task.started_at),
+}
+
+HistogramKey = Tuple[str, str]
+
+
+class LogHistogram:
+    def __init__(self, gamma: float = GAMMA):
+        self.gamma = gamma
+        self._log_gamma = math.log(gamma)
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+
+    def index(self, seconds: float) -> int:
+        return max(0, math.ceil(math.log(max(seconds * 1000.0, 1e-9)) / self._log_gamma))
+
+    def value(self, index: int) -> float:
+        return 2.0 * self.gamma ** index / (1.0 + self.gamma) / 1000.0
+
+    def add(self, seconds: float, count: int = 1) -> None:
+        self.add_bucket(self.index(seconds), count)
+
+    def add_bucket(self, index: int, count: int) -> None:
+        self.counts[int(index)] += int(count)
+        self.total += int(count)
+
+    def merge(self, other: "LogHistogram") -> None:
+        for index, count in other.counts.items():
+            self.add_bucket(index, count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.total <= 0:
+            return None
+        rank = q * (self.total - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                return self.value(index)
+        return self.value(max(self.counts))
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"count": self.total}
+        for p in PERCENTILES:
+            out[f"p{p}"] = self.quantile(p / 100.0)
+        live = [i for i, c in self.counts.items() if c > 0]
+        out["max"] = self.value(max(live)) if live else None
+        return out
+
+
+def seconds_between(db: Session, end, start):
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400.0
+    return func.extract("epoch", end - start)
+
+
+def rollup_histograms(db: Session) -> Dict[HistogramKey, Dict[int, int]]:
+    H = TaskLatencyHistogram
+    rows = (
+        db.query(H.task_type, H.metric, H.bucket, func.sum(H.count))
+        .group_by(H.task_type, H.metric, H.bucket)
+        .all()
+    )
+    out: Dict[HistogramKey, Dict[int, int]] = defaultdict(dict)
+    for task_type, metric, bucket, count in rows:
+        if count:
+            out[(task_type, metric)][int(bucket)] = int(count)
+    return dict(out)
+
+
+def live_histograms(db: Session, *filters) -> Dict[HistogramKey, Dict[int, int]]:
+    out: Dict[HistogramKey, Dict[int, int]] = defaultdict(dict)
+    if db.get_bind().dialect.name == "postgresql":
+        for metric, (end, start) in LATENCY_METRICS.items():
+            bucket = func.task_latency_bucket(seconds_between(db, end, start))
+            rows = (
+                db.query(Task.task_type, bucket, func.count())
+                .filter(end.isnot(None), start.isnot(None), *filters)
+                .group_by(Task.task_type, bucket)
+                .all()
+            )
+            for task_type, index, count in rows:
+                out[(task_type.value, metric)][int(index)] = int(count)
+        return dict(out)
+
+    sketch = LogHistogram()
+    for metric, (end, start) in LATENCY_METRICS.items():
+        rows = (
+            db.query(Task.task_type, seconds_between(db, end, start))
+            .filter(end.isnot(None), start.isnot(None), *filters)
+            .execution_options(yield_per=5000)
+        )
+        for task_type, seconds in rows:
+            buckets = out[(task_type.value, metric)]
+            index = sketch.index(float(seconds))
+            buckets[index] = buckets.get(index, 0) + 1
+    return dict(out)
+
+
+def summarize_histograms(histograms: Dict[HistogramKey, Dict[int, int]]) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for task_type in TaskType:
+        out[task_type.value] = {}
+        for metric in LATENCY_METRICS:
+            sketch = LogHistogram()
+            for index, count in histograms.get((task_type.value, metric), {}).items():
+                sketch.add_bucket(index, count)
+            out[task_type.value][metric] = sketch.summary()
+    return out
+
+
+def iter_histogram_rows(histograms: Dict[HistogramKey, Dict[int, int]]) -> Iterable[Tuple[str, str, int, int]]:
+    for (task_type, metric), buckets in histograms.items():
+        for index, count in buckets.items():
+            yield task_type, metric, index, count
@@ -0,0 +1,121 @@
+import argparse
+import json
+import time
+from numbers import Number
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.services.latency import iter_histogram_rows, live_histograms, rollup_histograms
+from app.services.stats_service import (
+    TYPE_FIELDS,
+    live_aggregates,
+    rollup_aggregates,
+    rollups_supported,
+)
+from common.models.stats import TaskLatencyHistogram, TaskStatusCount, TaskTypeStats
+
+
+def _differs(expected: Any, actual: Any) -> bool:
+    if isinstance(expected or 0, Number) and isinstance(actual or 0, Number):
+        e, a = float(expected or 0), float(actual or 0)
+        return abs(e - a) > 1e-6 * max(1.0, abs(e))
+    return expected != actual
+
+
+def find_drift(expected: Dict[str, Any], actual: Dict[str, Any]) -> List[Dict[str, Any]]:
+    drift: List[Dict[str, Any]] = []
+    statuses = set(expected["status_counts"]) | set(actual["status_counts"])
+    for status in sorted(statuses):
+        e = expected["status_counts"].get(status, 0)
+        a = actual["status_counts"].get(status, 0)
+        if e != a:
+            drift.append({"key": f"status:{status}", "expected": e, "actual": a})
+    types = set(expected["by_type"]) | set(actual["by_type"])
+    for task_type in sorted(types):
+        e_row = expected["by_type"].get(task_type, {})
+        a_row = actual["by_type"].get(task_type, {})
+        for field in TYPE_FIELDS:
+            e, a = e_row.get(field), a_row.get(field)
+            if _differs(e, a):
+                drift.append({"key": f"type:{task_type}:{field}", "expected": e, "actual": a})
+    for key in sorted(set(expected["latency"]) | set(actual["latency"])):
+        e_buckets = expected["latency"].get(key, {})
+        a_buckets = actual["latency"].get(key, {})
+        for index in sorted(set(e_buckets) | set(a_buckets)):
+            e, a = e_buckets.get(index, 0), a_buckets.get(index, 0)
+            if e != a:
+                drift.append({"key": f"latency:{key[0]}:{key[1]}:{index}", "expected": e, "actual": a})
+    return drift
+
+
+def _live(db: Session) -> Dict[str, Any]:
+    out = live_aggregates(db)
+    out["latency"] = live_histograms(db)
+    return out
+
+
+def _rollups(db: Session) -> Dict[str, Any]:
+    out = rollup_aggregates(db, resolve_stale=False)
+    out["latency"] = rollup_histograms(db)
+    return out
+
+
+def check_drift(db: Session) -> Dict[str, Any]:
+    if not rollups_supported(db):
+        return {"supported": False, "in_sync": None, "drift": []}
+    with db.get_bind().connect() as conn:
+        conn.execution_options(isolation_level="REPEATABLE READ")
+        with Session(bind=conn) as snapshot:
+            drift = find_drift(_live(snapshot), _rollups(snapshot))
+    return {"supported": True, "in_sync": not drift, "drift": drift}
+
+
+def rebuild_rollups(db: Session) -> Dict[str, Any]:
+    if not rollups_supported(db):
+        return {"supported": False, "rebuilt": False, "drift": []}
+    db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    expected = _live(db)
+    drift = find_drift(expected, _rollups(db))
+    db.query(TaskStatusCount).delete()
+    db.query(TaskTypeStats).delete()
+    db.query(TaskLatencyHistogram).delete()
+    for status, count in expected["status_counts"].items():
+        db.add(TaskStatusCount(status=status, shard=0, count=count))
+    for task_type, agg in expected["by_type"].items():
+        db.add(TaskTypeStats(task_type=task_type, shard=0, **agg))
+    for task_type, metric, index, count in iter_histogram_rows(expected["latency"]):
+        db.add(TaskLatencyHistogram(task_type=task_type, metric=metric, shard=0, bucket=index, count=count))
+    db.commit()
+    return {"supported": True, "rebuilt": True, "drift": drift}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or rebuild task stats rollups")
+    parser.add_argument("command", choices=["check", "rebuild", "reconcile"])
+    parser.add_argument("--interval", type=float, default=0.0, help="Repeat every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        db = SessionLocal()
+        try:
+            if args.command == "check":
+                report = check_drift(db)
+            elif args.command == "rebuild":
+                report = rebuild_rollups(db)
+            else:
+                report = check_drift(db)
+                if report["drift"]:
+                    report = rebuild_rollups(db)
+        finally:
+            db.close()
+        print(json.dumps(report, default=str), flush=True)
+        if args.interval <= 0:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,152 @@
-from collections import Counter
-from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.task import Task, TaskStatus, TaskType
+from app.services.latency import live_histograms, rollup_histograms, seconds_between, summarize_histograms
+from common.models.stats import TaskStatusCount, TaskTypeStats
 
+TYPE_FIELDS = (
+    "wait_sum_sec",
+    "wait_count",
+    "run_sum_sec",
+    "run_count",
+    "completed_count",
+    "completed_first_finished_at",
+    "completed_last_finished_at",
+)
 
-def get_summary_stats(db: Session) -> Dict:
-    tasks = db.query(Task).all()
-    total_tasks = len(tasks)
 
-    status_counts = Counter(t.status.value for t in tasks)
+def rollups_supported(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
 
-    wait_times = []
-    run_times_by_type = {t.value: [] for t in TaskType}
-    finished_times = []
 
-    for t in tasks:
-        if t.created_at and t.started_at:
-            wait_times.append((t.started_at - t.created_at).total_seconds())
+def live_aggregates(db: Session, *filters) -> Dict[str, Any]:
+    status_counts = {
+        status.value: int(count)
+        for status, count in db.query(Task.status, func.count()).filter(*filters).group_by(Task.status).all()
+    }
 
-        if t.started_at and t.finished_at:
-            run_times_by_type[t.task_type.value].append(
-                (t.finished_at - t.started_at).total_seconds()
-            )
-            finished_times.append(t.finished_at)
+    wait = seconds_between(db, Task.started_at, Task.created_at)
+    run = seconds_between(db, Task.finished_at, Task.started_at)
+    done = (Task.status == TaskStatus.COMPLETED) & Task.finished_at.isnot(None)
+    rows = (
+        db.query(
+            Task.task_type,
+            func.coalesce(func.sum(wait), 0.0),
+            func.count(wait),
+            func.coalesce(func.sum(run), 0.0),
+            func.count(run),
+            func.sum(case((done, 1), else_=0)),
+            func.min(case((done, Task.finished_at))),
+            func.max(case((done, Task.finished_at))),
+        )
+        .filter(*filters)
+        .group_by(Task.task_type)
+        .all()
+    )
+    by_type = {row[0].value: dict(zip(TYPE_FIELDS, row[1:])) for row in rows}
+    return {"status_counts": status_counts, "by_type": by_type}
 
-    avg_wait_time_sec: Optional[float] = None
-    if wait_times:
-        avg_wait_time_sec = sum(wait_times) / len(wait_times)
 
-    avg_run_time_sec_by_type: Dict[str, Optional[float]] = {}
-    for type_name, values in run_times_by_type.items():
-        if values:
-            avg_run_time_sec_by_type[type_name] = sum(values) / len(values)
-        else:
-            avg_run_time_sec_by_type[type_name] = None
+def _completed_bounds(db: Session, task_type: str) -> Dict[str, Any]:
+    first, last = (
+        db.query(func.min(Task.finished_at), func.max(Task.finished_at))
+        .filter(
+            Task.task_type == TaskType(task_type),
+            Task.status == TaskStatus.COMPLETED,
+            Task.finished_at.isnot(None),
+        )
+        .one()
+    )
+    return {"completed_first_finished_at": first, "completed_last_finished_at": last}
+
+
+def rollup_aggregates(db: Session, resolve_stale: bool = True) -> Dict[str, Any]:
+    status_counts = {
+        status: int(count)
+        for status, count in db.query(TaskStatusCount.status, func.sum(TaskStatusCount.count))
+        .group_by(TaskStatusCount.status)
+        .all()
+        if count
+    }
+    S = TaskTypeStats
+    rows = (
+        db.query(
+            S.task_type,
+            func.sum(S.wait_sum_sec),
+            func.sum(S.wait_count),
+            func.sum(S.run_sum_sec),
+            func.sum(S.run_count),
+            func.sum(S.completed_count),
+            func.min(S.completed_first_finished_at),
+            func.max(S.completed_last_finished_at),
+            func.bool_or(S.completed_bounds_stale),
+        )
+        .group_by(S.task_type)
+        .all()
+    )
+    by_type = {row[0]: dict(zip(TYPE_FIELDS, row[1:-1])) for row in rows}
+    if resolve_stale:
+        for row in rows:
+            if row[-1]:
+                by_type[row[0]].update(_completed_bounds(db, row[0]))
+    return {"status_counts": status_counts, "by_type": by_type}
+
+
+def summarize_aggregates(aggregates: Dict[str, Any]) -> Dict:
+    status_counts = aggregates["status_counts"]
+    total_tasks = sum(status_counts.values())
+
+    wait_sum = 0.0
+    wait_count = 0
+    completed = 0
+    start = None
+    end = None
+    avg_run_time_sec_by_type: Dict[str, Optional[float]] = {t.value: None for t in TaskType}
+    for type_name, agg in aggregates["by_type"].items():
+        wait_sum += float(agg["wait_sum_sec"] or 0.0)
+        wait_count += int(agg["wait_count"] or 0)
+        if agg["run_count"]:
+            avg_run_time_sec_by_type[type_name] = float(agg["run_sum_sec"]) / int(agg["run_count"])
+        if agg["completed_count"]:
+            completed += int(agg["completed_count"])
+            first, last = agg["completed_first_finished_at"], agg["completed_last_finished_at"]
+            if first is not None:
+                start = first if start is None else min(start, first)
+            if last is not None:
+                end = last if end is None else max(end, last)
+
+    avg_wait_time_sec: Optional[float] = None
+    if wait_count:
+        avg_wait_time_sec = wait_sum / wait_count
 
     throughput_tasks_per_min: Optional[float] = None
-    completed = [t for t in tasks if t.status == TaskStatus.COMPLETED and t.finished_at]
-    if completed:
-        finished_sorted = sorted(t.finished_at for t in completed)
-        start = finished_sorted[0]
-        end = finished_sorted[-1]
+    if completed and start is not None and end is not None:
         delta_sec = max((end - start).total_seconds(), 0.0)
         if delta_sec > 0:
-            throughput_tasks_per_min = len(completed) / (delta_sec / 60.0)
+            throughput_tasks_per_min = completed / (delta_sec / 60.0)
 
     return {
         "total_tasks": total_tasks,
-        "status_counts": dict(status_counts),
+        "status_counts": status_counts,
         "avg_wait_time_sec": avg_wait_time_sec,
         "avg_run_time_sec_by_type": avg_run_time_sec_by_type,
         "throughput_tasks_per_min": throughput_tasks_per_min,
     }
+
+
+def get_summary_stats(db: Session, run_id: Optional[str] = None) -> Dict:
+    if run_id is None and get_settings().stats_use_rollups and rollups_supported(db):
+        summary = summarize_aggregates(rollup_aggregates(db))
+        histograms = rollup_histograms(db)
+    else:
+        filters = [Task.run_id == run_id] if run_id is not None else []
+        summary = summarize_aggregates(live_aggregates(db, *filters))
+        histograms = live_histograms(db, *filters)
+    summary["latency_percentiles_sec"] = summarize_histograms(histograms)
+    if run_id is not None:
+        summary["run_id"] = run_id
+    return summary
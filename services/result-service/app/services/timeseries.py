@@ -0,0 +1,148 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.task import Task, TaskStatus, TaskType
+from app.services.latency import LogHistogram, seconds_between
+
+MAX_BUCKETS = 10_000
+SERIES_PERCENTILES = (50, 95, 99)
+SERIES_LATENCIES = ("time_to_start", "run")
+COUNT_FIELDS = ("arrivals", "completions", "failures", "backlog")
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def resolve_window(
+    start: Optional[datetime], end: Optional[datetime], bucket_sec: int
+) -> Tuple[datetime, datetime, int]:
+    if bucket_sec < 1:
+        raise ValueError("bucket must be at least 1 second")
+    end = _naive_utc(end) if end is not None else datetime.utcnow()
+    start = _naive_utc(start) if start is not None else end - timedelta(hours=1)
+    if start >= end:
+        raise ValueError("from must be earlier than to")
+    n = int(((end - start).total_seconds() + bucket_sec - 1) // bucket_sec)
+    if n > MAX_BUCKETS:
+        raise ValueError(f"window has {n} buckets, limit is {MAX_BUCKETS}")
+    return start, end, n
+
+
+def _bucket(db: Session, column, start: datetime, bucket_sec: int):
+    return func.floor(seconds_between(db, column, literal(start)) / bucket_sec)
+
+
+def _counts(db: Session, column, start: datetime, end: datetime, bucket_sec: int, *filters):
+    b = _bucket(db, column, start, bucket_sec)
+    return (
+        db.query(Task.task_type, b, func.count())
+        .filter(column >= start, column < end, *filters)
+        .group_by(Task.task_type, b)
+        .all()
+    )
+
+
+def _percentile_rows(db: Session, start: datetime, end: datetime, bucket_sec: int, *filters) -> List[Tuple]:
+    b = _bucket(db, Task.finished_at, start, bucket_sec)
+    to_start = seconds_between(db, Task.started_at, Task.created_at)
+    run = seconds_between(db, Task.finished_at, Task.started_at)
+    window = (Task.finished_at >= start, Task.finished_at < end, Task.started_at.isnot(None), *filters)
+    if db.get_bind().dialect.name == "postgresql":
+        columns = [
+            func.percentile_disc(p / 100.0).within_group(expr)
+            for expr in (to_start, run)
+            for p in SERIES_PERCENTILES
+        ]
+        return db.query(Task.task_type, b, *columns).filter(*window).group_by(Task.task_type, b).all()
+
+    sketches: Dict[Tuple[Any, int], Tuple[LogHistogram, LogHistogram]] = defaultdict(
+        lambda: (LogHistogram(), LogHistogram())
+    )
+    rows = db.query(Task.task_type, b, to_start, run).filter(*window).execution_options(yield_per=5000)
+    for task_type, index, s, r in rows:
+        start_sketch, run_sketch = sketches[(task_type, int(index))]
+        start_sketch.add(float(s))
+        run_sketch.add(float(r))
+    out = []
+    for (task_type, index), pair in sketches.items():
+        values = [s.quantile(p / 100.0) for s in pair for p in SERIES_PERCENTILES]
+        out.append((task_type, index, *values))
+    return out
+
+
+def _initial_backlog(db: Session, start: datetime, *filters) -> Dict[str, int]:
+    lookback_hours = get_settings().stats_backlog_lookback_hours
+    if lookback_hours > 0:
+        filters = (Task.created_at >= start - timedelta(hours=lookback_hours), *filters)
+    rows = (
+        db.query(Task.task_type, func.count())
+        .filter(
+            Task.created_at < start,
+            or_(Task.finished_at.is_(None), Task.finished_at >= start),
+            *filters,
+        )
+        .group_by(Task.task_type)
+        .all()
+    )
+    return {task_type.value: int(count) for task_type, count in rows}
+
+
+def get_timeseries(
+    db: Session,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket_sec: int = 60,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    filters = [Task.run_id == run_id] if run_id is not None else []
+    if run_id is not None and start is None:
+        start = db.query(func.min(Task.created_at)).filter(*filters).scalar()
+    start, end, n = resolve_window(start, end, bucket_sec)
+
+    latency_fields = [f"{m}_p{p}" for m in SERIES_LATENCIES for p in SERIES_PERCENTILES]
+    series: Dict[str, Dict[str, List[Any]]] = {}
+    for t in TaskType:
+        series[t.value] = {f: [0] * n for f in COUNT_FIELDS}
+        series[t.value].update({f: [None] * n for f in latency_fields})
+
+    def put(rows, field):
+        for task_type, index, count in rows:
+            i = int(index)
+            if 0 <= i < n:
+                series[task_type.value][field][i] += int(count)
+
+    put(_counts(db, Task.created_at, start, end, bucket_sec, *filters), "arrivals")
+    completed, failed = Task.status == TaskStatus.COMPLETED, Task.status == TaskStatus.FAILED
+    put(_counts(db, Task.finished_at, start, end, bucket_sec, completed, *filters), "completions")
+    put(_counts(db, Task.finished_at, start, end, bucket_sec, failed, *filters), "failures")
+
+    for row in _percentile_rows(db, start, end, bucket_sec, *filters):
+        task_type, i = row[0], int(row[1])
+        if not 0 <= i < n:
+            continue
+        for name, value in zip(latency_fields, row[2:]):
+            series[task_type.value][name][i] = float(value) if value is not None else None
+
+    initial = _initial_backlog(db, start, *filters)
+    for type_name, s in series.items():
+        backlog = initial.get(type_name, 0)
+        for i in range(n):
+            backlog += s["arrivals"][i] - s["completions"][i] - s["failures"][i]
+            s["backlog"][i] = backlog
+
+    return {
+        "run_id": run_id,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "bucket_sec": bucket_sec,
+        "buckets": [(start + timedelta(seconds=i * bucket_sec)).isoformat() for i in range(n)],
+        "by_type": series,
+    }
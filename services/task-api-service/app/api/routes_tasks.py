@@ -1,10 +1,10 @@
 # app/api/routes_tasks.py
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import SessionLocal, engine, get_db, get_read_db
 from app.schemas.task import TaskCreate, TaskRead
 from app.services.task_service import create_task, get_task, list_tasks
 
@@ -12,14 +12,24 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task_endpoint(task_in: TaskCreate, db: Session = Depends(get_db)):
-    task = create_task(db, task_in)
+def create_task_endpoint(
+    task_in: TaskCreate,
+    db: Session = Depends(get_db),
+    traceparent: Optional[str] = Header(default=None),
+):
+    task = create_task(db, task_in, traceparent=traceparent)
     return task
 
 
 @router.get("/{task_id}", response_model=TaskRead)
-def get_task_endpoint(task_id: str, db: Session = Depends(get_db)):
+def get_task_endpoint(task_id: str, db: Session = Depends(get_read_db)):
     task = get_task(db, task_id)
+    if not task and db.get_bind() is not engine:
+        primary = SessionLocal()
+        try:
+            task = get_task(primary, task_id)
+        finally:
+            primary.close()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     return task
@@ -29,7 +39,8 @@ def get_task_endpoint(task_id: str, db: Session = Depends(get_db)):
 def list_tasks_endpoint(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    run_id: Optional[str] = None,
+    db: Session = Depends(get_read_db),
 ):
-    tasks = list_tasks(db, skip=skip, limit=limit)
+    tasks = list_tasks(db, skip=skip, limit=limit, run_id=run_id)
     return tasks
@@ -1,9 +1,9 @@
 from functools import lru_cache
 
-from pydantic_settings import BaseSettings
+from common.db.config import DatabaseSettings
 
 
-class Settings(BaseSettings):
+class Settings(DatabaseSettings):
     database_url: str
 
 
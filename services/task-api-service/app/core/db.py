@@ -1,27 +1,27 @@
 # app/core/db.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from common.db.base import Base
+from common.db.engine import create_db_engine, create_session_factory
+from common.db.replica import ReplicaRouter, create_read_engine, create_read_session_factory
+from common.observability.metrics import instrument_engine, register_collector
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+engine = create_db_engine(settings, application_name="task-api")
+instrument_engine(engine, "task-api")
 
-class Base(DeclarativeBase):
+read_engine = create_read_engine(settings, application_name="task-api-read")
+if read_engine is not None:
+    instrument_engine(read_engine, "task-api-replica")
 
-    pass
-
-
-engine = create_engine(
-    settings.database_url,
-    echo=False,
+replica_router = ReplicaRouter(
+    engine, read_engine, settings.db_replica_max_lag_sec, settings.db_replica_lag_check_sec
 )
+register_collector(lambda: replica_router.collect("task-api"))
 
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-)
+SessionLocal = create_session_factory(engine)
+ReadSessionLocal = create_read_session_factory(replica_router)
 
 
 def get_db():
@@ -30,3 +30,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
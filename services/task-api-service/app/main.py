@@ -1,9 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 
-from app.core.db import Base, engine
+from app.core.config import get_settings
+from app.core.db import engine, replica_router
+from common.db.engine import pool_stats
+from common.observability.metrics import HttpMetricsMiddleware, render_metrics
+from common.observability.profiling import TOKEN_HEADER, build_controller
+from common.db.migrate import upgrade_schema
 from app.api.routes_tasks import router as tasks_router
 
-Base.metadata.create_all(bind=engine)
+if get_settings().db_auto_migrate:
+    upgrade_schema(engine)
 
 app = FastAPI(
     title="Task API Service",
@@ -16,4 +22,34 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/db-pool")
+def db_pool_health():
+    return pool_stats(engine)
+
+
+@app.get("/health/db-replica")
+def db_replica_health():
+    return replica_router.status()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+profiling = build_controller("task-api")
+
+
+@app.api_route("/debug/{path:path}", methods=["GET", "POST"], include_in_schema=False)
+def debug(path: str, request: Request):
+    status, content_type, body = profiling.handle(
+        request.method, path, dict(request.query_params), request.headers.get(TOKEN_HEADER)
+    )
+    return Response(content=body, status_code=status, media_type=content_type)
+
+
+app.add_middleware(HttpMetricsMiddleware, service="task-api")
+
+
 app.include_router(tasks_router)
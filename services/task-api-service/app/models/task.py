@@ -1,41 +1,4 @@
 # app/models/task.py
-import enum
-import uuid
-from datetime import datetime
+from common.models.task import Task, TaskStatus, TaskType
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String, Text
-
-from app.core.db import Base
-
-
-class TaskType(str, enum.Enum):
-    CPU_INTENSIVE = "CPU_INTENSIVE"
-    MEMORY_INTENSIVE = "MEMORY_INTENSIVE"
-
-
-class TaskStatus(str, enum.Enum):
-    PENDING = "PENDING"
-    DISPATCHED = "DISPATCHED"
-    RUNNING = "RUNNING"
-    COMPLETED = "COMPLETED"
-    FAILED = "FAILED"
-
-
-class Task(Base):
-    __tablename__ = "tasks"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-
-    task_type = Column(Enum(TaskType), nullable=False, index=True)
-    status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING, index=True)
-
-    complexity = Column(Integer, nullable=False)
-    expected_duration_sec = Column(Integer, nullable=True)
-    payload_size_kb = Column(Integer, nullable=True)
-
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    dispatched_at = Column(DateTime, nullable=True)
-    started_at = Column(DateTime, nullable=True)
-    finished_at = Column(DateTime, nullable=True)
-
-    error_message = Column(Text, nullable=True)
+__all__ = ["Task", "TaskStatus", "TaskType"]
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.task import TaskStatus, TaskType
 
@@ -10,8 +10,10 @@ from app.models.task import TaskStatus, TaskType
 class TaskBase(BaseModel):
     task_type: TaskType
     complexity: int
+    kernel: Optional[str] = None
     expected_duration_sec: Optional[int] = None
     payload_size_kb: Optional[int] = None
+    run_id: Optional[str] = Field(default=None, max_length=64)
 
 
 class TaskCreate(TaskBase):
@@ -26,6 +28,8 @@ class TaskRead(TaskBase):
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    result: Optional[str] = None
+    trace_id: Optional[str] = None
 
     class Config:
         orm_mode = True
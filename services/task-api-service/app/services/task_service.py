@@ -1,24 +1,46 @@
 # app/services/task_service.py
+import time
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.task import Task, TaskStatus
 from app.schemas.task import TaskCreate
+from common.observability.tracing import get_tracer, new_trace_id, parse_traceparent, root_span_id
 
 
-def create_task(db: Session, task_in: TaskCreate) -> Task:
+def create_task(db: Session, task_in: TaskCreate, traceparent: Optional[str] = None) -> Task:
 
+    tracer = get_tracer("task-api")
+    parent = parse_traceparent(traceparent)
+    sampled = (tracer.enabled and parent[2]) if parent else tracer.sample()
+    trace_id = (parent[0] if parent else new_trace_id()) if sampled else None
+
+    start = time.time_ns()
     db_task = Task(
         task_type=task_in.task_type,
         complexity=task_in.complexity,
+        kernel=task_in.kernel,
         expected_duration_sec=task_in.expected_duration_sec,
         payload_size_kb=task_in.payload_size_kb,
         status=TaskStatus.PENDING,
+        trace_id=trace_id,
+        run_id=task_in.run_id,
     )
     db.add(db_task)
     db.commit()
+    end = time.time_ns()
     db.refresh(db_task)
+    if trace_id:
+        tracer.record(
+            "task.insert",
+            trace_id,
+            start,
+            end,
+            parent_id=parent[1] if parent else None,
+            span_id=root_span_id(trace_id),
+            **{"task.id": db_task.id, "task.type": task_in.task_type.value, "run.id": task_in.run_id},
+        )
     return db_task
 
 
@@ -27,6 +49,9 @@ def get_task(db: Session, task_id: str) -> Optional[Task]:
     return db.query(Task).filter(Task.id == task_id).first()
 
 
-def list_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[Task]:
+def list_tasks(db: Session, skip: int = 0, limit: int = 100, run_id: Optional[str] = None) -> List[Task]:
 
-    return db.query(Task).offset(skip).limit(limit).all()
+    query = db.query(Task)
+    if run_id is not None:
+        query = query.filter(Task.run_id == run_id).order_by(Task.created_at)
+    return query.offset(skip).limit(limit).all()
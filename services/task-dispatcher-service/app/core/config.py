@@ -1,14 +1,19 @@
 from functools import lru_cache
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import SettingsConfigDict
 
+from common.db.config import DatabaseSettings
 
-class Settings(BaseSettings):
+
+class Settings(DatabaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_url: str = "sqlite:///./test.db"
+    db_pool_size: int = 2
+    db_max_overflow: int = 1
     poll_interval_sec: int = 1
     batch_size: int = 30
+    metrics_port: int = 9100
 
 
 @lru_cache
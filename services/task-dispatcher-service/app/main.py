@@ -1,18 +1,57 @@
+import logging
 import time
 
+from prometheus_client import Counter, Histogram
+
 from app.core.config import get_settings
-from app.core.db import SessionLocal, Base, engine
+from app.core.db import SessionLocal, engine
 from app.services.dispatcher import dispatch_pending_tasks
+from common.db.archive import start_archiver
+from common.db.migrate import upgrade_schema
+from common.db.partitions import maintain_partitions
+from common.observability.metrics import LATENCY_BUCKETS, start_metrics_server
+from common.observability.profiling import build_controller, start_profiling_server
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_BATCH_SIZE = Histogram(
+    "dispatcher_batch_size",
+    "Tasks moved to DISPATCHED per loop iteration.",
+    buckets=(0, 1, 2, 5, 10, 20, 30, 50, 100, 200, 500),
+)
+DISPATCH_LOOP_SECONDS = Histogram(
+    "dispatcher_loop_duration_seconds",
+    "Time spent fetching and dispatching one batch, excluding the poll sleep.",
+    buckets=LATENCY_BUCKETS,
+)
+DISPATCH_ERRORS = Counter("dispatcher_loop_errors", "Dispatch iterations that raised.")
 
 
 def main():
-    Base.metadata.create_all(bind=engine)
     settings = get_settings()
+    if settings.db_auto_migrate:
+        upgrade_schema(engine)
+    start_metrics_server(settings.metrics_port)
+    start_profiling_server(build_controller("dispatcher"))
+    start_archiver(engine, settings)
+    next_maintenance = 0.0
     while True:
+        if settings.db_partition_maintenance_sec > 0 and time.monotonic() >= next_maintenance:
+            try:
+                maintain_partitions(engine, settings)
+            except Exception:
+                logger.exception("Partition maintenance failed")
+            next_maintenance = time.monotonic() + settings.db_partition_maintenance_sec
         db = SessionLocal()
+        started = time.perf_counter()
         try:
-            dispatch_pending_tasks(db, batch_size=settings.batch_size)
+            DISPATCH_BATCH_SIZE.observe(dispatch_pending_tasks(db, batch_size=settings.batch_size))
+        except Exception:
+            DISPATCH_ERRORS.inc()
+            logger.exception("Dispatch iteration failed")
+            db.rollback()
         finally:
+            DISPATCH_LOOP_SECONDS.observe(time.perf_counter() - started)
             db.close()
         time.sleep(settings.poll_interval_sec)
 
@@ -1,9 +1,13 @@
+import time
 from datetime import datetime
 from typing import List
 
 from sqlalchemy.orm import Session
 
 from app.models.task import Task, TaskStatus
+from common.observability.tracing import get_tracer, root_span_id
+
+tracer = get_tracer("dispatcher")
 
 
 def fetch_pending_tasks(db: Session, limit: int) -> List[Task]:
@@ -17,6 +21,7 @@ def fetch_pending_tasks(db: Session, limit: int) -> List[Task]:
 
 
 def dispatch_pending_tasks(db: Session, batch_size: int) -> int:
+    start = time.time_ns()
     tasks = fetch_pending_tasks(db, batch_size)
     if not tasks:
         return 0
@@ -26,5 +31,16 @@ def dispatch_pending_tasks(db: Session, batch_size: int) -> int:
         task.status = TaskStatus.DISPATCHED
         task.dispatched_at = now
 
+    traced = [(str(task.id), task.trace_id) for task in tasks if task.trace_id]
     db.commit()
+    end = time.time_ns()
+    for task_id, trace_id in traced:
+        tracer.record(
+            "task.dispatch",
+            trace_id,
+            start,
+            end,
+            parent_id=root_span_id(trace_id),
+            **{"task.id": task_id, "dispatch.batch_size": len(tasks)},
+        )
     return len(tasks)
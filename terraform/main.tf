@@ -462,9 +462,26 @@ locals {
   image_cpu        = "${aws_ecr_repository.repos["cpu"].repository_url}:${var.image_tag}"
   image_memory     = "${aws_ecr_repository.repos["memory"].repository_url}:${var.image_tag}"
   db_secret_arn    = aws_secretsmanager_secret.database_url.arn
+  db_env = { for k, v in var.db_pool : k => [
+    { name = "DB_POOL_SIZE", value = tostring(v.pool_size) },
+    { name = "DB_MAX_OVERFLOW", value = tostring(v.max_overflow) },
+    { name = "DB_STATEMENT_TIMEOUT_MS", value = tostring(var.db_statement_timeout_ms) },
+  ] }
   is_fargate = var.compute_mode == "FARGATE"
   is_ec2     = var.compute_mode == "EC2"
 
+  trace_env = [
+    { name = "TRACE_EXPORTER", value = var.trace_exporter },
+    { name = "TRACE_SAMPLE_RATIO", value = tostring(var.trace_sample_ratio) },
+  ]
+
+  archive_enabled = var.archive_after_hours > 0
+  archive_env     = local.archive_enabled ? [{ name = "ARCHIVE_AFTER_HOURS", value = tostring(var.archive_after_hours) }] : []
+  archive_mounts = {
+    dispatcher = local.archive_enabled ? [{ sourceVolume = "archive", containerPath = "/tmp/archive", readOnly = false }] : []
+    result     = local.archive_enabled ? [{ sourceVolume = "archive", containerPath = "/tmp/archive", readOnly = true }] : []
+  }
+
 }
 
 resource "aws_ecs_task_definition" "api" {
@@ -482,6 +499,7 @@ resource "aws_ecs_task_definition" "api" {
     essential    = true
     portMappings = [{ containerPort = 8000, hostPort = 8000, protocol = "tcp" }]
     secrets      = [{ name = "DATABASE_URL", valueFrom = local.db_secret_arn }]
+    environment  = concat(local.db_env["api"], local.trace_env)
     logConfiguration = {
       logDriver = "awslogs"
       options = {
@@ -588,6 +606,36 @@ resource "aws_ecs_cluster_capacity_providers" "this" {
 }
 
 
+resource "aws_security_group" "efs" {
+  count       = local.archive_enabled ? 1 : 0
+  name        = substr("${local.name_prefix}-sg-efs", 0, 63)
+  description = "Task archive EFS"
+  vpc_id      = aws_vpc.this.id
+
+  ingress {
+    from_port       = 2049
+    to_port         = 2049
+    protocol        = "tcp"
+    security_groups = [aws_security_group.ecs.id]
+  }
+}
+
+resource "aws_efs_file_system" "archive" {
+  count     = local.archive_enabled ? 1 : 0
+  encrypted = true
+
+  tags = {
+    Name = "${local.name_prefix}-archive"
+  }
+}
+
+resource "aws_efs_mount_target" "archive" {
+  count           = local.archive_enabled ? length(local.private_subnet_ids) : 0
+  file_system_id  = aws_efs_file_system.archive[0].id
+  subnet_id       = local.private_subnet_ids[count.index]
+  security_groups = [aws_security_group.efs[0].id]
+}
+
 resource "aws_ecs_task_definition" "result" {
   family                   = "${local.name_prefix}-${local.service_names.result}"
   requires_compatibilities = local.is_fargate ? ["FARGATE"] : ["EC2"]
@@ -597,12 +645,25 @@ resource "aws_ecs_task_definition" "result" {
   execution_role_arn       = aws_iam_role.ecs_execution.arn
   task_role_arn            = aws_iam_role.ecs_task.arn
 
+  dynamic "volume" {
+    for_each = local.archive_enabled ? [1] : []
+    content {
+      name = "archive"
+      efs_volume_configuration {
+        file_system_id     = aws_efs_file_system.archive[0].id
+        transit_encryption = "ENABLED"
+      }
+    }
+  }
+
   container_definitions = jsonencode([{
     name         = "result"
     image        = local.image_result
     essential    = true
     portMappings = [{ containerPort = 8000, hostPort = 8000, protocol = "tcp" }]
     secrets      = [{ name = "DATABASE_URL", valueFrom = local.db_secret_arn }]
+    environment  = local.db_env["result"]
+    mountPoints  = local.archive_mounts["result"]
     logConfiguration = {
       logDriver = "awslogs"
       options = {
@@ -624,11 +685,24 @@ resource "aws_ecs_task_definition" "dispatcher" {
   execution_role_arn       = aws_iam_role.ecs_execution.arn
   task_role_arn            = aws_iam_role.ecs_task.arn
 
+  dynamic "volume" {
+    for_each = local.archive_enabled ? [1] : []
+    content {
+      name = "archive"
+      efs_volume_configuration {
+        file_system_id     = aws_efs_file_system.archive[0].id
+        transit_encryption = "ENABLED"
+      }
+    }
+  }
+
   container_definitions = jsonencode([{
     name      = "dispatcher"
     image     = local.image_dispatcher
     essential = true
     secrets   = [{ name = "DATABASE_URL", valueFrom = local.db_secret_arn }]
+    environment = concat(local.db_env["dispatcher"], local.archive_env, local.trace_env)
+    mountPoints = local.archive_mounts["dispatcher"]
     logConfiguration = {
       logDriver = "awslogs"
       options = {
@@ -655,6 +729,7 @@ resource "aws_ecs_task_definition" "cpu" {
     image     = local.image_cpu
     essential = true
     secrets   = [{ name = "DATABASE_URL", valueFrom = local.db_secret_arn }]
+    environment = concat(local.db_env["cpu"], local.trace_env)
     logConfiguration = {
       logDriver = "awslogs"
       options = {
@@ -681,6 +756,7 @@ resource "aws_ecs_task_definition" "memory" {
     image     = local.image_memory
     essential = true
     secrets   = [{ name = "DATABASE_URL", valueFrom = local.db_secret_arn }]
+    environment = concat(local.db_env["memory"], local.trace_env)
     logConfiguration = {
       logDriver = "awslogs"
       options = {
@@ -793,6 +869,7 @@ resource "aws_ecs_service" "result" {
   depends_on = [
   aws_lb_listener.http,
   aws_ecs_cluster_capacity_providers.this,
+  aws_efs_mount_target.archive,
 ]
 
 }
@@ -834,6 +911,8 @@ resource "aws_ecs_service" "dispatcher" {
     security_groups  = [aws_security_group.ecs.id]
     assign_public_ip = false
   }
+
+  depends_on = [aws_efs_mount_target.archive]
 }
 
 resource "aws_ecs_service" "cpu" {
@@ -131,3 +131,37 @@ variable "capacity_provider_target_capacity" {
 }
 
 
+
+variable "db_pool" {
+  type = map(object({
+    pool_size    = number
+    max_overflow = number
+  }))
+  default = {
+    api        = { pool_size = 5, max_overflow = 5 }
+    result     = { pool_size = 3, max_overflow = 2 }
+    dispatcher = { pool_size = 2, max_overflow = 1 }
+    cpu        = { pool_size = 1, max_overflow = 1 }
+    memory     = { pool_size = 1, max_overflow = 1 }
+  }
+}
+
+variable "db_statement_timeout_ms" {
+  type    = number
+  default = 30000
+}
+
+variable "archive_after_hours" {
+  type    = number
+  default = 0
+}
+
+variable "trace_exporter" {
+  type    = string
+  default = "none"
+}
+
+variable "trace_sample_ratio" {
+  type    = number
+  default = 0
+}